@@ -64,6 +64,7 @@ class Attribute:
             attr_type (AttributeType): The type of the attribute.
             unique (bool): Whether the attribute is unique.
             required (bool): Whether the attribute is required.
+            searchable (bool): Whether the attribute is full-text indexed, string attributes only.
 
         Examples:
             >>> attr = Attribute("name", AttributeType.STRING, True, True)
@@ -72,7 +73,12 @@ class Attribute:
     """
 
     def __init__(
-        self, name: str, attr_type: AttributeType, unique: Optional[bool] = False, required: Optional[bool] = False
+        self,
+        name: str,
+        attr_type: AttributeType,
+        unique: Optional[bool] = False,
+        required: Optional[bool] = False,
+        searchable: Optional[bool] = False,
     ):
         """
         Initialize a new Attribute object.
@@ -82,11 +88,14 @@ class Attribute:
             attr_type (AttributeType): The type of the attribute.
             unique (Optional[bool]): Indicates whether the attribute should be unique. Defaults to False.
             required (Optional[bool]): Indicates whether the attribute is required. Defaults to False.
+            searchable (Optional[bool]): Indicates whether the attribute is full-text indexed, so that generated
+                queries matching it with CONTAINS use the index, matching the terms on word starts. Defaults to False.
         """
         self.name = re.sub(r"([^a-zA-Z0-9_])", "_", name)
         self.type = attr_type
         self.unique = unique
         self.required = required
+        self.searchable = searchable
 
     @staticmethod
     def from_json(txt: Union[str, dict]) -> "Attribute":
@@ -107,6 +116,7 @@ class Attribute:
             AttributeType.from_string(txt["type"]),
             txt["unique"],
             txt["required"] if "required" in txt else False,
+            txt.get("searchable", False),
         )
 
     @staticmethod
@@ -115,6 +125,7 @@ class Attribute:
         Parses an attribute from a string.
         The "!" symbol indicates that the attribute is unique.
         The "*" symbol indicates that the attribute is required
+        The "~" symbol indicates that the attribute is searchable
 
         Args:
             txt (str): The string to parse.
@@ -131,11 +142,12 @@ class Attribute:
             Exception: If the attribute type is invalid.
         """
         name = txt.split(":")[0].strip()
-        attr_type = txt.split(":")[1].split("!")[0].split("*")[0].strip()
+        attr_type = txt.split(":")[1].split("!")[0].split("*")[0].split("~")[0].strip()
         unique = "!" in txt
         required = "*" in txt
+        searchable = "~" in txt
 
-        return Attribute(name, AttributeType.from_string(attr_type), unique, required)
+        return Attribute(name, AttributeType.from_string(attr_type), unique, required, searchable)
 
     def to_json(self) -> dict:
         """
@@ -148,6 +160,7 @@ class Attribute:
                 - "type": The type of the attribute.
                 - "unique": A boolean indicating whether the attribute is unique.
                 - "required": A boolean indicating whether the attribute is required.
+                - "searchable": True when the attribute is searchable, omitted otherwise.
         """
         json_data = {
             "name": self.name,
@@ -155,6 +168,9 @@ class Attribute:
             "unique": self.unique,
             "required": self.required,
         }
+        # Omitted unless set, keeping the hash of the existing ontologies
+        if self.searchable:
+            json_data["searchable"] = True
 
         return json_data
 
@@ -167,4 +183,4 @@ class Attribute:
         Returns:
             str: A string representation of the Attribute object.
         """
-        return f"{self.name}: \"{self.type}{'!' if self.unique else ''}{'*' if self.required else ''}\""
+        return f"{self.name}: \"{self.type}{'!' if self.unique else ''}{'*' if self.required else ''}{'~' if self.searchable else ''}\""
@@ -0,0 +1,418 @@
+import re
+import sys
+import math
+import time
+import logging
+from threading import Lock
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with optional time-to-live, memory budget and hit-rate metrics.
+
+    Args:
+        max_size (int): The maximum number of entries kept.
+        ttl (Optional[float]): Seconds after which an entry expires. Defaults to None, never expiring.
+        max_bytes (Optional[int]): The maximum estimated size of the cached values. Defaults to None, unbounded.
+
+    Examples:
+        >>> cache = LRUCache(max_size=2)
+        >>> cache.set("a", 1)
+        >>> cache.get("a")
+        1
+        >>> cache.stats()
+        {'hits': 1, 'misses': 0, 'hit_rate': 1.0, 'size': 1}
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        """
+        Initializes a new LRUCache object.
+
+        Args:
+            max_size (int): The maximum number of entries kept.
+            ttl (Optional[float]): Seconds after which an entry expires.
+            max_bytes (Optional[int]): The maximum estimated size of the cached values.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any, int]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Retrieves a value, marking it as recently used.
+
+        Args:
+            key (Hashable): The entry key.
+
+        Returns:
+            Optional[Any]: The cached value, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                self._evict(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value, evicting the least recently used entries when full.
+
+        Args:
+            key (Hashable): The entry key.
+            value (Any): The value to cache.
+        """
+        size = self._sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Never cache values larger than the whole budget
+            self.delete(key)
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+            self._entries[key] = (time.monotonic(), value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_size or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._evict(next(iter(self._entries)))
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Removes an entry if present.
+
+        Args:
+            key (Hashable): The entry key.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            for key in list(self._entries.keys()):
+                self._evict(key)
+
+    def stats(self) -> dict:
+        """
+        Returns the cache metrics.
+
+        Returns:
+            dict: The number of hits, misses, the hit rate, the number of entries and,
+                when a memory budget is set, the estimated size of the cached values.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+                "size": len(self._entries),
+            }
+            if self.max_bytes is not None:
+                stats["bytes"] = self._bytes
+            return stats
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.monotonic() - created_at > self.ttl
+
+    def _sizeof(self, value: Any) -> int:
+        return sys.getsizeof(value)
+
+    def _evict(self, key: Hashable) -> None:
+        # Must be called while holding the lock
+        self._bytes -= self._entries.pop(key)[2]
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalizes a question for exact-match lookups: case, whitespace and trailing punctuation are ignored.
+
+    Args:
+        question (str): The question to normalize.
+
+    Returns:
+        str: The normalized question.
+    """
+    return re.sub(r"\s+", " ", question).strip().rstrip("?!. ").lower()
+
+
+def _cosine_similarity(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm > 0 else 0.0
+
+
+class CypherCache(LRUCache):
+    """
+    Caches the Cypher statements generated for questions, so repeated questions skip the LLM.
+
+    Questions are matched exactly after normalization and, when an embedding function is provided,
+    by embedding similarity. Entries are scoped by ontology version, so changing the ontology never
+    serves stale statements. Chat sessions version the ontology together with the Cypher generation
+    prompts and the schema statistics they are given.
+
+    Args:
+        max_size (int): The maximum number of questions kept.
+        ttl (Optional[float]): Seconds after which an entry expires.
+        embed (Optional[Callable[[str], list[float]]]): Function embedding a question, enables similarity lookups.
+        similarity_threshold (float): Minimum cosine similarity for a paraphrase to match.
+
+    Examples:
+        >>> from graphrag_sdk.cache import CypherCache
+        >>> kg = KnowledgeGraph("test_kg", model_config, ontology, cypher_cache=CypherCache(max_size=10000, ttl=3600))
+        >>> chat_session = kg.chat_session()
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: Optional[float] = None,
+        embed: Optional[Callable[[str], list[float]]] = None,
+        similarity_threshold: float = 0.95,
+    ):
+        """
+        Initializes a new CypherCache object.
+
+        Args:
+            max_size (int): The maximum number of questions kept.
+            ttl (Optional[float]): Seconds after which an entry expires.
+            embed (Optional[Callable[[str], list[float]]]): Function embedding a question.
+            similarity_threshold (float): Minimum cosine similarity for a paraphrase to match.
+        """
+        super().__init__(max_size, ttl)
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self._embeddings: dict[Hashable, list[float]] = {}
+
+    def get_cypher(
+        self, question: str, ontology_version: str, last_answer: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Looks up the Cypher statement generated for a question.
+
+        Similarity lookups only apply to questions asked without conversation history,
+        as follow-up questions depend on the previous answer.
+
+        Args:
+            question (str): The question.
+            ontology_version (str): The ontology hash.
+            last_answer (Optional[str]): The previous answer in the conversation.
+
+        Returns:
+            Optional[str]: The cached Cypher statement, or None on a miss.
+        """
+        key = (ontology_version, last_answer, normalize_question(question))
+        if self.embed is None or last_answer is not None:
+            return self.get(key)
+
+        with self._lock:
+            exact = key in self._entries and not self._expired(self._entries[key][0])
+        if exact:
+            return self.get(key)
+
+        embedding = self.embed(normalize_question(question))
+        best_key, best_similarity = None, self.similarity_threshold
+        with self._lock:
+            for candidate_key, candidate in self._embeddings.items():
+                if candidate_key[0] != ontology_version or candidate_key[1] is not None:
+                    continue
+                similarity = _cosine_similarity(embedding, candidate)
+                if similarity >= best_similarity:
+                    best_key, best_similarity = candidate_key, similarity
+
+        if best_key is None:
+            return self.get(key)
+
+        logger.debug(f"Similar question found: {best_key[2]} ({best_similarity})")
+        return self.get(best_key)
+
+    def set_cypher(
+        self, question: str, ontology_version: str, cypher: str, last_answer: Optional[str] = None
+    ) -> None:
+        """
+        Stores the Cypher statement generated for a question.
+
+        Args:
+            question (str): The question.
+            ontology_version (str): The ontology hash.
+            cypher (str): The Cypher statement.
+            last_answer (Optional[str]): The previous answer in the conversation.
+        """
+        key = (ontology_version, last_answer, normalize_question(question))
+        embedding = (
+            self.embed(key[2]) if self.embed is not None and last_answer is None else None
+        )
+        self.set(key, cypher)
+        if embedding is not None:
+            with self._lock:
+                if key in self._entries:
+                    self._embeddings[key] = embedding
+
+    def delete_cypher(
+        self, question: str, ontology_version: str, last_answer: Optional[str] = None
+    ) -> None:
+        """
+        Removes the Cypher statement cached for a question, e.g. after it failed to execute.
+
+        Args:
+            question (str): The question.
+            ontology_version (str): The ontology hash.
+            last_answer (Optional[str]): The previous answer in the conversation.
+        """
+        self.delete((ontology_version, last_answer, normalize_question(question)))
+
+    def _evict(self, key: Hashable) -> None:
+        super()._evict(key)
+        self._embeddings.pop(key, None)
+
+
+def normalize_cypher(cypher: str) -> str:
+    """
+    Normalizes a Cypher statement for cache lookups: whitespace and trailing semicolons are ignored.
+
+    Args:
+        cypher (str): The Cypher statement to normalize.
+
+    Returns:
+        str: The normalized statement.
+    """
+    return re.sub(r"\s+", " ", cypher).strip().rstrip("; ")
+
+
+class QueryResultCache(LRUCache):
+    """
+    Caches the context produced by executing Cypher statements.
+
+    Entries are scoped by graph version: every write made through the knowledge graph
+    increments the version and invalidates the cache. Writes made outside of the SDK are not tracked,
+    use a TTL when other processes update the graph. A cache serves a single graph, use one cache
+    per knowledge graph.
+
+    Args:
+        max_size (int): The maximum number of statements kept.
+        ttl (Optional[float]): Seconds after which an entry expires.
+        max_bytes (Optional[int]): The maximum total size of the cached contexts. Defaults to 64MB.
+
+    Examples:
+        >>> from graphrag_sdk.cache import QueryResultCache
+        >>> kg = KnowledgeGraph("test_kg", model_config, ontology, result_cache=QueryResultCache())
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+    ):
+        """
+        Initializes a new QueryResultCache object.
+
+        Args:
+            max_size (int): The maximum number of statements kept.
+            ttl (Optional[float]): Seconds after which an entry expires.
+            max_bytes (Optional[int]): The maximum total size of the cached contexts.
+        """
+        super().__init__(max_size, ttl, max_bytes)
+        self.graph_version = 0
+        self.graph_name = None
+
+    def bind(self, graph_name: str) -> None:
+        """
+        Binds the cache to the graph it serves.
+
+        Args:
+            graph_name (str): The graph name.
+
+        Raises:
+            Exception: If the cache already serves another graph.
+        """
+        with self._lock:
+            if self.graph_name is not None and self.graph_name != graph_name:
+                raise Exception(
+                    f"The result cache serves graph {self.graph_name}, use another cache for graph {graph_name}"
+                )
+            self.graph_name = graph_name
+
+    def get_result(
+        self, cypher: str, context_key: Optional[Hashable] = None
+    ) -> Optional[tuple[str, Optional[float], Optional[int], Optional[dict]]]:
+        """
+        Looks up the result of a Cypher statement.
+
+        Args:
+            cypher (str): The Cypher statement.
+            context_key (Optional[Hashable]): The settings the context was rendered with.
+
+        Returns:
+            Optional[tuple[str, Optional[float], Optional[int], Optional[dict]]]: The context, the original execution
+                time, the number of result rows and the context statistics, or None on a miss.
+        """
+        return self.get((self.graph_version, context_key, normalize_cypher(cypher)))
+
+    def set_result(
+        self,
+        cypher: str,
+        context: str,
+        execution_time: Optional[float],
+        context_key: Optional[Hashable] = None,
+        graph_version: Optional[int] = None,
+        rows: Optional[int] = None,
+        context_stats: Optional[dict] = None,
+    ) -> None:
+        """
+        Stores the result of a Cypher statement.
+
+        Args:
+            cypher (str): The Cypher statement.
+            context (str): The context produced by the statement.
+            execution_time (Optional[float]): The query execution time.
+            context_key (Optional[Hashable]): The settings the context was rendered with.
+            graph_version (Optional[int]): The graph version read before executing the statement. The result is
+                not stored when the graph was written since. Defaults to the current version.
+            rows (Optional[int]): The number of result rows.
+            context_stats (Optional[dict]): The statistics of the context builder.
+        """
+        if graph_version is None:
+            graph_version = self.graph_version
+        elif graph_version != self.graph_version:
+            return
+        # Stored under the version it was computed at, even if invalidated meanwhile it is never served
+        self.set(
+            (graph_version, context_key, normalize_cypher(cypher)),
+            (context, execution_time, rows, context_stats),
+        )
+
+    def invalidate(self, graph_version: int) -> None:
+        """
+        Drops all results computed before the given graph version.
+
+        Args:
+            graph_version (int): The current graph version.
+        """
+        self.graph_version = graph_version
+        self.clear()
+
+    def _sizeof(self, value: tuple[str, Optional[float], Optional[int], Optional[dict]]) -> int:
+        return sys.getsizeof(value[0])
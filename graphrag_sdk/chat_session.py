@@ -1,11 +1,37 @@
 import json
+import time
+import hashlib
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from falkordb import Graph
-from typing import Iterator
+from falkordb.asyncio.graph import AsyncGraph
+from typing import Iterator, AsyncIterator, Callable, Optional, Union
 from graphrag_sdk.ontology import Ontology
+from graphrag_sdk.cache import CypherCache, QueryResultCache
+from graphrag_sdk.connection import ReplicatedGraph
+from graphrag_sdk.query_policy import QueryPolicy
+from graphrag_sdk.retry_policy import RetryPolicy
+from graphrag_sdk.history_policy import HistoryPolicy
+from graphrag_sdk.schema_statistics import SchemaStatistics
+from graphrag_sdk.models import GenerativeModel, GenerativeModelChatSession
+from graphrag_sdk.context_builder import ContextBuilder, DeduplicatedContextBuilder
 from graphrag_sdk.steps.qa_step import QAStep
 from graphrag_sdk.steps.stream_qa_step import StreamingQAStep
 from graphrag_sdk.model_config import KnowledgeGraphModelConfig
 from graphrag_sdk.steps.graph_query_step import GraphQueryGenerationStep
+from graphrag_sdk.fixtures.prompts import HISTORY_SUMMARY_SYSTEM, HISTORY_SUMMARY_PROMPT, QA_CONTEXT_OMITTED
+from graphrag_sdk.helpers import stringify_falkordb_response
+from graphrag_sdk.vector_retrieval import (
+    VectorRetriever,
+    RETRIEVAL_CYPHER,
+    RETRIEVAL_VECTOR,
+    RETRIEVAL_FALLBACK,
+    RETRIEVAL_HYBRID,
+    is_vector_retrieval,
+)
+
+logger = logging.getLogger(__name__)
 
 CYPHER_ERROR_RES = "Sorry, I could not find the answer to your question"
 
@@ -30,7 +56,22 @@ class ChatSession:
 
     def __init__(self, model_config: KnowledgeGraphModelConfig, ontology: Ontology, graph: Graph,
                 cypher_system_instruction: str, qa_system_instruction: str,
-                cypher_gen_prompt: str, qa_prompt: str, cypher_gen_prompt_history: str):
+                cypher_gen_prompt: str, qa_prompt: str, cypher_gen_prompt_history: str,
+                cypher_cache: Optional[CypherCache] = None,
+                result_cache: Optional[QueryResultCache] = None,
+                max_context_tokens: Optional[int] = None,
+                deduplicate_context: bool = False,
+                query_policy: Optional[QueryPolicy] = None,
+                retry_policy: Optional[RetryPolicy] = None,
+                async_graph: Optional[Union[AsyncGraph, Callable[[], AsyncGraph]]] = None,
+                history_policy: Optional[HistoryPolicy] = None,
+                stateless_cypher: bool = False,
+                speculative_models: Optional[list[GenerativeModel]] = None,
+                pipelined_streaming: bool = False,
+                retrieval_mode: str = RETRIEVAL_CYPHER,
+                vector_retriever: Optional[VectorRetriever] = None,
+                fulltext_search: bool = False,
+                schema_statistics: Optional[SchemaStatistics] = None):
         """
         Initializes a new ChatSession object.
 
@@ -38,6 +79,35 @@ class ChatSession:
             model_config (KnowledgeGraphModelConfig): The model configuration.
             ontology (Ontology): The ontology object.
             graph (Graph): The graph object.
+            cypher_cache (Optional[CypherCache]): Cache of the Cypher statements generated for questions,
+                can be shared between sessions.
+            result_cache (Optional[QueryResultCache]): Cache of the contexts produced by Cypher statements,
+                can be shared between sessions.
+            max_context_tokens (Optional[int]): Token budget of the query results sent to the QA model.
+                Results are rendered compactly and truncated with a summary when over budget.
+            deduplicate_context (bool): Define each distinct node and edge once and reference it from the rows,
+                shrinking the context of multi-hop and join results.
+            query_policy (Optional[QueryPolicy]): Safety policy bounding the generated queries.
+            retry_policy (Optional[RetryPolicy]): Retry strategy of the Cypher generation.
+            async_graph (Optional[Union[AsyncGraph, Callable[[], AsyncGraph]]]): The graph queried by `asend_message`
+                and `asend_message_stream`, or a function creating it on first use.
+            history_policy (Optional[HistoryPolicy]): Bounds the chat histories resent to the models on every turn.
+                Defaults to None, keeping the full histories.
+            stateless_cypher (bool): Generate each Cypher statement in a new conversation holding only the system
+                instruction and the question, the last answer being passed in the prompt. Requests stay constant-size
+                and independent of each other.
+            speculative_models (Optional[list[GenerativeModel]]): Models generating Cypher candidates in parallel,
+                the first valid candidate returning rows is answered. Trades tokens for a lower tail latency.
+            pipelined_streaming (bool): When streaming, stream the Cypher generation too and execute the statement
+                as soon as its fenced block closes, starting the answer stream right after.
+            retrieval_mode (str): How the context of a question is retrieved: "cypher" with generated Cypher,
+                "vector" from the entities closest to the question and their neighbourhood, "fallback" with generated
+                Cypher then the vector search when it fails or returns nothing, "hybrid" with both, concurrently.
+            vector_retriever (Optional[VectorRetriever]): The vector search, required by the modes other than "cypher".
+            fulltext_search (bool): Resolve the CONTAINS filters on searchable attributes through their full-text
+                indexes instead of scanning the nodes. The indexes must exist.
+            schema_statistics (Optional[SchemaStatistics]): Statistics of the graph data appended to the Cypher
+                system instruction, e.g. the values of categorical attributes. Must be computed beforehand.
 
         Attributes:
             model_config (KnowledgeGraphModelConfig): The model configuration.
@@ -48,16 +118,45 @@ class ChatSession:
         """
         self.model_config = model_config
         self.graph = graph
+        self._async_graph = async_graph
         self.ontology = ontology
         
         # Filter the ontology to remove unique and required attributes that are not needed for Q&A. 
         ontology_prompt = self.clean_ontology_for_prompt(ontology)
                 
         cypher_system_instruction = cypher_system_instruction.format(ontology=ontology_prompt)
+        statistics_prompt = schema_statistics.to_prompt() if schema_statistics is not None else None
+        if statistics_prompt is not None:
+            cypher_system_instruction += statistics_prompt
         
         self.cypher_prompt = cypher_gen_prompt
         self.qa_prompt = qa_prompt
         self.cypher_prompt_with_history = cypher_gen_prompt_history
+        self.cypher_cache = cypher_cache
+        self.result_cache = result_cache
+        self.max_context_tokens = max_context_tokens
+        self.deduplicate_context = deduplicate_context
+        self.query_policy = query_policy
+        self.retry_policy = retry_policy
+        self.history_policy = history_policy
+        self.stateless_cypher = stateless_cypher
+        self.cypher_system_instruction = cypher_system_instruction
+        self.speculative_models = speculative_models
+        self.pipelined_streaming = pipelined_streaming
+        if is_vector_retrieval(retrieval_mode) and vector_retriever is None:
+            raise Exception(f"A vector retriever is required by the {retrieval_mode} retrieval mode")
+        self.retrieval_mode = retrieval_mode
+        self.vector_retriever = vector_retriever
+        self.fulltext_search = fulltext_search
+        self._last_result_rows = None
+        # QA prompts without their query results, by full prompt, used to compact the QA history
+        self._compact_qa_prompts = {}
+        # Cached statements are scoped by everything the generation sees: ontology, statistics and prompts
+        self.ontology_version = (
+            _fingerprint(ontology.get_hash(), cypher_system_instruction, cypher_gen_prompt, cypher_gen_prompt_history)
+            if cypher_cache is not None
+            else None
+        )
         
         self.cypher_chat_session = model_config.cypher_generation.start_chat(
                 cypher_system_instruction
@@ -65,6 +164,11 @@ class ChatSession:
         self.qa_chat_session = model_config.qa.start_chat(
                 qa_system_instruction
             )
+        self.escalation_chat_session = (
+            retry_policy.escalation_model.start_chat(cypher_system_instruction)
+            if retry_policy is not None and retry_policy.escalation_model is not None
+            else None
+        )
         self.last_complete_response = {
             "question": None, 
             "response": None, 
@@ -72,33 +176,348 @@ class ChatSession:
             "cypher": None
             }
         
-        # Metadata to store additional information about the chat session (currently only last query execution time)
-        self.metadata = {"last_query_execution_time": None}
+        # Metadata to store additional information about the chat session
+        self.metadata = {
+            "last_query_execution_time": None,
+            "last_cypher_cache_hit": False,
+            "last_context_stats": None,
+            "last_cypher_attempts": [],
+            "last_timings": None,
+            "last_retrieval": None,
+        }
         
-    def _generate_cypher_query(self, message: str) -> tuple:
+    @property
+    def async_graph(self) -> Optional[AsyncGraph]:
+        # A function creating the graph on first use, graphs are not called
+        if callable(self._async_graph) and not isinstance(self._async_graph, (AsyncGraph, ReplicatedGraph)):
+            self._async_graph = self._async_graph()
+        return self._async_graph
+
+    def _context_builder(self) -> Optional[ContextBuilder]:
         """
-        Generate a Cypher query for the given message.
-        
+        Create the renderer of the query results, a new one per query as it holds the build statistics.
+
+        Returns:
+            Optional[ContextBuilder]: The context builder, or None to use the default rendering.
+        """
+        if self.deduplicate_context:
+            return DeduplicatedContextBuilder(self.max_context_tokens)
+        if self.max_context_tokens is not None:
+            return ContextBuilder(self.max_context_tokens)
+        return None
+
+    def _cypher_step(self, graph: Union[Graph, AsyncGraph], stream_cypher: bool = False) -> GraphQueryGenerationStep:
+        """
+        Create the step generating and executing the Cypher query of a message.
+
         Args:
-            message (str): The message to generate a query for.
-            
+            graph (Union[Graph, AsyncGraph]): The graph to query.
+            stream_cypher (bool): Stream the generation, executing the statement once complete.
+
         Returns:
-            tuple: A tuple containing (context, cypher)
+            GraphQueryGenerationStep: The Cypher generation step.
         """
-        cypher_step = GraphQueryGenerationStep(
-            graph=self.graph,
-            chat_session=self.cypher_chat_session,
+        return GraphQueryGenerationStep(
+            graph=graph,
+            chat_session=self._cypher_chat_session(),
             ontology=self.ontology,
             last_answer=self.last_complete_response["response"],
             cypher_prompt=self.cypher_prompt,
-            cypher_prompt_with_history=self.cypher_prompt_with_history
+            cypher_prompt_with_history=self.cypher_prompt_with_history,
+            cypher_cache=self.cypher_cache,
+            ontology_version=self.ontology_version,
+            result_cache=self.result_cache,
+            context_builder=self._context_builder(),
+            query_policy=self.query_policy,
+            retry_policy=self.retry_policy,
+            escalation_chat_session=self._escalation_chat_session(),
+            candidate_chat_sessions=self._candidate_chat_sessions(),
+            stream_cypher=stream_cypher,
+            fulltext_search=self.fulltext_search,
         )
 
-        (context, cypher, query_execution_time) = cypher_step.run(message)
+    def _cypher_chat_session(self) -> GenerativeModelChatSession:
+        if self.stateless_cypher:
+            return self.model_config.cypher_generation.start_chat(self.cypher_system_instruction)
+        return self.cypher_chat_session
+
+    def _candidate_chat_sessions(self) -> Optional[list[GenerativeModelChatSession]]:
+        if not self.speculative_models:
+            return None
+        # Candidates run concurrently, each in a new conversation
+        return [model.start_chat(self.cypher_system_instruction) for model in self.speculative_models]
+
+    def _escalation_chat_session(self) -> Optional[GenerativeModelChatSession]:
+        if self.stateless_cypher and self.escalation_chat_session is not None:
+            return self.retry_policy.escalation_model.start_chat(self.cypher_system_instruction)
+        return self.escalation_chat_session
+
+    def _record_cypher_step(self, cypher_step: GraphQueryGenerationStep, query_execution_time: Optional[float]) -> None:
         self.metadata["last_query_execution_time"] = query_execution_time
+        self.metadata["last_cypher_cache_hit"] = cypher_step.cache_hit
+        self.metadata["last_context_stats"] = cypher_step.context_stats
+        self._last_result_rows = cypher_step.result_rows
+
+    def _reset_timings(self) -> None:
+        # Seconds spent per stage, completed by the retrieval and QA stages of the message
+        self.metadata["last_timings"] = {
+            "cypher_generation": None,
+            "cypher_validation": None,
+            "query_execution": None,
+            "vector_retrieval": None,
+            "time_to_first_token": None,
+            "total": None,
+        }
+
+    def _record_cypher_timings(self, cypher_step: GraphQueryGenerationStep) -> None:
+        self.metadata["last_cypher_attempts"] = cypher_step.attempts
+        self.metadata["last_timings"].update({
+            "cypher_generation": cypher_step.timings["generation"],
+            "cypher_validation": cypher_step.timings["validation"],
+            "query_execution": cypher_step.timings["execution"],
+        })
+
+    def _record_timing(self, timing: str, started_at: float) -> None:
+        self.metadata["last_timings"][timing] = time.monotonic() - started_at
+
+    def _generate_cypher_query(self, message: str, stream_cypher: bool = False) -> tuple:
+        """
+        Generate a Cypher query for the given message.
+        
+        Args:
+            message (str): The message to generate a query for.
+            stream_cypher (bool): Stream the generation, executing the statement once complete.
+            
+        Returns:
+            tuple: A tuple containing (context, cypher)
+        """
+        cypher_step = self._cypher_step(self.graph, stream_cypher)
+
+        try:
+            (context, cypher, query_execution_time) = cypher_step.run(message)
+        finally:
+            self._record_cypher_timings(cypher_step)
+        self._record_cypher_step(cypher_step, query_execution_time)
         
         return (context, cypher)
 
+    async def _agenerate_cypher_query(self, message: str, stream_cypher: bool = False) -> tuple:
+        """
+        Generate a Cypher query for the given message, querying the asynchronous graph.
+
+        Args:
+            message (str): The message to generate a query for.
+            stream_cypher (bool): Stream the generation, executing the statement once complete.
+
+        Returns:
+            tuple: A tuple containing (context, cypher)
+        """
+        if self.async_graph is None:
+            raise Exception("An asynchronous graph is required to send messages asynchronously")
+
+        cypher_step = self._cypher_step(self.async_graph, stream_cypher)
+
+        try:
+            (context, cypher, query_execution_time) = await cypher_step.arun(message)
+        finally:
+            self._record_cypher_timings(cypher_step)
+        self._record_cypher_step(cypher_step, query_execution_time)
+
+        return (context, cypher)
+
+    def _retrieve(self, message: str, stream_cypher: bool = False) -> tuple:
+        """
+        Retrieve the context of a message according to the retrieval mode.
+
+        Args:
+            message (str): The message to retrieve the context of.
+            stream_cypher (bool): Stream the Cypher generation, executing the statement once complete.
+
+        Returns:
+            tuple: A tuple containing (context, query), the query being the generated Cypher
+                or the vector search expansion query.
+        """
+        self._reset_timings()
+        self.metadata["last_retrieval"] = self.retrieval_mode
+        if self.retrieval_mode == RETRIEVAL_VECTOR:
+            return self._vector_context(message)
+
+        if self.retrieval_mode == RETRIEVAL_HYBRID:
+            # The vector search runs while the Cypher is generated
+            executor = ThreadPoolExecutor(max_workers=1)
+            try:
+                vector_context = executor.submit(self._vector_context, message)
+                (context, cypher) = self._fallible_cypher_query(message, stream_cypher)
+                return self._combine_contexts((context, cypher), vector_context.result())
+            finally:
+                executor.shutdown(wait=False)
+
+        if self.retrieval_mode == RETRIEVAL_FALLBACK:
+            (context, cypher) = self._fallible_cypher_query(message, stream_cypher)
+            if cypher and self._last_result_rows != 0:
+                self.metadata["last_retrieval"] = RETRIEVAL_CYPHER
+                return (context, cypher)
+            self.metadata["last_retrieval"] = RETRIEVAL_VECTOR
+            return self._vector_context(message)
+
+        return self._generate_cypher_query(message, stream_cypher)
+
+    async def _aretrieve(self, message: str, stream_cypher: bool = False) -> tuple:
+        """
+        Retrieve the context of a message according to the retrieval mode, querying the asynchronous graph.
+
+        Args:
+            message (str): The message to retrieve the context of.
+            stream_cypher (bool): Stream the Cypher generation, executing the statement once complete.
+
+        Returns:
+            tuple: A tuple containing (context, query).
+        """
+        self._reset_timings()
+        self.metadata["last_retrieval"] = self.retrieval_mode
+        if self.retrieval_mode == RETRIEVAL_VECTOR:
+            return await self._avector_context(message)
+
+        if self.retrieval_mode == RETRIEVAL_HYBRID:
+            (cypher_context, vector_context) = await asyncio.gather(
+                self._afallible_cypher_query(message, stream_cypher), self._avector_context(message)
+            )
+            return self._combine_contexts(cypher_context, vector_context)
+
+        if self.retrieval_mode == RETRIEVAL_FALLBACK:
+            (context, cypher) = await self._afallible_cypher_query(message, stream_cypher)
+            if cypher and self._last_result_rows != 0:
+                self.metadata["last_retrieval"] = RETRIEVAL_CYPHER
+                return (context, cypher)
+            self.metadata["last_retrieval"] = RETRIEVAL_VECTOR
+            return await self._avector_context(message)
+
+        return await self._agenerate_cypher_query(message, stream_cypher)
+
+    def _fallible_cypher_query(self, message: str, stream_cypher: bool) -> tuple:
+        try:
+            return self._generate_cypher_query(message, stream_cypher)
+        except Exception as e:
+            logger.debug(f"Cypher retrieval failed, using the vector search: {e}")
+            return (None, None)
+
+    async def _afallible_cypher_query(self, message: str, stream_cypher: bool) -> tuple:
+        try:
+            return await self._agenerate_cypher_query(message, stream_cypher)
+        except Exception as e:
+            logger.debug(f"Cypher retrieval failed, using the vector search: {e}")
+            return (None, None)
+
+    def _combine_contexts(self, cypher_context: tuple, vector_context: tuple) -> tuple:
+        (context, cypher) = cypher_context
+        if not cypher:
+            return vector_context
+        return (f"{context}\n{vector_context[0]}", f"{cypher}\n{vector_context[1]}")
+
+    def _vector_context(self, message: str) -> tuple:
+        """
+        Retrieve the context of a message with the vector search.
+
+        Args:
+            message (str): The message to retrieve the context of.
+
+        Returns:
+            tuple: A tuple containing (context, query)
+        """
+        started_at = time.monotonic()
+        (query_result, query) = self.vector_retriever.retrieve(self.graph, self.ontology, message)
+        self._record_timing("vector_retrieval", started_at)
+        return (self._render_context(query_result), query)
+
+    async def _avector_context(self, message: str) -> tuple:
+        if self.async_graph is None:
+            raise Exception("An asynchronous graph is required to send messages asynchronously")
+
+        started_at = time.monotonic()
+        (query_result, query) = await self.vector_retriever.aretrieve(self.async_graph, self.ontology, message)
+        self._record_timing("vector_retrieval", started_at)
+        return (self._render_context(query_result), query)
+
+    def _render_context(self, query_result) -> str:
+        context_builder = self._context_builder()
+        if context_builder is None:
+            return stringify_falkordb_response(query_result.result_set)
+        return context_builder.build(query_result.result_set, [column[1] for column in query_result.header])
+
+    def _remember_qa_prompt(self, message: str, cypher: str, context: str) -> None:
+        if self.history_policy is None:
+            return
+        qa_prompt = self.qa_prompt.format(context=context, cypher=cypher, question=message)
+        self._compact_qa_prompts[qa_prompt] = self.qa_prompt.format(
+            context=QA_CONTEXT_OMITTED, cypher=cypher, question=message
+        )
+
+    def _compact_chat_history(self, chat_session: GenerativeModelChatSession) -> tuple[list[dict], list[dict]]:
+        """
+        Compact the history of a model chat session according to the history policy.
+
+        Args:
+            chat_session (GenerativeModelChatSession): The model chat session.
+
+        Returns:
+            tuple[list[dict], list[dict]]: The compacted history and the removed messages.
+        """
+        (history, removed) = self.history_policy.compact(chat_session.get_chat_history(), self._compact_qa_prompts)
+        chat_session.set_chat_history(history)
+        return (history, removed)
+
+    def _forget_compacted_qa_prompts(self) -> None:
+        prompts = {message["content"] for message in self.qa_chat_session.get_chat_history()}
+        self._compact_qa_prompts = {
+            prompt: compact for (prompt, compact) in self._compact_qa_prompts.items() if prompt in prompts
+        }
+
+    def _summary_prompt(self, history: list[dict], removed: list[dict]) -> str:
+        messages = "\n".join(f"{message['role']}: {message['content']}" for message in removed)
+        return HISTORY_SUMMARY_PROMPT.format(summary=HistoryPolicy.summary_of(history) or "", messages=messages)
+
+    def _compact_history(self) -> None:
+        """
+        Compact the Cypher and QA histories after a turn, summarizing the removed exchanges if required.
+        """
+        if self.history_policy is None:
+            return
+
+        for chat_session in (self.cypher_chat_session, self.qa_chat_session):
+            (history, removed) = self._compact_chat_history(chat_session)
+            if self.history_policy.summarize and len(removed) > 0:
+                # A new session per summary, the summaries should not accumulate a history of their own
+                summary = self.model_config.qa.start_chat(HISTORY_SUMMARY_SYSTEM).send_message(
+                    self._summary_prompt(history, removed)
+                )
+                chat_session.set_chat_history(HistoryPolicy.with_summary(history, summary.text))
+        self._forget_compacted_qa_prompts()
+
+    async def _acompact_history(self) -> None:
+        """
+        Compact the Cypher and QA histories after a turn, summarizing without blocking the event loop.
+        """
+        if self.history_policy is None:
+            return
+
+        for chat_session in (self.cypher_chat_session, self.qa_chat_session):
+            (history, removed) = self._compact_chat_history(chat_session)
+            if self.history_policy.summarize and len(removed) > 0:
+                summary = await self.model_config.qa.start_chat(HISTORY_SUMMARY_SYSTEM).asend_message(
+                    self._summary_prompt(history, removed)
+                )
+                chat_session.set_chat_history(HistoryPolicy.with_summary(history, summary.text))
+        self._forget_compacted_qa_prompts()
+
+    def _cypher_error_response(self, message: str) -> dict:
+        self.last_complete_response = {
+            "question": message,
+            "response": CYPHER_ERROR_RES,
+            "context": None,
+            "cypher": None
+        }
+        return self.last_complete_response
+
     def send_message(self, message: str) -> dict:
         """
         Sends a message to the chat session.
@@ -113,17 +532,12 @@ class ChatSession:
                     "context": context, 
                     "cypher": cypher}
         """
-        (context, cypher) = self._generate_cypher_query(message)
+        started_at = time.monotonic()
+        (context, cypher) = self._retrieve(message)
 
         # If the cypher is empty, return an error message
         if not cypher or len(cypher) == 0:
-            self.last_complete_response = {
-                "question": message,
-                "response": CYPHER_ERROR_RES,
-                "context": None,
-                "cypher": None
-            }
-            return self.last_complete_response
+            return self._cypher_error_response(message)
         
         qa_step = QAStep(
             chat_session=self.qa_chat_session,
@@ -131,6 +545,7 @@ class ChatSession:
         )
 
         answer = qa_step.run(message, cypher, context)
+        self._record_timing("total", started_at)
 
         self.last_complete_response = {
             "question": message, 
@@ -138,6 +553,8 @@ class ChatSession:
             "context": context, 
             "cypher": cypher
         }
+        self._remember_qa_prompt(message, cypher, context)
+        self._compact_history()
         
         return self.last_complete_response
     
@@ -152,18 +569,13 @@ class ChatSession:
         Yields:
             str: Chunks of the response as they're generated.
         """
-        (context, cypher) = self._generate_cypher_query(message)
+        started_at = time.monotonic()
+        (context, cypher) = self._retrieve(message, self.pipelined_streaming)
 
         if not cypher or len(cypher) == 0:
             # Stream the error message for consistency with successful responses
             yield CYPHER_ERROR_RES
-            
-            self.last_complete_response = {
-                "question": message,
-                "response": CYPHER_ERROR_RES,
-                "context": None,
-                "cypher": None
-            }
+            self._cypher_error_response(message)
             return
 
         qa_step = StreamingQAStep(
@@ -173,7 +585,10 @@ class ChatSession:
 
         # Yield chunks of the response as they're generated
         for chunk in qa_step.run(message, cypher, context):
+            if self.metadata["last_timings"]["time_to_first_token"] is None:
+                self._record_timing("time_to_first_token", started_at)
             yield chunk
+        self._record_timing("total", started_at)
 
         # Set the last answer using chat history to ensure we have the complete response
         self.last_complete_response = {
@@ -182,7 +597,82 @@ class ChatSession:
             "context": context, 
             "cypher": cypher
         }
+        self._remember_qa_prompt(message, cypher, context)
+        self._compact_history()
         
+    async def asend_message(self, message: str) -> dict:
+        """
+        Sends a message to the chat session without blocking the event loop.
+
+        Args:
+            message (str): The message to send.
+
+        Returns:
+            dict: The response to the message, in the same format as `send_message`.
+        """
+        started_at = time.monotonic()
+        (context, cypher) = await self._aretrieve(message)
+
+        if not cypher or len(cypher) == 0:
+            return self._cypher_error_response(message)
+
+        qa_step = QAStep(
+            chat_session=self.qa_chat_session,
+            qa_prompt=self.qa_prompt,
+        )
+
+        answer = await qa_step.arun(message, cypher, context)
+        self._record_timing("total", started_at)
+
+        self.last_complete_response = {
+            "question": message,
+            "response": answer,
+            "context": context,
+            "cypher": cypher
+        }
+        self._remember_qa_prompt(message, cypher, context)
+        await self._acompact_history()
+
+        return self.last_complete_response
+
+    async def asend_message_stream(self, message: str) -> AsyncIterator[str]:
+        """
+        Sends a message to the chat session and streams the response, without blocking the event loop.
+
+        Args:
+            message (str): The message to send.
+
+        Yields:
+            str: Chunks of the response as they're generated.
+        """
+        started_at = time.monotonic()
+        (context, cypher) = await self._aretrieve(message, self.pipelined_streaming)
+
+        if not cypher or len(cypher) == 0:
+            yield CYPHER_ERROR_RES
+            self._cypher_error_response(message)
+            return
+
+        qa_step = StreamingQAStep(
+            chat_session=self.qa_chat_session,
+            qa_prompt=self.qa_prompt,
+        )
+
+        async for chunk in qa_step.arun(message, cypher, context):
+            if self.metadata["last_timings"]["time_to_first_token"] is None:
+                self._record_timing("time_to_first_token", started_at)
+            yield chunk
+        self._record_timing("total", started_at)
+
+        self.last_complete_response = {
+            "question": message,
+            "response": qa_step.chat_session.get_chat_history()[-1]['content'],
+            "context": context,
+            "cypher": cypher
+        }
+        self._remember_qa_prompt(message, cypher, context)
+        await self._acompact_history()
+
     def clean_ontology_for_prompt(self, ontology: dict) -> str:
         """
         Cleans the ontology by removing 'unique' and 'required' keys and prepares it for use in a prompt.
@@ -201,6 +691,7 @@ class ChatSession:
             for attribute in entity["attributes"]:
                 del attribute['unique']
                 del attribute['required']
+                attribute.pop('searchable', None)
         
         for relation in ontology["relations"]:
             for attribute in relation["attributes"]:
@@ -208,4 +699,9 @@ class ChatSession:
                 del attribute['required']
         
         # Return the transformed ontology as a JSON string
-        return json.dumps(ontology)
\ No newline at end of file
+        return json.dumps(ontology)
+
+
+def _fingerprint(*parts: Optional[str]) -> str:
+    # Stable across processes, unlike hash()
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
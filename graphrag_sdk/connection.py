@@ -0,0 +1,435 @@
+import time
+import logging
+from threading import Lock
+from concurrent.futures import Future
+from falkordb import FalkorDB, Graph
+from typing import Optional
+from falkordb.query_result import QueryResult
+from falkordb.execution_plan import ExecutionPlan
+from redis import BlockingConnectionPool
+from falkordb.asyncio import FalkorDB as AsyncFalkorDB
+from redis.asyncio import BlockingConnectionPool as AsyncBlockingConnectionPool
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_POOL_TIMEOUT = 20
+DEFAULT_HEALTH_CHECK_INTERVAL = 30
+DEFAULT_RECONNECT_RETRIES = 3
+
+REPLICA_SELECTION_ROUND_ROBIN = "round_robin"
+REPLICA_SELECTION_LEAST_LATENCY = "least_latency"
+# Weight of the latest measure in the moving average of replica latencies
+LATENCY_SMOOTHING = 0.2
+
+# Shared clients, keyed by connection parameters
+_clients: dict[tuple, FalkorDB] = {}
+_async_clients: dict[tuple, AsyncFalkorDB] = {}
+_clients_lock = Lock()
+
+
+def get_falkordb_client(
+    host: Optional[str] = "127.0.0.1",
+    port: Optional[int] = 6379,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+    pool_timeout: Optional[float] = DEFAULT_POOL_TIMEOUT,
+    health_check_interval: Optional[int] = DEFAULT_HEALTH_CHECK_INTERVAL,
+) -> FalkorDB:
+    """
+    Get a FalkorDB client backed by a bounded, shared connection pool.
+
+    Clients are shared by every caller using the same host, port and credentials,
+    so any number of knowledge graphs and chat sessions use at most `max_connections` sockets.
+    Pool settings are fixed by the first caller for a given set of connection parameters.
+
+    Args:
+        host (Optional[str]): FalkorDB hostname.
+        port (Optional[int]): FalkorDB port number.
+        username (Optional[str]): FalkorDB username.
+        password (Optional[str]): FalkorDB password.
+        max_connections (Optional[int]): Maximum number of open connections in the pool.
+        pool_timeout (Optional[float]): Seconds to wait for a free connection before failing.
+        health_check_interval (Optional[int]): Seconds of idleness after which a connection is checked before use.
+
+    Returns:
+        FalkorDB: The shared FalkorDB client.
+    """
+    key = (host, port, username, password)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            logger.debug(f"Creating connection pool for {host}:{port}")
+            pool = BlockingConnectionPool(
+                host=host,
+                port=port,
+                username=username,
+                password=password,
+                max_connections=max_connections,
+                timeout=pool_timeout,
+                health_check_interval=health_check_interval,
+                retry=Retry(ExponentialBackoff(), DEFAULT_RECONNECT_RETRIES),
+                retry_on_error=[ConnectionError, TimeoutError],
+                decode_responses=True,
+            )
+            client = FalkorDB(connection_pool=pool)
+            _clients[key] = client
+
+    return client
+
+
+def get_async_falkordb_client(
+    host: Optional[str] = "127.0.0.1",
+    port: Optional[int] = 6379,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+    pool_timeout: Optional[float] = DEFAULT_POOL_TIMEOUT,
+    health_check_interval: Optional[int] = DEFAULT_HEALTH_CHECK_INTERVAL,
+) -> AsyncFalkorDB:
+    """
+    Get an asynchronous FalkorDB client backed by a bounded, shared connection pool.
+
+    The asynchronous counterpart of `get_falkordb_client`, for use from a single event loop.
+
+    Args:
+        host (Optional[str]): FalkorDB hostname.
+        port (Optional[int]): FalkorDB port number.
+        username (Optional[str]): FalkorDB username.
+        password (Optional[str]): FalkorDB password.
+        max_connections (Optional[int]): Maximum number of open connections in the pool.
+        pool_timeout (Optional[float]): Seconds to wait for a free connection before failing.
+        health_check_interval (Optional[int]): Seconds of idleness after which a connection is checked before use.
+
+    Returns:
+        AsyncFalkorDB: The shared asynchronous FalkorDB client.
+    """
+    key = (host, port, username, password)
+    with _clients_lock:
+        client = _async_clients.get(key)
+        if client is None:
+            logger.debug(f"Creating asynchronous connection pool for {host}:{port}")
+            pool = AsyncBlockingConnectionPool(
+                host=host,
+                port=port,
+                username=username,
+                password=password,
+                max_connections=max_connections,
+                timeout=pool_timeout,
+                health_check_interval=health_check_interval,
+                retry=AsyncRetry(ExponentialBackoff(), DEFAULT_RECONNECT_RETRIES),
+                retry_on_error=[ConnectionError, TimeoutError],
+                decode_responses=True,
+            )
+            client = AsyncFalkorDB(connection_pool=pool)
+            _async_clients[key] = client
+
+    return client
+
+
+def close_falkordb_clients() -> None:
+    """
+    Disconnect and forget all shared FalkorDB clients.
+
+    Asynchronous clients are forgotten; close them with `await client.connection.aclose()` beforehand if needed.
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            pool = getattr(client.connection, "connection_pool", None)
+            if pool is not None:
+                pool.disconnect()
+        _clients.clear()
+        _async_clients.clear()
+
+
+class ReplicatedGraph:
+    """
+    Graph routing read-only queries to read replicas, and every other query to the primary.
+
+    Replicas are selected in turn (`round_robin`) or by lowest moving average of their
+    response times (`least_latency`). A read-only query falls back to the primary when its
+    replica is unreachable. Replicas are eventually consistent: results may briefly lag
+    behind writes made to the primary.
+
+    Args:
+        primary (Graph): The graph on the primary.
+        replicas (list[Graph]): The same graph on the read replicas.
+        selection (str): The replica selection strategy, `round_robin` or `least_latency`.
+
+    Examples:
+        >>> kg = KnowledgeGraph("test_kg", model_config, ontology,
+        ...     replicas=[("replica-1", 6379), ("replica-2", 6379)], replica_selection="least_latency")
+    """
+
+    def __init__(
+        self,
+        primary: Graph,
+        replicas: list[Graph],
+        selection: str = REPLICA_SELECTION_ROUND_ROBIN,
+    ):
+        """
+        Initializes a new ReplicatedGraph object.
+
+        Args:
+            primary (Graph): The graph on the primary.
+            replicas (list[Graph]): The same graph on the read replicas.
+            selection (str): The replica selection strategy.
+        """
+        if selection not in (REPLICA_SELECTION_ROUND_ROBIN, REPLICA_SELECTION_LEAST_LATENCY):
+            raise Exception(f"Unknown replica selection strategy: {selection}")
+        if len(replicas) == 0:
+            raise Exception("At least one replica is required")
+
+        self.primary = primary
+        self.replicas = replicas
+        self.selection = selection
+        self.latencies: list[Optional[float]] = [None] * len(replicas)
+        self._next = 0
+        self._lock = Lock()
+
+    @property
+    def name(self) -> str:
+        return self.primary.name
+
+    def query(self, q: str, params: Optional[dict] = None, timeout: Optional[int] = None) -> QueryResult:
+        """
+        Executes a query on the primary.
+
+        Args:
+            q (str): The query.
+            params (Optional[dict]): The query parameters.
+            timeout (Optional[int]): The query timeout in milliseconds.
+
+        Returns:
+            QueryResult: The query result.
+        """
+        return self.primary.query(q, params, timeout=timeout)
+
+    def ro_query(self, q: str, params: Optional[dict] = None, timeout: Optional[int] = None) -> QueryResult:
+        """
+        Executes a read-only query on a replica.
+
+        Args:
+            q (str): The query.
+            params (Optional[dict]): The query parameters.
+            timeout (Optional[int]): The query timeout in milliseconds.
+
+        Returns:
+            QueryResult: The query result.
+        """
+        return self._on_replica("ro_query", q, params, timeout=timeout)
+
+    def explain(self, query: str, params: Optional[dict] = None) -> ExecutionPlan:
+        """
+        Gets the execution plan of a query from a replica.
+
+        Args:
+            query (str): The query.
+            params (Optional[dict]): The query parameters.
+
+        Returns:
+            ExecutionPlan: The execution plan.
+        """
+        return self._on_replica("explain", query, params)
+
+    def _on_replica(self, method: str, *args, **kwargs):
+        index = self._select()
+        start = time.monotonic()
+        try:
+            result = getattr(self.replicas[index], method)(*args, **kwargs)
+        except (ConnectionError, TimeoutError) as e:
+            logger.warning(f"Replica {index} unavailable, querying the primary: {e}")
+            # Deprioritize the replica until it answers again
+            self._record_latency(index, float("inf"))
+            return getattr(self.primary, method)(*args, **kwargs)
+
+        self._record_latency(index, time.monotonic() - start)
+        return result
+
+    def _select(self) -> int:
+        with self._lock:
+            if self.selection == REPLICA_SELECTION_LEAST_LATENCY:
+                # Replicas without measures are tried first
+                return min(
+                    range(len(self.replicas)),
+                    key=lambda i: -1 if self.latencies[i] is None else self.latencies[i],
+                )
+            index = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+            return index
+
+    def _record_latency(self, index: int, latency: float) -> None:
+        with self._lock:
+            previous = self.latencies[index]
+            if previous is None or previous == float("inf") or latency == float("inf"):
+                self.latencies[index] = latency
+            else:
+                self.latencies[index] = (
+                    LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * previous
+                )
+
+
+class AsyncReplicatedGraph(ReplicatedGraph):
+    """
+    The asynchronous counterpart of `ReplicatedGraph`, routing the read-only queries of the
+    asynchronous chat API to read replicas.
+
+    Args:
+        primary (AsyncGraph): The graph on the primary.
+        replicas (list[AsyncGraph]): The same graph on the read replicas.
+        selection (str): The replica selection strategy, `round_robin` or `least_latency`.
+    """
+
+    async def query(self, q: str, params: Optional[dict] = None, timeout: Optional[int] = None) -> QueryResult:
+        """
+        Executes a query on the primary.
+
+        Args:
+            q (str): The query.
+            params (Optional[dict]): The query parameters.
+            timeout (Optional[int]): The query timeout in milliseconds.
+
+        Returns:
+            QueryResult: The query result.
+        """
+        return await self.primary.query(q, params, timeout=timeout)
+
+    async def ro_query(self, q: str, params: Optional[dict] = None, timeout: Optional[int] = None) -> QueryResult:
+        """
+        Executes a read-only query on a replica.
+
+        Args:
+            q (str): The query.
+            params (Optional[dict]): The query parameters.
+            timeout (Optional[int]): The query timeout in milliseconds.
+
+        Returns:
+            QueryResult: The query result.
+        """
+        return await self._on_replica("ro_query", q, params, timeout=timeout)
+
+    async def explain(self, query: str, params: Optional[dict] = None) -> ExecutionPlan:
+        """
+        Gets the execution plan of a query from a replica.
+
+        Args:
+            query (str): The query.
+            params (Optional[dict]): The query parameters.
+
+        Returns:
+            ExecutionPlan: The execution plan.
+        """
+        return await self._on_replica("explain", query, params)
+
+    async def _on_replica(self, method: str, *args, **kwargs):
+        index = self._select()
+        start = time.monotonic()
+        try:
+            result = await getattr(self.replicas[index], method)(*args, **kwargs)
+        except (ConnectionError, TimeoutError) as e:
+            logger.warning(f"Replica {index} unavailable, querying the primary: {e}")
+            self._record_latency(index, float("inf"))
+            return await getattr(self.primary, method)(*args, **kwargs)
+
+        self._record_latency(index, time.monotonic() - start)
+        return result
+
+
+class DeduplicatedGraph:
+    """
+    Graph executing each distinct query once, for the lifetime of the object.
+
+    Concurrent calls with the same query wait for the first one and share its result, or its error.
+    Meant for a batch of questions over a graph which does not change meanwhile.
+
+    Args:
+        graph (Graph): The graph to query.
+
+    Attributes:
+        executed (int): The number of queries executed.
+        deduplicated (int): The number of queries served from an earlier execution.
+    """
+
+    def __init__(self, graph: Graph):
+        """
+        Initializes a new DeduplicatedGraph object.
+
+        Args:
+            graph (Graph): The graph to query.
+        """
+        self.graph = graph
+        self.executed = 0
+        self.deduplicated = 0
+        self._results: dict[tuple, Future] = {}
+        self._lock = Lock()
+
+    @property
+    def name(self) -> str:
+        return self.graph.name
+
+    def query(self, q: str, params: Optional[dict] = None, timeout: Optional[int] = None) -> QueryResult:
+        """
+        Executes a query, once per distinct query and parameters.
+
+        Args:
+            q (str): The query.
+            params (Optional[dict]): The query parameters.
+            timeout (Optional[int]): The query timeout in milliseconds.
+
+        Returns:
+            QueryResult: The query result.
+        """
+        return self._once("query", q, params, timeout)
+
+    def ro_query(self, q: str, params: Optional[dict] = None, timeout: Optional[int] = None) -> QueryResult:
+        """
+        Executes a read-only query, once per distinct query and parameters.
+
+        Args:
+            q (str): The query.
+            params (Optional[dict]): The query parameters.
+            timeout (Optional[int]): The query timeout in milliseconds.
+
+        Returns:
+            QueryResult: The query result.
+        """
+        return self._once("ro_query", q, params, timeout)
+
+    def explain(self, query: str, params: Optional[dict] = None) -> ExecutionPlan:
+        """
+        Gets the execution plan of a query.
+
+        Args:
+            query (str): The query.
+            params (Optional[dict]): The query parameters.
+
+        Returns:
+            ExecutionPlan: The execution plan.
+        """
+        return self.graph.explain(query, params)
+
+    def _once(self, method: str, q: str, params: Optional[dict], timeout: Optional[int]) -> QueryResult:
+        key = (method, q, repr(sorted(params.items())) if params else None)
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._results[key] = future
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+
+        if owner:
+            try:
+                future.set_result(getattr(self.graph, method)(q, params, timeout=timeout))
+            except Exception as e:
+                future.set_exception(e)
+
+        return future.result()
@@ -0,0 +1,360 @@
+import json
+import logging
+from typing import Any, Iterable, Optional
+from falkordb import Node, Edge, Path
+
+
+logger = logging.getLogger(__name__)
+
+# Rough number of characters per token, used to estimate the size of the context
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens in a text.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class ContextBuilder:
+    """
+    Renders a FalkorDB result set into a compact QA context within a token budget.
+
+    Nodes, edges and paths are rendered with their labels and relevant properties only:
+    SDK internal properties and embedding vectors are omitted. Duplicate rows are skipped, and rows
+    exceeding the budget are replaced by a summary line. The statistics of the last build,
+    including how much was dropped, are available in `stats`.
+
+    Args:
+        max_tokens (Optional[int]): The maximum estimated number of tokens in the context. Defaults to None, unbounded.
+
+    Examples:
+        >>> builder = ContextBuilder(max_tokens=2000)
+        >>> context = builder.build(query_result.result_set, ["m", "a"])
+        >>> builder.stats
+        {'rows': 120, 'rows_included': 80, 'rows_dropped': 40, 'duplicate_rows': 0, 'tokens': 1998}
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None):
+        """
+        Initializes a new ContextBuilder object.
+
+        Args:
+            max_tokens (Optional[int]): The maximum estimated number of tokens in the context.
+        """
+        self.max_tokens = max_tokens
+        self.stats = {}
+
+    def build(self, result_set: Iterable[list], header: Optional[list[str]] = None) -> str:
+        """
+        Builds the context from a result set, streaming over its rows.
+
+        Args:
+            result_set (Iterable[list]): The rows returned by the query.
+            header (Optional[list[str]]): The column names.
+
+        Returns:
+            str: The rendered context.
+        """
+        lines = []
+        tokens = 0
+        rows = 0
+        included = 0
+        duplicates = 0
+        truncated = False
+        seen = set()
+
+        if header:
+            lines.append(" | ".join(header))
+            tokens += estimate_tokens(lines[0]) + 1
+
+        for row in result_set:
+            rows += 1
+            if truncated:
+                continue
+
+            line = self.render_row(row)
+            if line in seen:
+                duplicates += 1
+                continue
+
+            line_tokens = estimate_tokens(line) + 1
+            if self.max_tokens is not None and tokens + line_tokens > self.max_tokens:
+                truncated = True
+                continue
+
+            seen.add(line)
+            lines.append(line)
+            tokens += line_tokens
+            included += 1
+
+        dropped = rows - included - duplicates
+        if dropped > 0:
+            lines.append(
+                f"... {dropped} more rows omitted, {included} of {rows} rows shown"
+            )
+            logger.debug(f"Context truncated: {dropped} of {rows} rows dropped")
+
+        self.stats = {
+            "rows": rows,
+            "rows_included": included,
+            "rows_dropped": dropped,
+            "duplicate_rows": duplicates,
+            "tokens": tokens,
+        }
+
+        return "\n".join(lines)
+
+    def cache_key(self) -> tuple:
+        """
+        Returns the settings affecting the rendered context, to scope cached contexts.
+
+        Returns:
+            tuple: The builder settings.
+        """
+        return (type(self).__name__, self.max_tokens)
+
+    def render_row(self, row: Any) -> str:
+        """
+        Renders a single row of the result set.
+
+        Args:
+            row (Any): The row to render.
+
+        Returns:
+            str: The rendered row.
+        """
+        if not isinstance(row, list):
+            return self.render_value(row)
+        return " | ".join(self.render_value(value) for value in row)
+
+    def render_value(self, value: Any) -> str:
+        """
+        Renders a single value of the result set.
+
+        Args:
+            value (Any): The value to render.
+
+        Returns:
+            str: The rendered value.
+        """
+        if isinstance(value, Node):
+            return f"({':'.join([''] + (value.labels or []))} {self.render_properties(value.properties)})"
+        if isinstance(value, Edge):
+            return f"[:{value.relation} {self.render_properties(value.properties)}]"
+        if isinstance(value, Path):
+            previous = value.first_node()
+            rendered = self.render_value(previous)
+            for edge, node in zip(value.edges(), value.nodes()[1:]):
+                # A path may traverse its edges in either direction
+                if _node_id(edge.src_node) == previous.id:
+                    rendered += f"-{self.render_value(edge)}->{self.render_value(node)}"
+                else:
+                    rendered += f"<-{self.render_value(edge)}-{self.render_value(node)}"
+                previous = node
+            return rendered
+        if isinstance(value, list):
+            return f"[{', '.join(self.render_value(v) for v in value)}]"
+        if isinstance(value, dict):
+            return self.render_properties(value)
+        if isinstance(value, str):
+            return value
+        return json.dumps(value, default=str)
+
+    def render_properties(self, properties: dict) -> str:
+        """
+        Renders the relevant properties of a node or edge.
+
+        Args:
+            properties (dict): The properties to render.
+
+        Returns:
+            str: The rendered properties.
+        """
+        relevant = {
+            key: value
+            for key, value in properties.items()
+            if not key.startswith("__") and not _is_vector(value)
+        }
+        return json.dumps(relevant, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _is_vector(value: Any) -> bool:
+    # Embedding vectors carry no meaning for the QA model
+    return (
+        isinstance(value, list)
+        and len(value) > 16
+        and all(isinstance(v, float) for v in value)
+    )
+
+
+class DeduplicatedContextBuilder(ContextBuilder):
+    """
+    Renders a FalkorDB result set as a table of distinct nodes and edges referenced from the rows.
+
+    Each node and edge is defined once, by id, no matter how many rows return it, which keeps
+    multi-hop and join results small. Rows reference nodes as `n<id>` and edges as `e<id>`.
+    Edge endpoints which are not returned as nodes are shown by id, as `(#<id>)`.
+
+    Args:
+        max_tokens (Optional[int]): The maximum estimated number of tokens in the context. Defaults to None, unbounded.
+
+    Examples:
+        >>> builder = DeduplicatedContextBuilder(max_tokens=2000)
+        >>> print(builder.build(query_result.result_set, ["a", "r", "m"]))
+        Nodes:
+        n1 (:Actor {"name":"Keanu Reeves"})
+        n0 (:Movie {"title":"The Matrix"})
+        Edges:
+        e0 n1-[:ACTED_IN {"role":"Neo"}]->n0
+        Rows:
+        a | r | m
+        n1 | e0 | n0
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None):
+        """
+        Initializes a new DeduplicatedContextBuilder object.
+
+        Args:
+            max_tokens (Optional[int]): The maximum estimated number of tokens in the context.
+        """
+        super().__init__(max_tokens)
+        self._definitions: dict[str, str] = {}
+        self._pending: dict[str, str] = {}
+        self._pending_edges: dict[str, Edge] = {}
+
+    def build(self, result_set: Iterable[list], header: Optional[list[str]] = None) -> str:
+        """
+        Builds the context from a result set, streaming over its rows.
+
+        Args:
+            result_set (Iterable[list]): The rows returned by the query.
+            header (Optional[list[str]]): The column names.
+
+        Returns:
+            str: The rendered context.
+        """
+        self._definitions = {}
+        self._pending = {}
+        self._pending_edges = {}
+        rows_lines = []
+        tokens = 0
+        rows = 0
+        included = 0
+        duplicates = 0
+        truncated = False
+        seen = set()
+
+        if header:
+            rows_lines.append(" | ".join(header))
+            tokens += estimate_tokens(rows_lines[0]) + 1
+
+        for row in result_set:
+            rows += 1
+            if truncated:
+                continue
+
+            self._pending = {}
+            self._pending_edges = {}
+            line = self.render_row(row)
+            self._define_edges()
+            if line in seen:
+                duplicates += 1
+                continue
+
+            line_tokens = estimate_tokens(line) + 1 + sum(
+                estimate_tokens(definition) + 1 for definition in self._pending.values()
+            )
+            if self.max_tokens is not None and tokens + line_tokens > self.max_tokens:
+                truncated = True
+                continue
+
+            # Commit the definitions first referenced by this row
+            self._definitions.update(self._pending)
+            seen.add(line)
+            rows_lines.append(line)
+            tokens += line_tokens
+            included += 1
+
+        nodes = [d for ref, d in self._definitions.items() if ref.startswith("n")]
+        edges = [d for ref, d in self._definitions.items() if ref.startswith("e")]
+        lines = []
+        if nodes:
+            lines += ["Nodes:"] + nodes
+        if edges:
+            lines += ["Edges:"] + edges
+        lines += ["Rows:"] + rows_lines
+
+        dropped = rows - included - duplicates
+        if dropped > 0:
+            lines.append(
+                f"... {dropped} more rows omitted, {included} of {rows} rows shown"
+            )
+            logger.debug(f"Context truncated: {dropped} of {rows} rows dropped")
+
+        self.stats = {
+            "rows": rows,
+            "rows_included": included,
+            "rows_dropped": dropped,
+            "duplicate_rows": duplicates,
+            "nodes": len(nodes),
+            "edges": len(edges),
+            "tokens": tokens,
+        }
+
+        return "\n".join(lines)
+
+    def render_value(self, value: Any) -> str:
+        """
+        Renders a single value of the result set, replacing nodes and edges by references.
+
+        Args:
+            value (Any): The value to render.
+
+        Returns:
+            str: The rendered value.
+        """
+        if isinstance(value, Node):
+            ref = f"n{value.id}"
+            if self._is_new(ref):
+                self._pending[ref] = f"{ref} {super().render_value(value)}"
+            return ref
+        if isinstance(value, Edge):
+            ref = f"e{value.id}"
+            if self._is_new(ref):
+                # Endpoint nodes are defined along with the edge, the definition waits for the rest of the row
+                for node in (value.src_node, value.dest_node):
+                    if isinstance(node, Node):
+                        self.render_value(node)
+                self._pending_edges[ref] = value
+            return ref
+        if isinstance(value, list):
+            return f"[{', '.join(self.render_value(v) for v in value)}]"
+        return super().render_value(value)
+
+    def _define_edges(self) -> None:
+        for (ref, edge) in self._pending_edges.items():
+            src, dest = self._endpoint(edge.src_node), self._endpoint(edge.dest_node)
+            self._pending[ref] = f"{ref} {src}-{super().render_value(edge)}->{dest}"
+        self._pending_edges = {}
+
+    def _endpoint(self, node: Any) -> str:
+        # Endpoints returned by the query are referenced, the others are shown by id
+        ref = f"n{_node_id(node)}"
+        return f"(#{_node_id(node)})" if self._is_new(ref) else ref
+
+    def _is_new(self, ref: str) -> bool:
+        return ref not in self._definitions and ref not in self._pending and ref not in self._pending_edges
+
+
+def _node_id(node: Any) -> Any:
+    # Edge endpoints are either node ids or nodes
+    return node.id if isinstance(node, Node) else node
@@ -0,0 +1,455 @@
+import re
+from typing import Optional
+
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+    | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    | (?P<identifier>`[^`]*`|[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<number>\d+\.\d+(?:[eE][+-]?\d+)?|\d+(?:[eE][+-]?\d+)?)
+    | (?P<parameter>\$\w+)
+    | (?P<range>\.\.)
+    | (?P<symbol>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+DIRECTION_OUTGOING = "outgoing"
+DIRECTION_INCOMING = "incoming"
+DIRECTION_UNDIRECTED = "undirected"
+
+
+class Token:
+    """
+    Represents a lexical token of a Cypher query.
+
+    Args:
+        kind (str): The token kind: string, identifier, number, parameter, range or symbol.
+        value (str): The token text, without quotes or backticks for identifiers.
+    """
+
+    __slots__ = ("kind", "value")
+
+    def __init__(self, kind: str, value: str):
+        self.kind = kind
+        self.value = value
+
+    def is_symbol(self, value: str) -> bool:
+        return self.kind == "symbol" and self.value == value
+
+    def __repr__(self) -> str:
+        return f"Token({self.kind}, {self.value!r})"
+
+
+def tokenize(cypher: str) -> list[Token]:
+    """
+    Splits a Cypher query into tokens, skipping whitespace and comments.
+
+    Args:
+        cypher (str): The Cypher query.
+
+    Returns:
+        list[Token]: The tokens of the query.
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(cypher):
+        kind = match.lastgroup
+        if kind == "space":
+            continue
+        value = match.group(0)
+        if kind == "identifier" and value.startswith("`"):
+            value = value[1:-1]
+        tokens.append(Token(kind, value))
+    return tokens
+
+
+def mask_literals(cypher: str) -> str:
+    """
+    Blanks the string literals, quoted identifiers and comments of a Cypher query, keeping every position,
+    so that patterns matched on the masked query never match their content.
+
+    Args:
+        cypher (str): The Cypher query.
+
+    Returns:
+        str: The masked query, as long as the query.
+    """
+    masked = []
+    for match in _TOKEN_PATTERN.finditer(cypher):
+        value = match.group(0)
+        if match.lastgroup == "string" or (match.lastgroup == "identifier" and value.startswith("`")):
+            value = value[0] + "_" * (len(value) - 2) + value[-1]
+        elif match.lastgroup == "space" and not value.isspace():
+            value = " " * len(value)
+        masked.append(value)
+    return "".join(masked)
+
+
+class NodePattern:
+    """
+    Represents a node pattern, e.g. `(m:Movie {title: 'The Matrix'})`.
+
+    Args:
+        variable (Optional[str]): The node variable.
+        labels (list[str]): The node labels.
+        properties (dict[str, Optional[Token]]): The inline properties, mapped to their value when a literal.
+    """
+
+    def __init__(self, variable: Optional[str], labels: list[str], properties: dict[str, Optional[Token]]):
+        self.variable = variable
+        self.labels = labels
+        self.properties = properties
+
+
+class RelationshipPattern:
+    """
+    Represents a relationship pattern, e.g. `-[r:ACTED_IN|DIRECTED*1..2]->`.
+
+    Args:
+        variable (Optional[str]): The relationship variable.
+        types (list[str]): The relationship types, any of which may match.
+        direction (str): The direction, outgoing, incoming or undirected.
+        properties (dict[str, Optional[Token]]): The inline properties, mapped to their value when a literal.
+    """
+
+    def __init__(
+        self,
+        variable: Optional[str],
+        types: list[str],
+        direction: str,
+        properties: dict[str, Optional[Token]],
+    ):
+        self.variable = variable
+        self.types = types
+        self.direction = direction
+        self.properties = properties
+
+
+class PathPattern:
+    """
+    Represents a chain of node patterns connected by relationship patterns.
+    The relationship `relationships[i]` connects `nodes[i]` to `nodes[i + 1]`.
+
+    Args:
+        nodes (list[NodePattern]): The node patterns.
+        relationships (list[RelationshipPattern]): The relationship patterns.
+    """
+
+    def __init__(self, nodes: list[NodePattern], relationships: list[RelationshipPattern]):
+        self.nodes = nodes
+        self.relationships = relationships
+
+
+class PropertyAccess:
+    """
+    Represents a property read from a variable, e.g. `m.title` in `WHERE m.title = 'The Matrix'`.
+
+    Args:
+        variable (str): The variable.
+        name (str): The property name.
+        operator (Optional[str]): The comparison operator, when compared to a literal.
+        value (Optional[Token]): The literal compared to the property.
+    """
+
+    def __init__(self, variable: str, name: str, operator: Optional[str] = None, value: Optional[Token] = None):
+        self.variable = variable
+        self.name = name
+        self.operator = operator
+        self.value = value
+
+
+_COMPARISON_SYMBOLS = {("=",), ("<",), (">",), ("<", "="), (">", "="), ("<", ">"), ("!", "=")}
+_STRING_OPERATORS = {"CONTAINS": 1, "STARTS": 2, "ENDS": 2}
+
+
+def literal_type(token: Token) -> Optional[str]:
+    """
+    Returns the type of a literal token.
+
+    Args:
+        token (Token): The token.
+
+    Returns:
+        Optional[str]: string, number or boolean, or None if the token is not a literal.
+    """
+    if token.kind == "string":
+        return "string"
+    if token.kind == "number":
+        return "number"
+    if token.kind == "identifier" and token.value.lower() in ("true", "false"):
+        return "boolean"
+    return None
+
+
+class ParsedCypher:
+    """
+    The patterns of a Cypher query, with the labels and types bound to each variable.
+
+    Args:
+        tokens (list[Token]): The tokens of the query.
+        paths (list[PathPattern]): The path patterns, in order of appearance.
+        property_accesses (list[PropertyAccess]): The properties read from variables.
+    """
+
+    def __init__(
+        self,
+        tokens: list[Token],
+        paths: list[PathPattern],
+        property_accesses: Optional[list[PropertyAccess]] = None,
+    ):
+        self.tokens = tokens
+        self.paths = paths
+        self.property_accesses = property_accesses or []
+        self.node_labels: dict[str, list[str]] = {}
+        self.relationship_types: dict[str, list[str]] = {}
+        for path in paths:
+            for node in path.nodes:
+                if node.variable is not None:
+                    _extend_unique(self.node_labels.setdefault(node.variable, []), node.labels)
+            for relationship in path.relationships:
+                if relationship.variable is not None:
+                    _extend_unique(
+                        self.relationship_types.setdefault(relationship.variable, []),
+                        relationship.types,
+                    )
+
+    def labels_of(self, node: NodePattern) -> list[str]:
+        """
+        Returns the labels of a node pattern, including those bound to its variable elsewhere in the query.
+
+        Args:
+            node (NodePattern): The node pattern.
+
+        Returns:
+            list[str]: The node labels.
+        """
+        if node.variable is None:
+            return node.labels
+        return self.node_labels.get(node.variable, node.labels)
+
+
+def _extend_unique(values: list[str], new_values: list[str]) -> None:
+    for value in new_values:
+        if value not in values:
+            values.append(value)
+
+
+def parse_cypher(cypher: str) -> ParsedCypher:
+    """
+    Parses the node and relationship patterns of a Cypher query in a single pass over its tokens.
+
+    The parser is lenient: anything which is not a pattern, such as expressions and clauses, is skipped.
+
+    Args:
+        cypher (str): The Cypher query.
+
+    Returns:
+        ParsedCypher: The parsed patterns.
+    """
+    return _PatternParser(tokenize(cypher)).parse()
+
+
+class _PatternParser:
+
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+
+    def parse(self) -> ParsedCypher:
+        paths = []
+        i = 0
+        while i < len(self.tokens):
+            if not self.tokens[i].is_symbol("("):
+                i += 1
+                continue
+
+            parsed_node = self._node(i)
+            if parsed_node is None:
+                i += 1
+                continue
+
+            node, i = parsed_node
+            nodes, relationships = [node], []
+            while True:
+                parsed_relationship = self._relationship(i)
+                if parsed_relationship is None:
+                    break
+                relationship, j = parsed_relationship
+                parsed_node = self._node(j)
+                if parsed_node is None:
+                    break
+                node, i = parsed_node
+                relationships.append(relationship)
+                nodes.append(node)
+
+            paths.append(PathPattern(nodes, relationships))
+
+        return ParsedCypher(self.tokens, paths, self._property_accesses())
+
+    def _property_accesses(self) -> list[PropertyAccess]:
+        # variable.property, optionally compared to a literal on either side
+        accesses = []
+        for i in range(len(self.tokens) - 2):
+            variable = self._identifier(i)
+            name = self._identifier(i + 2)
+            if variable is None or name is None or not self._symbol(i + 1, "."):
+                continue
+            if i > 0 and self._symbol(i - 1, "."):
+                continue
+
+            operator, value = self._comparison_after(i + 3)
+            if operator is None:
+                operator, value = self._comparison_before(i - 1)
+            accesses.append(PropertyAccess(variable, name, operator, value))
+        return accesses
+
+    def _comparison_after(self, i: int) -> tuple[Optional[str], Optional[Token]]:
+        keyword = self._identifier(i)
+        if keyword is not None and keyword.upper() in _STRING_OPERATORS:
+            operator_length = _STRING_OPERATORS[keyword.upper()]
+            operator = " ".join(self.tokens[j].value.upper() for j in range(i, i + operator_length) if j < len(self.tokens))
+            value = self._at(i + operator_length)
+            return (operator, value) if value is not None and literal_type(value) else (None, None)
+
+        for symbols in sorted(_COMPARISON_SYMBOLS, key=len, reverse=True):
+            if all(self._symbol(i + k, symbol) for k, symbol in enumerate(symbols)):
+                value = self._at(i + len(symbols))
+                if value is not None and literal_type(value) is not None:
+                    return "".join(symbols), value
+                return None, None
+        return None, None
+
+    def _comparison_before(self, i: int) -> tuple[Optional[str], Optional[Token]]:
+        for symbols in sorted(_COMPARISON_SYMBOLS, key=len, reverse=True):
+            start = i - len(symbols) + 1
+            if start > 0 and all(self._symbol(start + k, symbol) for k, symbol in enumerate(symbols)):
+                value = self._at(start - 1)
+                if literal_type(value) is not None and not (start > 1 and self._symbol(start - 2, ".")):
+                    return "".join(symbols), value
+                return None, None
+        return None, None
+
+    def _at(self, i: int) -> Optional[Token]:
+        return self.tokens[i] if i < len(self.tokens) else None
+
+    def _symbol(self, i: int, value: str) -> bool:
+        token = self._at(i)
+        return token is not None and token.is_symbol(value)
+
+    def _identifier(self, i: int) -> Optional[str]:
+        token = self._at(i)
+        return token.value if token is not None and token.kind == "identifier" else None
+
+    def _node(self, i: int) -> Optional[tuple[NodePattern, int]]:
+        # ( [variable] [:Label[:Label...]] [{properties}] )
+        if not self._symbol(i, "("):
+            return None
+        i += 1
+
+        variable = self._identifier(i)
+        if variable is not None:
+            i += 1
+
+        labels = []
+        while self._symbol(i, ":") and self._identifier(i + 1) is not None:
+            labels.append(self._identifier(i + 1))
+            i += 2
+
+        properties = {}
+        if self._symbol(i, "{"):
+            parsed_properties = self._properties(i)
+            if parsed_properties is None:
+                return None
+            properties, i = parsed_properties
+
+        if not self._symbol(i, ")"):
+            return None
+
+        return NodePattern(variable, labels, properties), i + 1
+
+    def _relationship(self, i: int) -> Optional[tuple[RelationshipPattern, int]]:
+        # <-[...]- | -[...]-> | -[...]- | <-- | --> | --
+        incoming = self._symbol(i, "<")
+        if incoming:
+            i += 1
+        if not self._symbol(i, "-"):
+            return None
+        i += 1
+
+        variable, types, properties = None, [], {}
+        if self._symbol(i, "["):
+            i += 1
+            variable = self._identifier(i)
+            if variable is not None:
+                i += 1
+
+            if self._symbol(i, ":"):
+                i += 1
+                while self._identifier(i) is not None:
+                    types.append(self._identifier(i))
+                    i += 1
+                    if not self._symbol(i, "|"):
+                        break
+                    i += 2 if self._symbol(i + 1, ":") else 1
+
+            # Variable length, e.g. *, *2, *1..3
+            if self._symbol(i, "*"):
+                i += 1
+                while self._at(i) is not None and self._at(i).kind in ("number", "range"):
+                    i += 1
+
+            if self._symbol(i, "{"):
+                parsed_properties = self._properties(i)
+                if parsed_properties is None:
+                    return None
+                properties, i = parsed_properties
+
+            if not self._symbol(i, "]"):
+                return None
+            i += 1
+
+        if not self._symbol(i, "-"):
+            return None
+        i += 1
+
+        outgoing = self._symbol(i, ">")
+        if outgoing:
+            i += 1
+
+        if outgoing and not incoming:
+            direction = DIRECTION_OUTGOING
+        elif incoming and not outgoing:
+            direction = DIRECTION_INCOMING
+        else:
+            direction = DIRECTION_UNDIRECTED
+
+        return RelationshipPattern(variable, types, direction, properties), i
+
+    def _properties(self, i: int) -> Optional[tuple[dict[str, Optional[Token]], int]]:
+        # { key: value, ... }, values are kept when they are a single literal
+        properties = {}
+        i += 1
+        while not self._symbol(i, "}"):
+            key = self._at(i)
+            if key is None or key.kind not in ("identifier", "string") or not self._symbol(i + 1, ":"):
+                return None
+            i += 2
+
+            start, depth = i, 0
+            while self._at(i) is not None:
+                token = self._at(i)
+                if depth == 0 and (token.is_symbol(",") or token.is_symbol("}")):
+                    break
+                if token.kind == "symbol" and token.value in "([{":
+                    depth += 1
+                elif token.kind == "symbol" and token.value in ")]}":
+                    depth -= 1
+                i += 1
+            if self._at(i) is None:
+                return None
+
+            properties[key.value.strip("'\"")] = self.tokens[start] if i - start == 1 else None
+            if self._symbol(i, ","):
+                i += 1
+
+        return properties, i + 1
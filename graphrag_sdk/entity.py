@@ -25,6 +25,7 @@ class Entity:
         merge(entity2: Entity) -> Entity: Overwrites attributes of self with attributes of entity2.
         get_unique_attributes() -> list[Attribute]: Returns a list of unique attributes of the entity.
         to_graph_query() -> str: Generates a Cypher query to merge the entity in the graph.
+        to_merge_clause(variable: str) -> str: Generates the Cypher MERGE clause for the entity.
     """
 
     def __init__(self, label: str, attributes: list[Attribute], description: str = ""):
@@ -137,6 +138,18 @@ class Entity:
         Returns:
             str: The Cypher query string.
         """
+        return f"{self.to_merge_clause('n')} RETURN n"
+
+    def to_merge_clause(self, variable: str) -> str:
+        """
+        Generates the Cypher MERGE clause creating or updating the entity's node.
+
+        Args:
+            variable (str): The variable name bound to the node.
+
+        Returns:
+            str: The Cypher clause.
+        """
         unique_attributes = ", ".join(
             [str(attr) for attr in self.attributes if attr.unique]
         )
@@ -145,7 +158,7 @@ class Entity:
         )
         if self.description:
             non_unique_attributes += f"{', ' if len(non_unique_attributes) > 0 else ''} {descriptionKey}: '{self.description}'"
-        return f"MERGE (n:{self.label} {{{unique_attributes}}}) SET n += {{{non_unique_attributes}}} RETURN n"
+        return f"MERGE ({variable}:{self.label} {{{unique_attributes}}}) SET {variable} += {{{non_unique_attributes}}}"
 
     def __str__(self) -> str:
         """
@@ -0,0 +1,246 @@
+import re
+import math
+import logging
+import unicodedata
+from falkordb import Graph
+from threading import Lock
+from collections import defaultdict
+from typing import Callable, Optional
+from graphrag_sdk.ontology import Ontology
+from graphrag_sdk.cache import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_MAX_CANDIDATES = 50
+DEFAULT_EMBEDDING_CACHE_SIZE = 10000
+
+
+def normalize_name(text: str) -> str:
+    """
+    Normalizes an entity name for comparison: accents, case, punctuation and spacing are ignored.
+
+    Args:
+        text (str): The entity name.
+
+    Returns:
+        str: The normalized name.
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def blocking_keys(text: str) -> set[str]:
+    """
+    The blocking keys of an entity name, only names sharing a key are compared.
+
+    The keys are the words of the normalized name, initials excepted, so that "J. Smith" and "John Smith"
+    share the "smith" key.
+
+    Args:
+        text (str): The entity name.
+
+    Returns:
+        set[str]: The blocking keys.
+    """
+    name = normalize_name(text)
+    keys = {word for word in name.split() if len(word) > 1}
+    if len(keys) == 0 and name != "":
+        keys.add(name)
+    return keys
+
+
+def _cosine_similarity(a: list[float], b: list[float]) -> float:
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    if norm == 0:
+        return 0.0
+    return sum(x * y for (x, y) in zip(a, b)) / norm
+
+
+class EntityResolver:
+    """
+    Links the entity mentions extracted from documents to the entities already known, so that name variants
+    such as "J. Smith" and "John Smith" are merged into one node instead of duplicates.
+
+    Mentions are compared to the known entities of the same label sharing a blocking key, first by normalized
+    name, then by the cosine similarity of their name embeddings. The embedding function is called once per
+    distinct name, a small local model running on CPU is enough, e.g. a sentence-transformers model.
+
+    Entities are identified by their unique attributes, a mention linked to an entity is written with the unique
+    attributes of that entity. A resolver holds the entities of a single graph, use one resolver per knowledge graph.
+
+    Args:
+        embed (Callable[[str], list[float]]): Function embedding an entity name.
+        threshold (float): The minimum cosine similarity of linked names.
+        max_candidates (int): The maximum number of known entities compared to a mention.
+        embedding_cache_size (int): The maximum number of name embeddings kept.
+
+    Examples:
+        >>> from sentence_transformers import SentenceTransformer
+        >>> model = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
+        >>> resolver = EntityResolver(lambda text: model.encode(text).tolist(), threshold=0.85)
+        >>> kg = KnowledgeGraph("test_kg", model_config, ontology, entity_resolver=resolver)
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], list[float]],
+        threshold: float = DEFAULT_THRESHOLD,
+        max_candidates: int = DEFAULT_MAX_CANDIDATES,
+        embedding_cache_size: int = DEFAULT_EMBEDDING_CACHE_SIZE,
+    ):
+        """
+        Initializes a new EntityResolver object.
+
+        Args:
+            embed (Callable[[str], list[float]]): Function embedding an entity name.
+            threshold (float): The minimum cosine similarity of linked names.
+            max_candidates (int): The maximum number of known entities compared to a mention.
+            embedding_cache_size (int): The maximum number of name embeddings kept.
+        """
+        if not 0 < threshold <= 1:
+            raise Exception("threshold should be in ]0, 1]")
+
+        self.embed = embed
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.linked = 0
+        self._lock = Lock()
+        # Known entities by label, as (name, unique attributes), and their positions by blocking key
+        self._entities = defaultdict(list)
+        self._index = defaultdict(lambda: defaultdict(list))
+        self._embeddings = LRUCache(max_size=embedding_cache_size)
+        # Unique attributes of the entity each mention was linked to, by label and mention name
+        self._links = {}
+        # The graph holding the known entities, and its labels already read
+        self._graph_name = None
+        self._loaded = set()
+
+    def load(self, graph: Graph, ontology: Ontology) -> None:
+        """
+        Registers the entities already in the graph, so that new mentions are linked to them.
+
+        Each label of a graph is read once: the entities created afterwards through the resolver are registered
+        as they are resolved, so the following ingestions neither read nor embed the known entities again.
+        Entities written to the graph by other means after the first load are not linked to.
+
+        Args:
+            graph (Graph): The graph.
+            ontology (Ontology): The ontology of the graph.
+
+        Raises:
+            Exception: If the resolver already holds the entities of another graph.
+        """
+        with self._lock:
+            if self._graph_name is None:
+                self._graph_name = graph.name
+            elif self._graph_name != graph.name:
+                raise Exception(
+                    f"The entity resolver holds the entities of graph {self._graph_name}, "
+                    f"use another resolver for graph {graph.name}"
+                )
+
+        for entity in ontology.entities:
+            names = [attribute.name for attribute in entity.attributes if attribute.unique]
+            if len(names) == 0:
+                continue
+            with self._lock:
+                if entity.label in self._loaded:
+                    continue
+                self._loaded.add(entity.label)
+            returned = ", ".join(f"n.{name}" for name in names)
+            result = graph.query(f"MATCH (n:{entity.label}) RETURN {returned}")
+            for row in result.result_set:
+                self.resolve(entity.label, dict(zip(names, row)))
+
+    def resolve(self, label: str, unique_attributes: dict) -> dict:
+        """
+        Links an entity mention to a known entity, or registers it as a new entity.
+
+        Args:
+            label (str): The entity label.
+            unique_attributes (dict): The unique attributes of the mention.
+
+        Returns:
+            dict: The unique attributes of the entity the mention refers to.
+        """
+        name = _entity_name(unique_attributes)
+        if name == "":
+            return unique_attributes
+
+        with self._lock:
+            key = (label, normalize_name(name))
+            if key in self._links:
+                return self._links[key]
+
+            candidates = self._candidates(label, name)
+
+        # Embed outside the lock, the linking is then checked again
+        linked = self._closest(name, candidates)
+
+        with self._lock:
+            if key in self._links:
+                return self._links[key]
+            if linked is None:
+                self._register(label, name, unique_attributes)
+                self._links[key] = unique_attributes
+            else:
+                logger.debug(f"Linked {label} {name} to {_entity_name(linked)}")
+                self.linked += 1
+                self._links[key] = linked
+            return self._links[key]
+
+    def lookup(self, label: str, unique_attributes: dict) -> dict:
+        """
+        The unique attributes of the entity a mention was linked to, e.g. to write the relations of the mention.
+
+        Args:
+            label (str): The entity label.
+            unique_attributes (dict): The unique attributes of the mention.
+
+        Returns:
+            dict: The unique attributes of the linked entity, the mention attributes when not linked.
+        """
+        key = (label, normalize_name(_entity_name(unique_attributes)))
+        with self._lock:
+            return self._links.get(key, unique_attributes)
+
+    def _candidates(self, label: str, name: str) -> list[tuple[str, dict]]:
+        candidates = {}
+        for key in blocking_keys(name):
+            for position in self._index[label][key]:
+                candidates[position] = self._entities[label][position]
+                if len(candidates) >= self.max_candidates:
+                    return list(candidates.values())
+        return list(candidates.values())
+
+    def _closest(self, name: str, candidates: list[tuple[str, dict]]) -> Optional[dict]:
+        if len(candidates) == 0:
+            return None
+
+        embedding = self._embedding(name)
+        (similarity, closest) = max(
+            ((_cosine_similarity(embedding, self._embedding(candidate)), attributes)
+             for (candidate, attributes) in candidates),
+            key=lambda scored: scored[0],
+        )
+        return closest if similarity >= self.threshold else None
+
+    def _embedding(self, name: str) -> list[float]:
+        embedding = self._embeddings.get(name)
+        if embedding is None:
+            embedding = self.embed(name)
+            self._embeddings.set(name, embedding)
+        return embedding
+
+    def _register(self, label: str, name: str, unique_attributes: dict) -> None:
+        position = len(self._entities[label])
+        self._entities[label].append((name, unique_attributes))
+        for key in blocking_keys(name):
+            self._index[label][key].append(position)
+
+
+def _entity_name(unique_attributes: dict) -> str:
+    return " ".join(str(value) for value in unique_attributes.values() if value is not None and value != "")
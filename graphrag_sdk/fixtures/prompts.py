@@ -437,6 +437,11 @@ MATCH (m:Manager)-[:OWNS]->(s:Stock)
 WHERE s.name CONTAINS 'Neo4j'
 RETURN m, s"""
 
+CYPHER_GEN_STATISTICS = """
+
+Graph statistics, prefer the listed property values and ranges when filtering:
+{statistics}"""
+
 CYPHER_GEN_PROMPT = """
 Using the ontology provided, generate an OpenCypher statement to query the graph database returning all relevant entities, relationships, and attributes to answer the question below.
 If you cannot generate a OpenCypher statement for any reason, return an empty response.
@@ -448,7 +453,10 @@ Your generated Cypher: """
 
 
 CYPHER_GEN_PROMPT_WITH_ERROR = """
-The Cypher statement above failed with the following error:
+The following Cypher statement failed:
+{cypher}
+
+With the following error:
 "{error}"
 
 Try to generate a new valid OpenCypher statement.
@@ -498,6 +506,25 @@ Question: {question}
 Helpful Answer:"""
 
 
+HISTORY_SUMMARY_SYSTEM = """
+You are an assistant that summarizes conversations between a user and a knowledge graph assistant.
+Keep the entities, names, values and facts the user asked about or was told, so follow-up questions can still refer to them.
+Be concise, do not add information that is not in the conversation.
+"""
+
+HISTORY_SUMMARY_PROMPT = """
+Update the summary of the conversation below with the new messages.
+
+Current summary: {summary}
+
+New messages:
+{messages}
+
+Updated summary:"""
+
+QA_CONTEXT_OMITTED = "(query results of an earlier question, omitted)"
+
+
 ORCHESTRATOR_SYSTEM = """
 You are an orchestrator agent that manages the flow of information between different agent, in order to provide a complete and accurate answer to the user's question.
 You will receive a question that requires information from different agents to answer.
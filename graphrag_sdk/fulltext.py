@@ -0,0 +1,160 @@
+import re
+import logging
+from falkordb import Graph
+from typing import Optional
+from redis.exceptions import ResponseError
+from graphrag_sdk.ontology import Ontology
+from graphrag_sdk.attribute import AttributeType
+
+
+logger = logging.getLogger(__name__)
+
+MIN_PREFIX_LENGTH = 2
+
+# Clauses ending the pattern or the WHERE of a MATCH clause
+_CLAUSE_PATTERN = re.compile(
+    r"\b(WHERE|OPTIONAL|MATCH|WITH|RETURN|UNWIND|CALL|ORDER|SKIP|LIMIT|UNION|CREATE|MERGE|SET|DELETE|DETACH|REMOVE|FOREACH)\b",
+    re.IGNORECASE,
+)
+_MATCH_PATTERN = re.compile(r"\s*MATCH\b", re.IGNORECASE)
+# Predicates an index lookup cannot be combined with, the matched nodes would not be restricted
+_NON_CONJUNCTIVE_PATTERN = re.compile(r"\b(OR|XOR|NOT)\b", re.IGNORECASE)
+_STRING_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NODE_PATTERN = re.compile(r"\(\s*(\w+)\s*:\s*`?(\w+)`?")
+_WORDS_PATTERN = re.compile(r"\w+(?: \w+)*")
+_CONTAINS_PATTERN = re.compile(
+    r"\b(\w+)\.(\w+)\s+CONTAINS\s+('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\")",
+    re.IGNORECASE,
+)
+
+
+def searchable_attributes(ontology: Ontology) -> dict[str, list[str]]:
+    """
+    Lists the searchable string attributes of the ontology entities.
+
+    Args:
+        ontology (Ontology): The ontology.
+
+    Returns:
+        dict[str, list[str]]: The searchable attribute names, by entity label.
+    """
+    attributes = {}
+    for entity in ontology.entities:
+        names = [
+            attribute.name
+            for attribute in entity.attributes
+            if attribute.searchable and attribute.type == AttributeType.STRING
+        ]
+        if len(names) > 0:
+            attributes[entity.label] = names
+    return attributes
+
+
+def create_fulltext_indexes(graph: Graph, ontology: Ontology) -> None:
+    """
+    Creates a full-text index on every searchable attribute of the ontology, skipping the existing ones.
+
+    Args:
+        graph (Graph): The graph to index.
+        ontology (Ontology): The ontology of the graph.
+    """
+    for (label, names) in searchable_attributes(ontology).items():
+        for name in names:
+            try:
+                graph.create_node_fulltext_index(label, name)
+            except ResponseError as e:
+                if "already indexed" not in str(e):
+                    raise
+                logger.debug(f"Full-text index of {label}.{name} already exists")
+
+
+def fulltext_indexes_exist(graph: Graph, ontology: Ontology) -> bool:
+    """
+    Checks, with a read-only query, whether every searchable attribute of the ontology has its full-text index.
+
+    Args:
+        graph (Graph): The graph.
+        ontology (Ontology): The ontology of the graph.
+
+    Returns:
+        bool: True if every searchable attribute is indexed.
+    """
+    attributes = searchable_attributes(ontology)
+    if len(attributes) == 0:
+        return False
+
+    result = graph.ro_query("CALL db.indexes() YIELD label, types, entitytype WHERE entitytype = 'NODE' RETURN label, types")
+    indexed = {
+        (label, name)
+        for (label, types) in result.result_set
+        for (name, index_types) in types.items()
+        if "FULLTEXT" in index_types
+    }
+    return all((label, name) in indexed for (label, names) in attributes.items() for name in names)
+
+
+def rewrite_contains_to_fulltext(cypher: str, ontology: Ontology) -> str:
+    """
+    Rewrites a query filtering its first MATCH with CONTAINS on a searchable attribute into a full-text
+    index lookup, replacing the scan of every node of the label.
+
+    For example `MATCH (p:Person) WHERE p.name CONTAINS 'Keanu' RETURN p` becomes
+    `CALL db.idx.fulltext.queryNodes('Person', 'Keanu*') YIELD node AS p MATCH (p:Person) WHERE p.name CONTAINS 'Keanu' RETURN p`.
+
+    The CONTAINS filter is kept as an exact post-filter, and the rewrite only applies when the searched term is
+    made of whole words as the index tokenizes them, e.g. 'Keanu Ree' but not 'Keanu-Ree' or 'K'. The index
+    matching is case-insensitive and the last word is a prefix, so every node whose attribute contains the term
+    from the start of a word is found. A term starting in the middle of a word, e.g. 'anu' in 'Keanu', is not
+    found: marking an attribute searchable opts into matching CONTAINS terms on word starts. Queries whose first
+    MATCH filter is not a plain conjunction are left untouched.
+
+    Args:
+        cypher (str): The Cypher query.
+        ontology (Ontology): The ontology, defining the searchable attributes.
+
+    Returns:
+        str: The rewritten Cypher query, or the query itself when no rewrite applies.
+    """
+    attributes = searchable_attributes(ontology)
+    if len(attributes) == 0:
+        return cypher
+
+    # Mask the string literals, so their content is never taken for clauses
+    masked = _STRING_PATTERN.sub(lambda match: "'" + "_" * (len(match.group(0)) - 2) + "'", cypher)
+    match = _MATCH_PATTERN.match(masked)
+    if match is None:
+        return cypher
+
+    where = _CLAUSE_PATTERN.search(masked, match.end())
+    if where is None or where.group(1).upper() != "WHERE":
+        return cypher
+    end = _CLAUSE_PATTERN.search(masked, where.end())
+    end = end.start() if end is not None else len(masked)
+    if _NON_CONJUNCTIVE_PATTERN.search(masked, where.end(), end) is not None:
+        return cypher
+
+    labels = dict(_NODE_PATTERN.findall(masked, match.end(), where.start()))
+    for contains in _CONTAINS_PATTERN.finditer(cypher, where.end(), end):
+        (variable, name, literal) = contains.groups()
+        label = labels.get(variable)
+        if label is None or name not in attributes.get(label, []):
+            continue
+
+        query = _fulltext_query(literal[1:-1])
+        if query is None:
+            continue
+        logger.debug(f"Full-text lookup of {label}.{name}: {query}")
+        return f"CALL db.idx.fulltext.queryNodes('{label}', '{query}') YIELD node AS {variable} {cypher.lstrip()}"
+
+    return cypher
+
+
+def _fulltext_query(term: str) -> Optional[str]:
+    # Only terms the index tokenizes into the same words, separators and escapes would change the matches
+    if _WORDS_PATTERN.fullmatch(term) is None:
+        return None
+    words = term.split(" ")
+    # The last word may be incomplete, prefixes are at least 2 characters long
+    if len(words[-1]) < MIN_PREFIX_LENGTH:
+        return None
+    return " ".join(words) + "*"
@@ -1,8 +1,17 @@
 import re
 import logging
+from falkordb import Node, Edge
 from graphrag_sdk import Ontology
 from typing import Union, Optional
 from fix_busted_json import repair_json
+from graphrag_sdk.attribute import Attribute, AttributeType
+from graphrag_sdk.cypher_parser import (
+    Token,
+    parse_cypher,
+    literal_type,
+    DIRECTION_INCOMING,
+    DIRECTION_UNDIRECTED,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -86,15 +95,35 @@ def stringify_falkordb_response(response: Union[list, str]) -> str:
     else:
         for l, _ in enumerate(response):
             if not isinstance(response[l], list):
-                response[l] = str(response[l])
+                response[l] = str(_without_internal_properties(response[l]))
             else:
                 for i, __ in enumerate(response[l]):
-                    response[l][i] = str(response[l][i])
+                    response[l][i] = str(_without_internal_properties(response[l][i]))
         data = str(response).strip()
 
     return data
 
 
+def _without_internal_properties(value):
+    # SDK internal properties, e.g. the entity embeddings, are not sent to the models
+    if isinstance(value, Node):
+        return Node(value.id, value.alias, value.labels, _public_properties(value.properties))
+    if isinstance(value, Edge):
+        return Edge(
+            value.src_node, value.relation, value.dest_node, value.id, value.alias,
+            _public_properties(value.properties),
+        )
+    if isinstance(value, list):
+        return [_without_internal_properties(v) for v in value]
+    return value
+
+
+def _public_properties(properties: Optional[dict]) -> Optional[dict]:
+    if properties is None:
+        return None
+    return {key: value for (key, value) in properties.items() if not key.startswith("__")}
+
+
 def extract_cypher(text: str) -> str:
     """
     Extracts Cypher query from a text block.
@@ -106,7 +135,8 @@ def extract_cypher(text: str) -> str:
         str: The extracted Cypher query.
     """
 
-    if not text.startswith("```"):
+    # The block may follow a preamble, e.g. "Here is the query:"
+    if "```" not in text:
         return text
 
     regex = r"```(?:cypher)?(.*?)```"
@@ -115,6 +145,19 @@ def extract_cypher(text: str) -> str:
     return "".join(matches)
 
 
+def cypher_block_closed(text: str) -> bool:
+    """
+    Checks whether a partially generated text holds a complete fenced Cypher block.
+
+    Args:
+        text (str): The text generated so far.
+
+    Returns:
+        bool: True if the text holds a fenced block which is closed, possibly after a preamble.
+    """
+    return re.search(r"```(?:cypher)?\s.*?```", text, re.DOTALL) is not None
+
+
 def validate_cypher(
     cypher: str, ontology: Ontology
 ) -> Optional[list[str]]:
@@ -132,24 +175,15 @@ def validate_cypher(
         if not cypher or len(cypher) == 0:
             return ["Cypher statement is empty"]
 
-        errors = []
-
-        # Check if entities exist in ontology
-        errors.extend(validate_cypher_entities_exist(cypher, ontology))
-
-        # Check if relations exist in ontology
-        errors.extend(validate_cypher_relations_exist(cypher, ontology))
-
-        # Check if relation directions are correct
-        errors.extend(validate_cypher_relation_directions(cypher, ontology))
+        errors = [error for _, error in _cypher_errors(cypher, ontology)]
 
         if len(errors) > 0:
             return errors
 
         return None
     except Exception as e:
-        print(f"Failed to verify cypher labels: {e}")
-        return None
+        logger.warning(f"Failed to validate the Cypher statement: {e}")
+        return [f"Failed to validate the Cypher statement: {e}"]
 
 
 def validate_cypher_entities_exist(cypher: str, ontology: Ontology) -> list[str]:
@@ -163,18 +197,7 @@ def validate_cypher_entities_exist(cypher: str, ontology: Ontology) -> list[str]
     Returns:
         list[str]: A list of errors if entities are not found.
     """
-    # Check if entities exist in ontology
-    not_found_entity_labels = []
-    entity_labels = re.findall(r"\(:(.*?)\)", cypher)
-    for label in entity_labels:
-        label = label.split(":")[1] if ":" in label else label
-        label = label.split("{")[0].strip() if "{" in label else label
-        if label not in [entity.label for entity in ontology.entities]:
-            not_found_entity_labels.append(label)
-
-    return [
-        f"Entity {label} not found in ontology" for label in not_found_entity_labels
-    ]
+    return [error for kind, error in _cypher_errors(cypher, ontology) if kind == "entity"]
 
 
 def validate_cypher_relations_exist(cypher: str, ontology: Ontology) -> list[str]:
@@ -188,23 +211,7 @@ def validate_cypher_relations_exist(cypher: str, ontology: Ontology) -> list[str
     Returns:
         list[str]: A list of errors if relations are not found.
     """
-    # Check if relations exist in ontology
-    not_found_relation_labels = []
-    relation_labels = re.findall(r"\[:(.*?)\]", cypher)
-    for relation in relation_labels:
-        for label in relation.split("|"):
-            max_idx = min(
-                    label.index("*") if "*" in label else len(label),
-                    label.index("{") if "{" in label else len(label),
-                    label.index("]") if "]" in label else len(label),
-                    )
-            label = label[:max_idx]
-            if label not in [relation.label for relation in ontology.relations]:
-                not_found_relation_labels.append(label)
-
-    return [
-        f"Relation {label} not found in ontology" for label in not_found_relation_labels
-    ]
+    return [error for kind, error in _cypher_errors(cypher, ontology) if kind == "relation"]
 
 
 def validate_cypher_relation_directions(
@@ -220,76 +227,222 @@ def validate_cypher_relation_directions(
     Returns:
         list[str]: A list of errors if relation directions are incorrect.
     """
-    errors = []
-    relations = list(re.finditer(r"\[.*?\]", cypher))
-    i = 0
-    for relation in relations:
-        try:
-            relation_label = (
-                re.search(r"(?:\[)(?:\w)*(?:\:)([^\d\{\]\*\.\:]+)", relation.group(0))
-                .group(1)
-                .strip()
-            )
-            prev_relation = relations[i - 1] if i > 0 else None
-            next_relation = relations[i + 1] if i < len(relations) - 1 else None
-            before = (
-                cypher[prev_relation.end() : relation.start()]
-                if prev_relation
-                else cypher[: relation.start()]
-            )
-            if "," in before:
-                before = before.split(",")[-1]
-            rel_before = re.search(r"([^\)\],]+)", before[::-1]).group(0)[::-1]
-            after = (
-                cypher[relation.end() : next_relation.start()]
-                if next_relation
-                else cypher[relation.end() :]
+    return [error for kind, error in _cypher_errors(cypher, ontology) if kind == "direction"]
+
+
+def validate_cypher_properties_exist(cypher: str, ontology: Ontology) -> list[str]:
+    """
+    Validates whether the properties used in the Cypher query exist in the ontology.
+
+    Args:
+        cypher (str): The Cypher query.
+        ontology (Ontology): The ontology to validate against.
+
+    Returns:
+        list[str]: A list of errors if properties are not found.
+    """
+    return [error for kind, error in _cypher_errors(cypher, ontology) if kind == "property"]
+
+
+def validate_cypher_property_types(cypher: str, ontology: Ontology) -> list[str]:
+    """
+    Validates whether the literals compared to properties in the Cypher query match the ontology attribute types.
+
+    Args:
+        cypher (str): The Cypher query.
+        ontology (Ontology): The ontology to validate against.
+
+    Returns:
+        list[str]: A list of errors if values have the wrong type.
+    """
+    return [error for kind, error in _cypher_errors(cypher, ontology) if kind == "type"]
+
+
+class _OntologyIndex:
+    """
+    Hashed lookups over the ontology entities and relations.
+    """
+
+    def __init__(self, ontology: Ontology):
+        self.entity_attributes: dict[str, dict[str, Attribute]] = {}
+        for entity in ontology.entities:
+            self.entity_attributes[entity.label] = {
+                attribute.name: attribute for attribute in entity.attributes
+            }
+
+        self.relations: dict[str, list] = {}
+        self.relation_attributes: dict[str, dict[str, Attribute]] = {}
+        self.endpoints: set[tuple[str, str, str]] = set()
+        for relation in ontology.relations:
+            self.relations.setdefault(relation.label, []).append(relation)
+            self.relation_attributes.setdefault(relation.label, {}).update(
+                (attribute.name, attribute) for attribute in relation.attributes
             )
-            rel_after = re.search(r"([^\(\[,]+)", after).group(0)
-            entity_before = re.search(r"\(.+:(.*?)\)", before).group(0)
-            entity_after = re.search(r"\(([^\),]+)(\)?)", after).group(0)
-            if rel_before == "-" and rel_after == "->":
-                source = entity_before
-                target = entity_after
-            elif rel_before == "<-" and rel_after == "-":
-                source = entity_after
-                target = entity_before
-            else:
-                continue
+            self.endpoints.add((relation.label, relation.source.label, relation.target.label))
+
+
+# Literal types comparable to each attribute type
+_ATTRIBUTE_LITERAL_TYPES = {
+    AttributeType.STRING: "string",
+    AttributeType.NUMBER: "number",
+    AttributeType.BOOLEAN: "boolean",
+}
+
+
+def _property_errors(
+    owner: str,
+    attributes: dict[str, dict[str, Attribute]],
+    labels: list[str],
+    name: str,
+    operator: Optional[str],
+    value: Optional[Token],
+) -> list[tuple[str, str]]:
+    """
+    Validates a property of an entity or relation and the literal it is compared to.
+
+    Args:
+        owner (str): entity or relation.
+        attributes (dict[str, dict[str, Attribute]]): The attributes of the ontology entities or relations, by label.
+        labels (list[str]): The known labels of the entity or relation.
+        name (str): The property name.
+        operator (Optional[str]): The comparison operator, "=" for inline pattern properties.
+        value (Optional[Token]): The literal compared to the property.
+
+    Returns:
+        list[tuple[str, str]]: The errors, of kind property or type.
+    """
+    if name.startswith("__") or len(labels) == 0:
+        return []
 
-            source_label = re.search(r"(?:\:)([^\)\{]+)", source).group(1).strip()
-            target_label = re.search(r"(?:\:)([^\)\{]+)", target).group(1).strip()
+    matches = [attributes[label][name] for label in labels if name in attributes[label]]
+    if len(matches) == 0:
+        valid_properties = ", ".join(attributes[labels[0]].keys()) or "none"
+        return [(
+            "property",
+            f"Property {name} not found in {owner} {labels[0]}. Valid properties: {valid_properties}",
+        )]
 
-            ontology_relations = ontology.get_relations_with_label(relation_label)
+    if value is None:
+        return []
 
-            if len(ontology_relations) == 0:
-                errors.append(f"Relation {relation_label} not found in ontology")
+    expected_types = {_ATTRIBUTE_LITERAL_TYPES.get(attribute.type) for attribute in matches}
+    if None in expected_types:
+        return []
 
-            found_relation = False
-            for ontology_relation in ontology_relations:
-                if (
-                    ontology_relation.source.label == source_label
-                    and ontology_relation.target.label == target_label
+    if operator.split(" ")[0] in ("CONTAINS", "STARTS", "ENDS") and "string" not in expected_types:
+        return [(
+            "type",
+            f"Property {name} of {owner} {labels[0]} is a {matches[0].type.value}, {operator} requires a string",
+        )]
+
+    if literal_type(value) not in expected_types:
+        return [(
+            "type",
+            f"Property {name} of {owner} {labels[0]} is a {matches[0].type.value}, "
+            f"it cannot be compared to the {literal_type(value)} {value.value}",
+        )]
+
+    return []
+
+
+def _cypher_errors(cypher: str, ontology: Ontology) -> list[tuple[str, str]]:
+    """
+    Validates the patterns of a Cypher query against the ontology, in a single pass.
+
+    Args:
+        cypher (str): The Cypher query.
+        ontology (Ontology): The ontology to validate against.
+
+    Returns:
+        list[tuple[str, str]]: The errors, each with its kind: entity, relation, direction, property or type.
+    """
+    parsed = parse_cypher(cypher)
+    index = _OntologyIndex(ontology)
+    errors = []
+
+    def add_error(kind: str, error: str) -> None:
+        if (kind, error) not in errors:
+            errors.append((kind, error))
+
+    for path in parsed.paths:
+        for node in path.nodes:
+            known_labels = []
+            for label in node.labels:
+                # SDK internal labels, such as the provenance documents, are not part of the ontology
+                if label.startswith("__"):
+                    continue
+                if label not in index.entity_attributes:
+                    add_error("entity", f"Entity {label} not found in ontology")
+                else:
+                    known_labels.append(label)
+
+            for name, value in node.properties.items():
+                for error in _property_errors(
+                    "entity", index.entity_attributes, known_labels, name, "=", value
                 ):
-                    found_relation = True
-                    break
-
-            if not found_relation:
-                errors.append(
-                    """
-                    Relation {relation_label} does not connect {source_label} to {target_label}. Make sure the relation direction is correct. 
-                    Valid relations: 
-                    {valid_relations}
-""".format(
-                        relation_label=relation_label,
-                        source_label=source_label,
-                        target_label=target_label,
-                        valid_relations="\n".join([str(e) for e in ontology_relations]),
-                    )
+                    add_error(*error)
+
+        for i, relationship in enumerate(path.relationships):
+            known_types = []
+            for relation_type in relationship.types:
+                if relation_type.startswith("__"):
+                    continue
+                if relation_type not in index.relations:
+                    add_error("relation", f"Relation {relation_type} not found in ontology")
+                else:
+                    known_types.append(relation_type)
+
+            if len(known_types) == 0:
+                continue
+
+            for name, value in relationship.properties.items():
+                for error in _property_errors(
+                    "relation", index.relation_attributes, known_types, name, "=", value
+                ):
+                    add_error(*error)
+
+            if relationship.direction == DIRECTION_UNDIRECTED:
+                continue
+
+            source, target = path.nodes[i], path.nodes[i + 1]
+            if relationship.direction == DIRECTION_INCOMING:
+                source, target = target, source
+            source_labels = parsed.labels_of(source)
+            target_labels = parsed.labels_of(target)
+            if len(source_labels) == 0 or len(target_labels) == 0:
+                continue
+
+            if not any(
+                (relation_type, source_label, target_label) in index.endpoints
+                for relation_type in known_types
+                for source_label in source_labels
+                for target_label in target_labels
+            ):
+                valid_relations = "\n".join(
+                    str(relation) for t in known_types for relation in index.relations[t]
+                )
+                add_error(
+                    "direction",
+                    f"Relation {known_types[0]} does not connect {source_labels[0]} to {target_labels[0]}. "
+                    f"Make sure the relation direction is correct.\n"
+                    f"Valid relations:\n{valid_relations}",
                 )
 
-            i += 1
-        except Exception:
+    # Properties read in WHERE, RETURN and other clauses
+    for access in parsed.property_accesses:
+        if access.variable in parsed.node_labels:
+            owner, attributes = "entity", index.entity_attributes
+            labels = parsed.node_labels[access.variable]
+        elif access.variable in parsed.relationship_types:
+            owner, attributes = "relation", index.relation_attributes
+            labels = parsed.relationship_types[access.variable]
+        else:
             continue
 
+        known_labels = [label for label in labels if label in attributes]
+        for error in _property_errors(
+            owner, attributes, known_labels, access.name, access.operator, access.value
+        ):
+            add_error(*error)
+
     return errors
@@ -0,0 +1,143 @@
+from typing import Optional
+from graphrag_sdk.context_builder import estimate_tokens
+
+
+DEFAULT_KEEP_CONTEXTS = 1
+
+# Prefix of the system message holding the summary of the dropped exchanges
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+class HistoryPolicy:
+    """
+    Bounds the chat history resent to the model on every turn, keeping the prompt size flat.
+
+    The history is compacted after each turn: the query results of all but the `keep_contexts` most
+    recent exchanges are dropped, keeping their questions, then the oldest exchanges are removed until
+    the history fits in `max_turns` exchanges and `max_tokens` estimated tokens. The system instruction
+    and the latest exchange are always kept. With `summarize`, the removed exchanges are folded into
+    a rolling summary, sent with the system instruction.
+
+    Args:
+        max_tokens (Optional[int]): The maximum estimated number of tokens of the exchanges. None disables it.
+        max_turns (Optional[int]): The maximum number of exchanges. None disables it.
+        keep_contexts (Optional[int]): The number of recent exchanges keeping their query results. None keeps all.
+        summarize (bool): Summarize the removed exchanges instead of forgetting them.
+
+    Examples:
+        >>> from graphrag_sdk.history_policy import HistoryPolicy
+        >>> chat = kg.chat_session(history_policy=HistoryPolicy(max_tokens=4000, summarize=True))
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        max_turns: Optional[int] = None,
+        keep_contexts: Optional[int] = DEFAULT_KEEP_CONTEXTS,
+        summarize: bool = False,
+    ):
+        """
+        Initializes a new HistoryPolicy object.
+
+        Args:
+            max_tokens (Optional[int]): The maximum estimated number of tokens of the exchanges.
+            max_turns (Optional[int]): The maximum number of exchanges.
+            keep_contexts (Optional[int]): The number of recent exchanges keeping their query results.
+            summarize (bool): Summarize the removed exchanges instead of forgetting them.
+        """
+        if max_turns is not None and max_turns < 1:
+            raise Exception("max_turns should be at least 1")
+
+        self.max_tokens = max_tokens
+        self.max_turns = max_turns
+        self.keep_contexts = keep_contexts
+        self.summarize = summarize
+
+    def compact(
+        self, history: list[dict], compact_prompts: Optional[dict[str, str]] = None
+    ) -> tuple[list[dict], list[dict]]:
+        """
+        Compacts a chat history.
+
+        Args:
+            history (list[dict]): The chat history, starting with the system messages.
+            compact_prompts (Optional[dict[str, str]]): Prompts without their query results, by full prompt.
+
+        Returns:
+            tuple[list[dict], list[dict]]: The compacted history and the removed messages, oldest first.
+        """
+        compact_prompts = compact_prompts or {}
+        (system, exchanges) = _split_exchanges(history)
+
+        if self.keep_contexts is not None:
+            older = exchanges[: max(len(exchanges) - self.keep_contexts, 0)]
+            for exchange in older:
+                for message in exchange:
+                    if message["role"] == "user" and message["content"] in compact_prompts:
+                        message["content"] = compact_prompts[message["content"]]
+
+        removed = []
+        while len(exchanges) > 1 and self._over_budget(exchanges):
+            removed.extend(exchanges.pop(0))
+
+        return (system + [message for exchange in exchanges for message in exchange], removed)
+
+    def _over_budget(self, exchanges: list[list[dict]]) -> bool:
+        if self.max_turns is not None and len(exchanges) > self.max_turns:
+            return True
+        if self.max_tokens is not None:
+            tokens = sum(estimate_tokens(message["content"] or "") for exchange in exchanges for message in exchange)
+            return tokens > self.max_tokens
+        return False
+
+    @staticmethod
+    def summary_of(history: list[dict]) -> Optional[str]:
+        """
+        Reads the rolling summary of a chat history.
+
+        Args:
+            history (list[dict]): The chat history.
+
+        Returns:
+            Optional[str]: The summary, or None if the history has none.
+        """
+        for message in history:
+            if message["role"] != "system":
+                break
+            if message["content"].startswith(SUMMARY_PREFIX):
+                return message["content"][len(SUMMARY_PREFIX):]
+        return None
+
+    @staticmethod
+    def with_summary(history: list[dict], summary: str) -> list[dict]:
+        """
+        Sets the rolling summary of a chat history, after its system instruction.
+
+        Args:
+            history (list[dict]): The chat history.
+            summary (str): The summary of the removed exchanges.
+
+        Returns:
+            list[dict]: The chat history with the summary.
+        """
+        (system, exchanges) = _split_exchanges(history)
+        system = [message for message in system if not message["content"].startswith(SUMMARY_PREFIX)]
+        system.append({"role": "system", "content": SUMMARY_PREFIX + summary})
+        return system + [message for exchange in exchanges for message in exchange]
+
+
+def _split_exchanges(history: list[dict]) -> tuple[list[dict], list[list[dict]]]:
+    """
+    Splits a chat history into its leading system messages and its exchanges, each starting with a user message.
+    """
+    system = []
+    exchanges = []
+    for message in history:
+        message = dict(message)
+        if message["role"] == "system" and len(exchanges) == 0:
+            system.append(message)
+        elif message["role"] == "user" or len(exchanges) == 0:
+            exchanges.append([message])
+        else:
+            exchanges[-1].append(message)
+    return (system, exchanges)
@@ -1,14 +1,48 @@
+import time
 import logging
 import warnings
-from falkordb import FalkorDB
-from typing import Optional, Union
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+from falkordb import FalkorDB, Graph
+from typing import Callable, Optional, Union
 from graphrag_sdk.ontology import Ontology
 from graphrag_sdk.source import AbstractSource
+from graphrag_sdk.query_policy import QueryPolicy
+from graphrag_sdk.retry_policy import RetryPolicy
+from graphrag_sdk.history_policy import HistoryPolicy
+from graphrag_sdk.cache import CypherCache, QueryResultCache
 from graphrag_sdk.chat_session import ChatSession
+from graphrag_sdk.entity_resolution import EntityResolver
+from graphrag_sdk.schema_statistics import SchemaStatistics
+from graphrag_sdk.fulltext import create_fulltext_indexes, fulltext_indexes_exist, searchable_attributes
+from graphrag_sdk.vector_retrieval import (
+    VectorRetriever,
+    RETRIEVAL_CYPHER,
+    create_vector_indexes,
+    is_vector_retrieval,
+)
+from falkordb.asyncio import FalkorDB as AsyncFalkorDB
+from falkordb.asyncio.graph import AsyncGraph
+from graphrag_sdk.connection import (
+    get_falkordb_client,
+    get_async_falkordb_client,
+    ReplicatedGraph,
+    AsyncReplicatedGraph,
+    DeduplicatedGraph,
+    DEFAULT_MAX_CONNECTIONS,
+    REPLICA_SELECTION_ROUND_ROBIN,
+)
 from graphrag_sdk.attribute import AttributeType, Attribute
 from graphrag_sdk.helpers import map_dict_to_cypher_properties
+from graphrag_sdk.models import GenerativeModel
 from graphrag_sdk.model_config import KnowledgeGraphModelConfig
-from graphrag_sdk.steps.extract_data_step import ExtractDataStep
+from graphrag_sdk.steps.extract_data_step import (
+    ExtractDataStep,
+    get_source_key,
+    PROVENANCE_SOURCES_KEY,
+    PROVENANCE_DOCUMENT_LABEL,
+    PROVENANCE_MENTIONS_RELATION,
+)
 from graphrag_sdk.fixtures.prompts import (GRAPH_QA_SYSTEM, CYPHER_GEN_SYSTEM,
                                 CYPHER_GEN_PROMPT, GRAPH_QA_PROMPT, CYPHER_GEN_PROMPT_WITH_HISTORY)
 
@@ -16,6 +50,9 @@ from graphrag_sdk.fixtures.prompts import (GRAPH_QA_SYSTEM, CYPHER_GEN_SYSTEM,
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
 class KnowledgeGraph:
     """Knowledge Graph model data as a network of entities and relations
     To create one it is best to provide a ontology which will define the graph's ontology
@@ -36,6 +73,19 @@ class KnowledgeGraph:
         cypher_gen_prompt: Optional[str] = None,
         qa_prompt: Optional[str] = None,
         cypher_gen_prompt_history: Optional[str] = None,
+        db: Optional[FalkorDB] = None,
+        cypher_cache: Optional[CypherCache] = None,
+        result_cache: Optional[QueryResultCache] = None,
+        query_policy: Optional[QueryPolicy] = None,
+        replicas: Optional[list[Union[tuple[str, int], FalkorDB]]] = None,
+        replica_selection: str = REPLICA_SELECTION_ROUND_ROBIN,
+        retry_policy: Optional[RetryPolicy] = None,
+        async_db: Optional[AsyncFalkorDB] = None,
+        embed: Optional[Callable[[str], list[float]]] = None,
+        embedding_dimension: Optional[int] = None,
+        entity_resolver: Optional[EntityResolver] = None,
+        schema_statistics: Optional[SchemaStatistics] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
     ):
         """
         Initialize Knowledge Graph
@@ -53,30 +103,66 @@ class KnowledgeGraph:
             cypher_gen_prompt (Optional[str]): Cypher generation prompt. Make sure you have {question} in the prompt.
             qa_prompt (Optional[str]): QA prompt. Make sure you have {question}, {context} and {cypher} in the prompt.
             cypher_gen_prompt_history (Optional[str]): Cypher generation prompt with history. Make sure you have {question} and {last_answer} in the prompt.
+            db (Optional[FalkorDB]): FalkorDB client to use. When omitted, a client backed by a
+                connection pool shared across knowledge graphs with the same connection details is used.
+            cypher_cache (Optional[CypherCache]): Cache of the Cypher statements generated for questions,
+                shared by all chat sessions of the knowledge graph.
+            result_cache (Optional[QueryResultCache]): Cache of the query results, shared by all chat sessions
+                of the knowledge graph and invalidated whenever the SDK writes to the graph. A cache serves a single
+                knowledge graph.
+            query_policy (Optional[QueryPolicy]): Safety policy of the queries generated by chat sessions.
+                Defaults to read-only queries with a LIMIT, bounded variable-length patterns and a timeout.
+            replicas (Optional[list[Union[tuple[str, int], FalkorDB]]]): Read replicas serving the read-only queries
+                of chat sessions, as (host, port) pairs sharing the primary credentials or FalkorDB clients.
+            replica_selection (str): Replica selection strategy, "round_robin" or "least_latency".
+            retry_policy (Optional[RetryPolicy]): Retry strategy of the Cypher generation in chat sessions.
+                Defaults to 3 attempts, each fed the error of the previous one.
+            async_db (Optional[AsyncFalkorDB]): Asynchronous FalkorDB client used by the asynchronous chat API.
+                When omitted, a shared client is created from the connection details.
+            embed (Optional[Callable[[str], list[float]]]): Function embedding a text. When set, the extracted entities
+                are embedded into vector indexes, enabling the vector retrieval modes of chat sessions.
+            embedding_dimension (Optional[int]): The dimension of the embeddings of `embed`. When omitted, it is
+                measured once by embedding a probe text.
+            entity_resolver (Optional[EntityResolver]): Links the extracted entities to the existing entities with
+                similar names during the ingestion, merging name variants into one node.
+            schema_statistics (Optional[SchemaStatistics]): Cache of statistics of the graph data added to the Cypher
+                generation instruction of chat sessions, refreshed after every ingestion.
+            max_connections (int): Maximum number of open connections of each shared connection pool created for
+                the knowledge graph. Pools are shared by connection details, the first one created sets the size.
         """
 
         if not isinstance(name, str) or name == "":
             raise Exception("name should be a non empty string")
 
-        # Connect to database
-        self.db = FalkorDB(host=host, port=port, username=username, password=password)
-        self.graph = self.db.select_graph(name)
-        ontology_graph = self.db.select_graph("{" + name + "}" + "_schema")
-
-        # Load / Save ontology to database
-        if ontology is None:
-            # Load ontology from DB
-            ontology = Ontology.from_schema_graph(ontology_graph)
-            
-            if len(ontology.entities) == 0:
-                raise Exception("The ontology is empty. Load a valid ontology or create one using the ontology module.")
-        else:
-            # Save ontology to DB
-            ontology.save_to_graph(ontology_graph)
-
+        # The connection and the ontology are set up lazily, on first use, the ontology is saved by the first write
+        self._db = db
+        self._connection_args = (host, port, username, password)
+        self._max_connections = max_connections
+        self._graph = None
+        self._read_graph = None
+        self._async_db = async_db
+        self._async_graph = None
+        self._async_read_graph = None
+        self._replicas = replicas or []
+        self._replica_selection = replica_selection
         self._ontology = ontology
+        self._ontology_saved = ontology is None
         self._name = name
         self._model_config = model_config
+        self.cypher_cache = cypher_cache
+        self.result_cache = result_cache
+        if result_cache is not None:
+            result_cache.bind(name)
+        self.query_policy = query_policy if query_policy is not None else QueryPolicy()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.embed = embed
+        self._embedding_dimension = embedding_dimension
+        self.entity_resolver = entity_resolver
+        self.schema_statistics = schema_statistics
+        # Whether the full-text indexes of the searchable attributes exist, None until checked
+        self._fulltext_indexed = None
+        self._graph_version = 0
+        self._graph_version_lock = Lock()
         self.failed_documents = set([])
 
         if cypher_system_instruction is None:
@@ -127,13 +213,151 @@ class KnowledgeGraph:
     def name(self, value):
         raise AttributeError("Cannot modify the 'name' attribute")
 
+    @property
+    def graph_version(self) -> int:
+        """
+        Monotonically increasing version of the graph, incremented on every write made through the SDK.
+        """
+        return self._graph_version
+
+    def _increment_graph_version(self) -> None:
+        """
+        Increment the graph version and invalidate results computed against older versions.
+        """
+        with self._graph_version_lock:
+            self._graph_version += 1
+            if self.result_cache is not None:
+                self.result_cache.invalidate(self._graph_version)
+
+    @property
+    def db(self) -> FalkorDB:
+        if self._db is None:
+            self._db = get_falkordb_client(*self._connection_args, max_connections=self._max_connections)
+        return self._db
+
+    @db.setter
+    def db(self, value):
+        self._db = value
+
+    @property
+    def graph(self) -> Graph:
+        if self._graph is None:
+            self._graph = self.db.select_graph(self._name)
+        return self._graph
+
+    @graph.setter
+    def graph(self, value):
+        self._graph = value
+
+    @property
+    def async_graph(self) -> AsyncGraph:
+        """
+        The graph queried by the asynchronous chat API.
+        """
+        if self._async_graph is None:
+            if self._async_db is None:
+                self._async_db = get_async_falkordb_client(*self._connection_args, max_connections=self._max_connections)
+            self._async_graph = self._async_db.select_graph(self._name)
+        return self._async_graph
+
+    @property
+    def embedding_dimension(self) -> Optional[int]:
+        """
+        The dimension of the embeddings, measured on first use when not given.
+        """
+        if self._embedding_dimension is None and self.embed is not None:
+            # The index dimension is the one of the embedding function
+            self._embedding_dimension = len(self.embed(self.name))
+        return self._embedding_dimension
+
+    @property
+    def read_graph(self) -> Union[Graph, ReplicatedGraph]:
+        """
+        The graph serving chat queries: read-only queries go to the replicas when configured.
+        """
+        if len(self._replicas) == 0:
+            return self.graph
+        if self._read_graph is None:
+            _, _, username, password = self._connection_args
+            replicas = [
+                replica if isinstance(replica, FalkorDB)
+                else get_falkordb_client(replica[0], replica[1], username, password, self._max_connections)
+                for replica in self._replicas
+            ]
+            self._read_graph = ReplicatedGraph(
+                self.graph,
+                [replica.select_graph(self._name) for replica in replicas],
+                self._replica_selection,
+            )
+        return self._read_graph
+
+    @property
+    def async_read_graph(self) -> Union[AsyncGraph, AsyncReplicatedGraph]:
+        """
+        The graph serving asynchronous chat queries: read-only queries go to the replicas when configured.
+        """
+        if len(self._replicas) == 0:
+            return self.async_graph
+        if self._async_read_graph is None:
+            _, _, username, password = self._connection_args
+            replicas = []
+            for replica in self._replicas:
+                if isinstance(replica, FalkorDB):
+                    # The asynchronous client shares the connection details of the given client
+                    kwargs = replica.connection.connection_pool.connection_kwargs
+                    replica = (kwargs["host"], kwargs["port"], kwargs.get("username"), kwargs.get("password"))
+                else:
+                    replica = (replica[0], replica[1], username, password)
+                replicas.append(get_async_falkordb_client(*replica, max_connections=self._max_connections))
+            self._async_read_graph = AsyncReplicatedGraph(
+                self.async_graph,
+                [replica.select_graph(self._name) for replica in replicas],
+                self._replica_selection,
+            )
+        return self._async_read_graph
+
     @property
     def ontology(self):
+        if self._ontology is None and self._name is not None:
+            self._ontology = self._load_ontology()
         return self._ontology
 
     @ontology.setter
     def ontology(self, value):
         self._ontology = value
+        # Saved by the next write, the new ontology may have other searchable attributes
+        self._ontology_saved = value is None
+        self._fulltext_indexed = None
+
+    def _ontology_graph(self) -> Graph:
+        return self.db.select_graph("{" + self._name + "}" + "_schema")
+
+    def _load_ontology(self) -> Ontology:
+        """
+        Load the ontology from the schema graph.
+
+        Returns:
+            Ontology: The stored ontology.
+        """
+        ontology = Ontology.from_schema_graph(self._ontology_graph())
+
+        if len(ontology.entities) == 0:
+            raise Exception("The ontology is empty. Load a valid ontology or create one using the ontology module.")
+
+        return ontology
+
+    def _ensure_ontology_saved(self) -> None:
+        """
+        Save the ontology provided at construction or assigned to the schema graph,
+        unless the stored ontology is unchanged. Called by the write paths only.
+        """
+        if self._ontology_saved:
+            return
+
+        ontology_graph = self._ontology_graph()
+        if Ontology.get_saved_hash(ontology_graph) != self._ontology.get_hash():
+            self._ontology.save_to_graph(ontology_graph)
+        self._ontology_saved = True
 
     def list_sources(self) -> list[AbstractSource]:
         """
@@ -146,7 +370,11 @@ class KnowledgeGraph:
         return [s.source for s in self.sources]
 
     def process_sources(
-        self, sources: list[AbstractSource], instructions: Optional[str] = None, hide_progress: Optional[bool] = False
+        self,
+        sources: list[AbstractSource],
+        instructions: Optional[str] = None,
+        hide_progress: Optional[bool] = False,
+        track_provenance: Optional[bool] = False,
     ) -> None:
         """
         Add entities and relations found in sources into the knowledge-graph
@@ -155,17 +383,23 @@ class KnowledgeGraph:
             sources (list[AbstractSource]): list of sources to extract knowledge from
             instructions (Optional[str]): Instructions for processing.
             hide_progress (Optional[bool]): hide progress bar
+            track_provenance (Optional[bool]): link extracted data to its source documents,
+                required by `delete_source`
         """
 
         if self.ontology is None:
             raise Exception("Ontology is not defined")
 
         # Create graph with sources
-        self._create_graph_with_sources(sources, instructions, hide_progress)
+        self._create_graph_with_sources(sources, instructions, hide_progress, track_provenance)
 
 
     def _create_graph_with_sources(
-        self, sources: Optional[list[AbstractSource]] = None, instructions: Optional[str] = None, hide_progress: Optional[bool] = False
+        self,
+        sources: Optional[list[AbstractSource]] = None,
+        instructions: Optional[str] = None,
+        hide_progress: Optional[bool] = False,
+        track_provenance: Optional[bool] = False,
     ) -> None:
         """
         Create a graph using the provided sources.
@@ -173,16 +407,73 @@ class KnowledgeGraph:
         Args:
             sources (Optional[list[AbstractSource]]): List of sources.
             instructions (Optional[str]): Instructions for the graph creation.
+            hide_progress (Optional[bool]): Hide progress bar.
+            track_provenance (Optional[bool]): Link extracted data to its source documents.
         """
+        self._ensure_ontology_saved()
+        if self.embed is not None:
+            create_vector_indexes(self.graph, self.ontology, self.embedding_dimension)
+        self._create_fulltext_indexes()
+
         step = ExtractDataStep(
             sources=list(sources),
             ontology=self.ontology,
             model=self._model_config.extract_data,
             graph=self.graph,
             hide_progress=hide_progress,
+            track_provenance=track_provenance,
+            embed=self.embed,
+            entity_resolver=self.entity_resolver,
+        )
+
+        try:
+            self.failed_documents = step.run(instructions)
+        finally:
+            self._increment_graph_version()
+        self._refresh_schema_statistics()
+
+    def delete_source(self, source: AbstractSource) -> None:
+        """
+        Remove the nodes and relations supported only by the given source.
+
+        Only data processed with `track_provenance=True` can be removed;
+        nodes and relations also mentioned by other sources, or created before
+        the provenance tracking, are kept.
+
+        Args:
+            source (AbstractSource): The source to remove from the knowledge graph.
+        """
+        params = {"source_key": get_source_key(source)}
+
+        # Detach the source from the relations extracted from it, dropping unsupported ones
+        self.graph.query(
+            f"""MATCH (d:{PROVENANCE_DOCUMENT_LABEL} {{source: $source_key}})-[:{PROVENANCE_MENTIONS_RELATION}]->()-[r]-()
+            WHERE $source_key IN r.{PROVENANCE_SOURCES_KEY}
+            WITH DISTINCT r
+            SET r.{PROVENANCE_SOURCES_KEY} = [s IN r.{PROVENANCE_SOURCES_KEY} WHERE s <> $source_key]
+            WITH r WHERE size(r.{PROVENANCE_SOURCES_KEY}) = 0
+            DELETE r""",
+            params,
         )
 
-        self.failed_documents = step.run(instructions)
+        # Detach the source from the nodes it mentions, deleting the ones left without sources
+        self.graph.query(
+            f"""MATCH (d:{PROVENANCE_DOCUMENT_LABEL} {{source: $source_key}})-[:{PROVENANCE_MENTIONS_RELATION}]->(n)
+            WHERE $source_key IN n.{PROVENANCE_SOURCES_KEY}
+            WITH DISTINCT n
+            SET n.{PROVENANCE_SOURCES_KEY} = [s IN n.{PROVENANCE_SOURCES_KEY} WHERE s <> $source_key]
+            WITH n WHERE size(n.{PROVENANCE_SOURCES_KEY}) = 0
+            DETACH DELETE n""",
+            params,
+        )
+
+        # Delete the source's documents
+        self.graph.query(
+            f"MATCH (d:{PROVENANCE_DOCUMENT_LABEL} {{source: $source_key}}) DETACH DELETE d",
+            params,
+        )
+
+        self._increment_graph_version()
                 
     def delete(self) -> None:
         """
@@ -194,22 +485,184 @@ class KnowledgeGraph:
 
         # Delete KnowledgeGraph
         if self.name in available_graphs:
-            self.graph.delete()
+            self.db.select_graph(self.name).delete()
+        self._increment_graph_version()
 
         # Nullify all attributes
         for key in self.__dict__.keys():
             setattr(self, key, None)
 
-    def chat_session(self) -> ChatSession:
+    def chat_session(
+        self,
+        max_context_tokens: Optional[int] = None,
+        deduplicate_context: bool = False,
+        history_policy: Optional[HistoryPolicy] = None,
+        stateless_cypher: bool = False,
+        speculative_models: Optional[list[GenerativeModel]] = None,
+        pipelined_streaming: bool = False,
+        retrieval_mode: str = RETRIEVAL_CYPHER,
+        vector_retriever: Optional[VectorRetriever] = None,
+    ) -> ChatSession:
         """
         Create a new chat session.
+
+        Args:
+            max_context_tokens (Optional[int]): Token budget of the query results sent to the QA model.
+                Defaults to None, sending the full results.
+            deduplicate_context (bool): Define each distinct node and edge of the results once
+                and reference it from the rows. Defaults to False.
+            history_policy (Optional[HistoryPolicy]): Bounds the chat histories resent to the models on every turn.
+                Defaults to None, keeping the full histories.
+            stateless_cypher (bool): Generate each Cypher statement in a new conversation, without the
+                previous questions. Defaults to False.
+            speculative_models (Optional[list[GenerativeModel]]): Models generating Cypher candidates in parallel,
+                e.g. `[model] * 3` with a non-zero temperature. Defaults to None, a single generation.
+            pipelined_streaming (bool): When streaming, execute the Cypher statement as soon as its generation
+                completes its fenced block. Defaults to False.
+            retrieval_mode (str): "cypher", "vector", "fallback" or "hybrid", see `ChatSession`. Defaults to "cypher".
+            vector_retriever (Optional[VectorRetriever]): The vector search of the vector retrieval modes.
+                Defaults to a retriever using the `embed` function of the knowledge graph.
         
         Returns:
             ChatSession: A new chat session instance.
         """
-        chat_session = ChatSession(self._model_config, self.ontology, self.graph, self.cypher_system_instruction,
-                                   self.qa_system_instruction, self.cypher_gen_prompt, self.qa_prompt, self.cypher_gen_prompt_history)
-        return chat_session
+        if is_vector_retrieval(retrieval_mode) and vector_retriever is None:
+            if self.embed is None:
+                raise Exception(f"The {retrieval_mode} retrieval mode requires an embed function")
+            vector_retriever = VectorRetriever(self.embed)
+
+        return self._new_chat_session(self.read_graph,
+                                      self._fulltext_search_enabled(),
+                                      self._refresh_schema_statistics(),
+                                      retrieval_mode=retrieval_mode,
+                                      vector_retriever=vector_retriever,
+                                      max_context_tokens=max_context_tokens,
+                                      deduplicate_context=deduplicate_context,
+                                      history_policy=history_policy,
+                                      stateless_cypher=stateless_cypher,
+                                      speculative_models=speculative_models,
+                                      pipelined_streaming=pipelined_streaming)
+
+    def _new_chat_session(self, graph: Union[Graph, ReplicatedGraph, DeduplicatedGraph], fulltext_search: bool,
+                          schema_statistics: Optional[SchemaStatistics], **options) -> ChatSession:
+        return ChatSession(self._model_config, self.ontology, graph, self.cypher_system_instruction,
+                           self.qa_system_instruction, self.cypher_gen_prompt, self.qa_prompt, self.cypher_gen_prompt_history,
+                           cypher_cache=self.cypher_cache, result_cache=self.result_cache,
+                           query_policy=self.query_policy,
+                           retry_policy=self.retry_policy,
+                           async_graph=lambda: self.async_read_graph,
+                           fulltext_search=fulltext_search,
+                           schema_statistics=schema_statistics,
+                           **options)
+
+    def _refresh_schema_statistics(self) -> Optional[SchemaStatistics]:
+        """
+        Refresh the schema statistics when the graph changed since their computation.
+
+        Returns:
+            Optional[SchemaStatistics]: The statistics, None when disabled or not computable.
+        """
+        if self.schema_statistics is None:
+            return None
+        version = self.graph_version
+        if self.schema_statistics.version != version:
+            try:
+                self.schema_statistics.refresh(self.graph, self.ontology, version)
+            except Exception as e:
+                logger.warning(f"Schema statistics not refreshed: {e}")
+        return self.schema_statistics
+
+    def _create_fulltext_indexes(self) -> None:
+        """
+        Create the full-text indexes of the searchable attributes, before an ingestion.
+        """
+        if len(searchable_attributes(self.ontology)) == 0:
+            self._fulltext_indexed = False
+            return
+        try:
+            create_fulltext_indexes(self.graph, self.ontology)
+            self._fulltext_indexed = True
+        except Exception as e:
+            logger.warning(f"Full-text search disabled, the indexes could not be created: {e}")
+            self._fulltext_indexed = False
+
+    def _fulltext_search_enabled(self) -> bool:
+        """
+        Whether the chat sessions can search the full-text indexes, checked once with a read-only query
+        when the indexes were not created by this knowledge graph.
+
+        Returns:
+            bool: True if every searchable attribute is indexed.
+        """
+        if self._fulltext_indexed is None:
+            try:
+                self._fulltext_indexed = fulltext_indexes_exist(self.read_graph, self.ontology)
+            except Exception as e:
+                logger.warning(f"Full-text search disabled, the indexes could not be listed: {e}")
+                self._fulltext_indexed = False
+        return self._fulltext_indexed
+
+    def ask_batch(self, questions: list[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                  max_context_tokens: Optional[int] = None) -> dict:
+        """
+        Answer a batch of independent questions in parallel, e.g. for evaluations and offline reports.
+
+        Each question is answered in a new chat session, so questions do not see each other. Identical
+        Cypher statements generated for different questions are executed once, and the queries share the
+        connection pool of the graph.
+
+        Args:
+            questions (list[str]): The questions to answer.
+            concurrency (int): The maximum number of questions answered at the same time. Defaults to 8.
+            max_context_tokens (Optional[int]): Token budget of the query results sent to the QA model.
+
+        Returns:
+            dict: The results, in the order of the questions, and the batch statistics:
+                {"results": [{"question", "response", "context", "cypher", "error", "latency"}, ...],
+                 "stats": {"questions", "failed", "queries_executed", "queries_deduplicated",
+                           "latency_mean", "latency_p50", "latency_p95", "latency_max", "duration"}}
+
+        Examples:
+            >>> report = kg.ask_batch(["Who directed The Matrix?", "Which movies did Keanu Reeves act in?"], concurrency=16)
+            >>> report["stats"]["latency_p95"]
+        """
+        if concurrency < 1:
+            raise Exception("concurrency should be at least 1")
+
+        graph = DeduplicatedGraph(self.read_graph)
+        # Set up once, the sessions of the batch share the graph state
+        fulltext_search = self._fulltext_search_enabled()
+        schema_statistics = self._refresh_schema_statistics()
+
+        def ask(question: str) -> dict:
+            started_at = time.monotonic()
+            result = {"question": question, "response": None, "context": None, "cypher": None, "error": None}
+            try:
+                chat_session = self._new_chat_session(graph, fulltext_search, schema_statistics,
+                                                      max_context_tokens=max_context_tokens)
+                result.update(chat_session.send_message(question))
+            except Exception as e:
+                logger.debug(f"Batch question failed: {question}: {e}")
+                result["error"] = str(e)
+            result["latency"] = time.monotonic() - started_at
+            return result
+
+        started_at = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(ask, questions))
+
+        return {
+            "results": results,
+            "stats": {
+                "questions": len(results),
+                "failed": sum(1 for result in results if result["error"] is not None),
+                "queries_executed": graph.executed,
+                "queries_deduplicated": graph.deduplicated,
+                **_latency_stats([result["latency"] for result in results]),
+                "duration": time.monotonic() - started_at,
+            },
+        }
+
     def add_node(self, entity: str, attributes: dict) -> None:
         """
         Add a node to the knowledge graph, checking if it matches the ontology
@@ -220,11 +673,13 @@ class KnowledgeGraph:
         """
 
         self._validate_entity(entity, attributes)
+        self._ensure_ontology_saved()
 
         # Add node to graph
         self.graph.query(
             f"MERGE (n:{entity} {map_dict_to_cypher_properties(attributes)})"
         )
+        self._increment_graph_version()
 
     def add_edge(
         self,
@@ -254,11 +709,13 @@ class KnowledgeGraph:
         self._validate_relation(
             relation, source, target, source_attr, target_attr, attributes
         )
+        self._ensure_ontology_saved()
 
         # Add relation to graph
         self.graph.query(
             f"MATCH (s:{source} {map_dict_to_cypher_properties(source_attr)}) MATCH (t:{target} {map_dict_to_cypher_properties(target_attr)}) MERGE (s)-[r:{relation} {map_dict_to_cypher_properties(attributes)}]->(t)"
         )
+        self._increment_graph_version()
 
     def _validate_entity(self, entity: str, attributes: str) -> None:
         """
@@ -336,3 +793,23 @@ class KnowledgeGraph:
             elif valid_attr.type == AttributeType.BOOLEAN:
                 if not isinstance(attr_dict[attr], bool):
                     raise Exception(f"Attribute {attr} should be a boolean")
+
+
+def _latency_stats(latencies: list[float]) -> dict:
+    """
+    Summarizes latencies, in seconds, with their mean, median, 95th percentile and maximum.
+    """
+    if len(latencies) == 0:
+        return {"latency_mean": None, "latency_p50": None, "latency_p95": None, "latency_max": None}
+
+    latencies = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return latencies[min(int(p * len(latencies)), len(latencies) - 1)]
+
+    return {
+        "latency_mean": sum(latencies) / len(latencies),
+        "latency_p50": percentile(0.5),
+        "latency_p95": percentile(0.95),
+        "latency_max": latencies[-1],
+    }
@@ -1,6 +1,6 @@
 import logging
-from typing import Optional, Iterator
-from litellm import completion, validate_environment, utils as litellm_utils
+from typing import Optional, Iterator, AsyncIterator
+from litellm import completion, acompletion, validate_environment, utils as litellm_utils
 
 from .model import (
     GenerativeModel,
@@ -191,6 +191,8 @@ class LiteModelChatSession(GenerativeModelChatSession):
                 **self._model.additional_params
             )
         except Exception as e:
+            # The failed message is not part of the conversation
+            self._chat_history.pop()
             raise ValueError(f"Error during completion request, please check the credentials - {e}")
         content = self._model.parse_generate_content_response(response)
         self._chat_history.append({"role": "assistant", "content": content.text})
@@ -206,6 +208,7 @@ class LiteModelChatSession(GenerativeModelChatSession):
         Yields:
             str: Streamed chunks of the model's response.
         """
+        start = len(self._chat_history)
         self._chat_history.append({"role": "user", "content": message})
 
         try:
@@ -218,20 +221,90 @@ class LiteModelChatSession(GenerativeModelChatSession):
             )
             
             chunks = []
-            for chunk in response_stream:
-                if not chunk or "choices" not in chunk or not chunk["choices"]:
-                    continue  # Skip empty or malformed chunks
-
-                content = chunk["choices"][0].get("delta", {}).get("content", "")
-                if content:
-                    chunks.append(content)
-                    yield content  # Yield streamed response chunks
-        
-            # Save the final response to chat history
-            full_response = "".join(chunks)  # Collect full response
-            self._chat_history.append({"role": "assistant", "content": full_response})
+            try:
+                for chunk in response_stream:
+                    if not chunk or "choices" not in chunk or not chunk["choices"]:
+                        continue  # Skip empty or malformed chunks
+
+                    content = chunk["choices"][0].get("delta", {}).get("content", "")
+                    if content:
+                        chunks.append(content)
+                        yield content  # Yield streamed response chunks
+            finally:
+                # Save the response to chat history, also when the caller closes the stream early
+                full_response = "".join(chunks)  # Collect full response
+                self._chat_history.append({"role": "assistant", "content": full_response})
 
         except Exception as e:
+            # The failed exchange is not part of the conversation
+            del self._chat_history[start:]
+            raise ValueError(f"Error during streaming request, check credentials - {e}") from e
+
+    async def asend_message(self, message: str) -> GenerationResponse:
+        """
+        Send a message in the chat session and receive the model's response, without blocking the event loop.
+
+        Args:
+            message (str): The message to send.
+
+        Returns:
+            GenerationResponse: The generated response.
+        """
+        self._chat_history.append({"role": "user", "content": message})
+        try:
+            response = await acompletion(
+                model=self._model.model,
+                messages=self._chat_history,
+                **self._model.generation_config.to_json(),
+                **self._model.additional_params
+            )
+        except Exception as e:
+            # The failed message is not part of the conversation
+            self._chat_history.pop()
+            raise ValueError(f"Error during completion request, please check the credentials - {e}")
+        content = self._model.parse_generate_content_response(response)
+        self._chat_history.append({"role": "assistant", "content": content.text})
+        return content
+
+    async def asend_message_stream(self, message: str) -> AsyncIterator[str]:
+        """
+        Send a message and receive the response in a streaming fashion, without blocking the event loop.
+
+        Args:
+            message (str): The message to send.
+
+        Yields:
+            str: Streamed chunks of the model's response.
+        """
+        start = len(self._chat_history)
+        self._chat_history.append({"role": "user", "content": message})
+
+        try:
+            response_stream = await acompletion(
+                model=self._model.model,
+                messages=self._chat_history,
+                stream=True,
+                **self._model.generation_config.to_json(),
+                **self._model.additional_params
+            )
+
+            chunks = []
+            try:
+                async for chunk in response_stream:
+                    if not chunk or "choices" not in chunk or not chunk["choices"]:
+                        continue  # Skip empty or malformed chunks
+
+                    content = chunk["choices"][0].get("delta", {}).get("content", "")
+                    if content:
+                        chunks.append(content)
+                        yield content
+            finally:
+                # Save the response to chat history, also when the caller closes the stream early
+                self._chat_history.append({"role": "assistant", "content": "".join(chunks)})
+
+        except Exception as e:
+            # The failed exchange is not part of the conversation
+            del self._chat_history[start:]
             raise ValueError(f"Error during streaming request, check credentials - {e}") from e
     
 
@@ -244,6 +317,15 @@ class LiteModelChatSession(GenerativeModelChatSession):
         """
         return self._chat_history.copy()
 
+    def set_chat_history(self, history: list[dict]) -> None:
+        """
+        Replace the conversation history of the current chat session, e.g. with a compacted one.
+
+        Args:
+            history (list[dict]): The new conversation history.
+        """
+        self._chat_history = list(history)
+
     def delete_last_message(self):
         """
         Deletes the last message exchange (user message and assistant response) from the chat history.
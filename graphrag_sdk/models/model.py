@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional, Iterator
+from typing import Optional, Iterator, AsyncIterator
 
 
 class FinishReason:
@@ -106,6 +107,18 @@ class GenerativeModelChatSession(ABC):
     def send_message_stream(self, message: str) -> Iterator[str]:
         raise NotImplementedError("Streaming not supported by this API implementation.")
 
+    def set_chat_history(self, history: list[dict]) -> None:
+        raise NotImplementedError("Replacing the chat history not supported by this API implementation.")
+
+    async def asend_message(self, message: str) -> GenerationResponse:
+        # Implementations without a native asynchronous API run the blocking call in a thread
+        return await asyncio.to_thread(self.send_message, message)
+
+    async def asend_message_stream(self, message: str) -> AsyncIterator[str]:
+        # Implementations without native asynchronous streaming yield the whole response at once
+        response = await self.asend_message(message)
+        yield response.text
+
 
 class GenerativeModel(ABC):
     """
@@ -1,16 +1,21 @@
 import json
+import hashlib
 import logging
 import graphrag_sdk
 from falkordb import Graph
 from .entity import Entity
 from .relation import Relation
 from typing import Optional, Union
+from concurrent.futures import ThreadPoolExecutor
 from graphrag_sdk.source import AbstractSource
 from graphrag_sdk.models import GenerativeModel
 from .attribute import Attribute, AttributeType
 
 logger = logging.getLogger(__name__)
 
+# Schema graph node holding metadata about the saved ontology
+ONTOLOGY_METADATA_LABEL = "__Ontology__"
+
 def _process_attributes_from_graph(attributes: list[list[list[str]]]) -> list[Attribute]:
     """
     Processes the attributes extracted from the graph and converts them into the SDK convention.
@@ -24,6 +29,9 @@ def _process_attributes_from_graph(attributes: list[list[list[str]]]) -> list[At
     processed_attributes = []
     for attr in attributes:
         attr_name, attr_type = attr[0]
+        # Skip SDK internal attributes, e.g. provenance
+        if attr_name.startswith("__"):
+            continue
         try:
             attr_type = AttributeType.from_string(attr_type)
         except:
@@ -32,6 +40,45 @@ def _process_attributes_from_graph(attributes: list[list[list[str]]]) -> list[At
         processed_attributes.append(Attribute(attr_name, attr_type))
 
     return processed_attributes
+
+
+def _query_attributes(graph: Graph, pattern: str, sample_size: int) -> list[Attribute]:
+    """
+    Samples the attributes of the nodes or edges matching a pattern.
+
+    Args:
+        graph (Graph): The graph to query.
+        pattern (str): The Cypher pattern binding the sampled element to `a`.
+        sample_size (int): The maximum number of elements to sample.
+
+    Returns:
+        list[Attribute]: The sampled attributes.
+    """
+    attributes = graph.query(
+        f"""MATCH {pattern} call {{ with a return [k in keys(a) | [k, typeof(a[k])]] as types }}
+        WITH types limit {sample_size} unwind types as kt RETURN kt, count(1) ORDER BY kt[0]""").result_set
+    return _process_attributes_from_graph(attributes)
+
+
+def _query_endpoints(graph: Graph, relation_type: str, sample_size: Optional[int] = None) -> list[tuple[str, str]]:
+    """
+    Retrieves the distinct source and target label pairs connected by a relationship type.
+
+    Args:
+        graph (Graph): The graph to query.
+        relation_type (str): The relationship type.
+        sample_size (Optional[int]): The maximum number of edges to sample. Defaults to None, scanning all edges.
+
+    Returns:
+        list[tuple[str, str]]: The (source label, target label) pairs.
+    """
+    limit = f"LIMIT {sample_size}" if sample_size is not None else ""
+    result_set = graph.query(
+        f"""MATCH (s)-[:{relation_type}]->(t) WITH s, t {limit}
+        UNWIND labels(s) AS s_l UNWIND labels(t) AS t_l RETURN DISTINCT s_l, t_l""").result_set
+    return [(row[0], row[1]) for row in result_set]
+
+
 class Ontology(object):
     """
     Represents an ontology, which is a collection of entities and relations.
@@ -113,19 +160,34 @@ class Ontology(object):
         """
         ontology = Ontology()
 
-        entities = graph.query("MATCH (n) RETURN n").result_set
-        for entity in entities:
-            ontology.add_entity(Entity.from_graph(entity[0]))
+        # Relations are read with their endpoints in one scan, then the entities without relations
+        labels = {}
 
-        for relation in graph.query("MATCH ()-[r]->() RETURN r").result_set:
-            ontology.add_relation(
-                Relation.from_graph(relation[0], [x for xs in entities for x in xs])
-            )
+        def add_entity(node) -> None:
+            if node.id not in labels:
+                labels[node.id] = node.labels[0]
+                ontology.add_entity(Entity.from_graph(node))
+
+        for (source, relation, target) in graph.query("MATCH (s)-[r]->(d) RETURN s, r, d").result_set:
+            add_entity(source)
+            add_entity(target)
+            ontology.add_relation(Relation.from_graph(relation, labels))
+
+        isolated = graph.query(
+            f"MATCH (n) WHERE NOT n:{ONTOLOGY_METADATA_LABEL} AND NOT (n)--() RETURN n"
+        ).result_set
+        for entity in isolated:
+            add_entity(entity[0])
 
         return ontology
     
     @staticmethod
-    def from_kg_graph(graph: Graph, sample_size: Optional[int] = 100) -> "Ontology":
+    def from_kg_graph(
+        graph: Graph,
+        sample_size: Optional[int] = 100,
+        edge_sample_size: Optional[int] = None,
+        max_workers: Optional[int] = 8,
+    ) -> "Ontology":
         """
         Constructs an Ontology object from a given Knowledge Graph.
 
@@ -133,44 +195,65 @@ class Ontology(object):
         1. Entities and their attributes.
         2. Relationships between entities and their attributes.
 
+        A constant number of queries is issued per label and per relationship type,
+        and the queries are executed concurrently.
+
         Args:
             graph (Graph): The graph object representing the knowledge graph.
             sample_size (Optional[int]): The maximum number of attributes to sample for each entity and relationship. Defaults to 100.
+            edge_sample_size (Optional[int]): The maximum number of edges to sample for each relationship type when
+                discovering its source and target labels. Defaults to None, scanning all edges.
+            max_workers (Optional[int]): The maximum number of concurrent queries. Defaults to 8.
 
         Returns:
             Ontology: The Ontology object constructed from the Knowledge Graph.
         """
         ontology = Ontology()
 
-        # Retrieve all node labels and edge types from the graph.
-        n_labels = graph.call_procedure("db.labels").result_set
-        e_types = graph.call_procedure("db.relationshipTypes").result_set
-        
-        # Extract attributes for each node label, limited by the specified sample size.
-        for lbls in n_labels:
-            l = lbls[0]
-            attributes = graph.query(
-                f"""MATCH (a:{l}) call {{ with a return [k in keys(a) | [k, typeof(a[k])]] as types }}
-                WITH types limit {sample_size} unwind types as kt RETURN kt, count(1) ORDER BY kt[0]""").result_set
-            attributes = _process_attributes_from_graph(attributes)
-            ontology.add_entity(Entity(l, attributes))
-
-        # Extract attributes for each edge type, limited by the specified sample size.
-        for e_type in e_types:
-            e_t = e_type[0]
-            attributes = graph.query(
-                            f"""MATCH ()-[a:{e_t}]->() call {{ with a return [k in keys(a) | [k, typeof(a[k])]] as types }}
-                            WITH types limit {sample_size} unwind types as kt RETURN kt, count(1) ORDER BY kt[0]""").result_set
-            attributes = _process_attributes_from_graph(attributes)
-            for s_lbls in n_labels:
-                for t_lbls in n_labels:
-                    s_l = s_lbls[0]
-                    t_l = t_lbls[0]
-                    # Check if a relationship exists between the source and target entity labels
-                    result_set = graph.query(f"MATCH (s:{s_l})-[a:{e_t}]->(t:{t_l}) return a limit 1").result_set
-                    if len(result_set) > 0:
-                        ontology.add_relation(Relation(e_t, s_l, t_l, attributes))
-        
+        # Retrieve all node labels and edge types from the graph, skipping SDK internal ones.
+        n_labels = [
+            lbls[0] for lbls in graph.call_procedure("db.labels").result_set
+            if not lbls[0].startswith("__")
+        ]
+        e_types = [
+            e_type[0] for e_type in graph.call_procedure("db.relationshipTypes").result_set
+            if not e_type[0].startswith("__")
+        ]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Extract attributes for each node label, limited by the specified sample size.
+            entity_attributes = {
+                l: executor.submit(_query_attributes, graph, f"(a:{l})", sample_size)
+                for l in n_labels
+            }
+            # Extract attributes for each edge type, limited by the specified sample size.
+            relation_attributes = {
+                e_t: executor.submit(_query_attributes, graph, f"()-[a:{e_t}]->()", sample_size)
+                for e_t in e_types
+            }
+            # Extract the source and target labels connected by each edge type.
+            relation_endpoints = {
+                e_t: executor.submit(_query_endpoints, graph, e_t, edge_sample_size)
+                for e_t in e_types
+            }
+
+            for l in n_labels:
+                ontology.add_entity(Entity(l, entity_attributes[l].result()))
+
+            label_order = {l: i for i, l in enumerate(n_labels)}
+            for e_t in e_types:
+                attributes = relation_attributes[e_t].result()
+                endpoints = sorted(
+                    (
+                        (s_l, t_l)
+                        for s_l, t_l in relation_endpoints[e_t].result()
+                        if s_l in label_order and t_l in label_order
+                    ),
+                    key=lambda pair: (label_order[pair[0]], label_order[pair[1]]),
+                )
+                for s_l, t_l in endpoints:
+                    ontology.add_relation(Relation(e_t, s_l, t_l, attributes))
+
         return ontology
     
     def add_entity(self, entity: Entity) -> None:
@@ -386,19 +469,69 @@ The following entities do not have unique attributes:
             relations="\n- ".join([str(relation) for relation in self.relations]),
         )
 
+    def get_hash(self) -> str:
+        """
+        Computes a hash of the ontology, stable across processes.
+
+        Returns:
+            str: The hex digest of the ontology's JSON representation.
+        """
+        return hashlib.sha256(
+            json.dumps(self.to_json(), sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def get_saved_hash(graph: Graph) -> Optional[str]:
+        """
+        Retrieves the hash of the ontology last saved to the specified graph.
+
+        Args:
+            graph (Graph): The schema graph.
+
+        Returns:
+            Optional[str]: The saved ontology hash, or None if unknown.
+        """
+        result_set = graph.query(
+            f"MATCH (o:{ONTOLOGY_METADATA_LABEL}) RETURN o.hash"
+        ).result_set
+        return result_set[0][0] if len(result_set) > 0 else None
+
     def save_to_graph(self, graph: Graph) -> None:
         """
-        Saves the entities and relations to the specified graph.
+        Saves the entities and relations to the specified graph in a single transaction.
 
         Args:
             graph (Graph): The graph to save the entities and relations to.
         """
-        for entity in self.entities:
-            query = entity.to_graph_query()
-            logger.debug(f"Query: {query}")
-            graph.query(query)
+        clauses = []
+        variables = {}
+        for i, entity in enumerate(self.entities):
+            variable = f"e{i}"
+            variables.setdefault(entity.label, variable)
+            clauses.append(entity.to_merge_clause(variable))
+
+        # Relations whose endpoints are not part of this ontology are saved separately
+        detached_relations = []
+        for i, relation in enumerate(self.relations):
+            if relation.source.label in variables and relation.target.label in variables:
+                clauses.append(
+                    relation.to_merge_clause(
+                        variables[relation.source.label],
+                        variables[relation.target.label],
+                        f"r{i}",
+                    )
+                )
+            else:
+                detached_relations.append(relation)
+
+        clauses.append(
+            f"MERGE (o:{ONTOLOGY_METADATA_LABEL}) SET o.hash = '{self.get_hash()}'"
+        )
+        query = "\n".join(clauses)
+        logger.debug(f"Query: {query}")
+        graph.query(query)
 
-        for relation in self.relations:
+        for relation in detached_relations:
             query = relation.to_graph_query()
             logger.debug(f"Query: {query}")
             graph.query(query)
@@ -0,0 +1,254 @@
+import re
+import logging
+from typing import Callable, Optional
+from falkordb import Graph
+from redis.exceptions import ResponseError
+from falkordb.asyncio.graph import AsyncGraph
+from falkordb.query_result import QueryResult
+from falkordb.execution_plan import ExecutionPlan
+from graphrag_sdk.cypher_parser import mask_literals
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 1000
+DEFAULT_MAX_HOPS = 5
+DEFAULT_TIMEOUT = 30000
+
+# Execution plan operations scanning the whole graph
+FULL_SCAN_OPERATIONS = {
+    "All Node Scan": "The query scans every node of the graph, match nodes by label or property instead.",
+    "Cartesian Product": "The query computes a cartesian product of disconnected patterns, connect the patterns instead.",
+}
+
+# Relationship patterns, e.g. -[r:KNOWS*1..3]-
+_RELATION_PATTERN = re.compile(r"-\[[^\[\]]*\]")
+# Variable-length specification inside a relationship pattern, e.g. *, *2, *1..3, *..3
+_HOPS_PATTERN = re.compile(r"\*\s*(\d+)?\s*(\.\.\s*(\d+)?)?")
+_RETURN_PATTERN = re.compile(r"\bRETURN\b", re.IGNORECASE)
+_LIMIT_PATTERN = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
+
+def bound_variable_length_hops(cypher: str, max_hops: int) -> str:
+    """
+    Bounds the variable-length relationship patterns of a Cypher query.
+
+    Unbounded patterns, such as `*` or `*2..`, get `max_hops` as upper bound, and upper bounds
+    above `max_hops` are lowered to it. Exact lengths, such as `*3`, are kept. String literals
+    and comments are left untouched.
+
+    Args:
+        cypher (str): The Cypher query.
+        max_hops (int): The maximum number of hops.
+
+    Returns:
+        str: The bounded Cypher query.
+    """
+
+    def bound_hops(match: re.Match) -> str:
+        lower, is_range, upper = match.group(1), match.group(2), match.group(3)
+        if lower is not None and is_range is None:
+            return match.group(0)
+        lower_bound = int(lower) if lower is not None else 1
+        upper_bound = max(lower_bound, max_hops)
+        if upper is not None:
+            upper_bound = min(int(upper), upper_bound)
+        return f"*{lower_bound}..{upper_bound}"
+
+    def bound_relation(match: re.Match) -> str:
+        return _substitute(_HOPS_PATTERN, bound_hops, cypher[match.start():match.end()], match.group(0))
+
+    return _substitute(_RELATION_PATTERN, bound_relation, cypher, mask_literals(cypher))
+
+
+def _substitute(pattern: re.Pattern, replace: Callable[[re.Match], str], cypher: str, masked: str) -> str:
+    # Matches are found in the masked query, the text between them is copied from the query
+    parts = []
+    end = 0
+    for match in pattern.finditer(masked):
+        parts += [cypher[end:match.start()], replace(match)]
+        end = match.end()
+    parts.append(cypher[end:])
+    return "".join(parts)
+
+
+def inject_limit(cypher: str, limit: int) -> str:
+    """
+    Appends a LIMIT to the final RETURN clause of a Cypher query, unless it already has one.
+    Keywords inside string literals and comments are ignored.
+
+    Args:
+        cypher (str): The Cypher query.
+        limit (int): The maximum number of rows returned.
+
+    Returns:
+        str: The limited Cypher query.
+    """
+    cypher = cypher.strip().rstrip(";").rstrip()
+    masked = mask_literals(cypher)
+    returns = list(_RETURN_PATTERN.finditer(masked))
+    if len(returns) == 0:
+        return cypher
+
+    if _LIMIT_PATTERN.search(masked, returns[-1].end()) is not None:
+        return cypher
+
+    return f"{cypher} LIMIT {limit}"
+
+
+class QueryPolicy:
+    """
+    Safety policy applied to the generated Cypher queries before they reach FalkorDB.
+
+    Queries are bounded so a faulty statement cannot pin the database: results are limited,
+    variable-length patterns get an upper bound, a timeout is passed to the server and,
+    when read-only, queries are executed with `GRAPH.RO_QUERY` so they can never write.
+
+    With `explain`, queries are first checked with `GRAPH.EXPLAIN`, which plans the query without
+    touching any data: syntax and semantic errors are reported by the server before execution,
+    and full scans are detected, and optionally rejected.
+
+    Args:
+        limit (Optional[int]): LIMIT appended to queries without one. None disables it.
+        max_hops (Optional[int]): Upper bound of variable-length patterns. None disables it.
+        timeout (Optional[int]): Query timeout in milliseconds. None uses the server default.
+        read_only (bool): Execute the queries as read-only.
+        explain (bool): Validate the queries with GRAPH.EXPLAIN before executing them.
+        reject_full_scans (bool): Reject the queries scanning the whole graph, requires `explain`.
+
+    Examples:
+        >>> from graphrag_sdk.query_policy import QueryPolicy
+        >>> kg = KnowledgeGraph("test_kg", model_config, ontology, query_policy=QueryPolicy(limit=100, timeout=5000))
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = DEFAULT_LIMIT,
+        max_hops: Optional[int] = DEFAULT_MAX_HOPS,
+        timeout: Optional[int] = DEFAULT_TIMEOUT,
+        read_only: bool = True,
+        explain: bool = False,
+        reject_full_scans: bool = False,
+    ):
+        """
+        Initializes a new QueryPolicy object.
+
+        Args:
+            limit (Optional[int]): LIMIT appended to queries without one.
+            max_hops (Optional[int]): Upper bound of variable-length patterns.
+            timeout (Optional[int]): Query timeout in milliseconds.
+            read_only (bool): Execute the queries as read-only.
+            explain (bool): Validate the queries with GRAPH.EXPLAIN before executing them.
+            reject_full_scans (bool): Reject the queries scanning the whole graph.
+        """
+        self.limit = limit
+        self.max_hops = max_hops
+        self.timeout = timeout
+        self.read_only = read_only
+        self.explain = explain
+        self.reject_full_scans = reject_full_scans
+
+    def apply(self, cypher: str) -> str:
+        """
+        Rewrites a Cypher query according to the policy.
+
+        Args:
+            cypher (str): The Cypher query.
+
+        Returns:
+            str: The bounded Cypher query.
+        """
+        if self.max_hops is not None:
+            cypher = bound_variable_length_hops(cypher, self.max_hops)
+        if self.limit is not None:
+            cypher = inject_limit(cypher, self.limit)
+        return cypher
+
+    def validate(self, graph: Graph, cypher: str) -> Optional[list[str]]:
+        """
+        Validates a Cypher query with the server execution planner, when `explain` is enabled.
+
+        Args:
+            graph (Graph): The graph to query.
+            cypher (str): The Cypher query.
+
+        Returns:
+            Optional[list[str]]: A list of validation errors, or None if valid.
+        """
+        if not self.explain:
+            return None
+
+        try:
+            plan = graph.explain(self.apply(cypher))
+        except ResponseError as e:
+            # The server error pinpoints the faulty part of the query
+            return [str(e)]
+
+        return self._plan_errors(plan)
+
+    async def avalidate(self, graph: AsyncGraph, cypher: str) -> Optional[list[str]]:
+        """
+        Validates a Cypher query with the execution planner of an asynchronous graph, when `explain` is enabled.
+
+        Args:
+            graph (AsyncGraph): The graph to query.
+            cypher (str): The Cypher query.
+
+        Returns:
+            Optional[list[str]]: A list of validation errors, or None if valid.
+        """
+        if not self.explain:
+            return None
+
+        try:
+            plan = await graph.explain(self.apply(cypher))
+        except ResponseError as e:
+            return [str(e)]
+
+        return self._plan_errors(plan)
+
+    def _plan_errors(self, plan: ExecutionPlan) -> Optional[list[str]]:
+        errors = []
+        for operation, message in FULL_SCAN_OPERATIONS.items():
+            if len(plan.collect_operations(operation)) > 0:
+                logger.debug(f"Full scan in query plan: {operation}")
+                errors.append(message)
+
+        if self.reject_full_scans and len(errors) > 0:
+            return errors
+
+        return None
+
+    def execute(self, graph: Graph, cypher: str) -> QueryResult:
+        """
+        Executes a Cypher query according to the policy.
+
+        Args:
+            graph (Graph): The graph to query.
+            cypher (str): The Cypher query.
+
+        Returns:
+            QueryResult: The query result.
+        """
+        cypher = self.apply(cypher)
+        logger.debug(f"Bounded Cypher: {cypher}")
+        if self.read_only:
+            return graph.ro_query(cypher, timeout=self.timeout)
+        return graph.query(cypher, timeout=self.timeout)
+
+    async def aexecute(self, graph: AsyncGraph, cypher: str) -> QueryResult:
+        """
+        Executes a Cypher query on an asynchronous graph according to the policy.
+
+        Args:
+            graph (AsyncGraph): The graph to query.
+            cypher (str): The Cypher query.
+
+        Returns:
+            QueryResult: The query result.
+        """
+        cypher = self.apply(cypher)
+        logger.debug(f"Bounded Cypher: {cypher}")
+        if self.read_only:
+            return await graph.ro_query(cypher, timeout=self.timeout)
+        return await graph.query(cypher, timeout=self.timeout)
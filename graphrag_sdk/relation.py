@@ -79,8 +79,8 @@ class Relation:
         attributes (Optional[list[Attribute]]): The attributes associated with the relation.
 
     Methods:
-        from_graph(relation: GraphEdge, entities: list[GraphNode]) -> Relation:
-            Creates a Relation object from a graph edge and a list of graph nodes.
+        from_graph(relation: GraphEdge, entities: Union[list[GraphNode], dict[int, str]]) -> Relation:
+            Creates a Relation object from a graph edge and the graph nodes it connects.
         from_json(txt: Union[dict, str]) -> Relation:
             Creates a Relation object from a JSON string or dictionary.
         from_string(txt: str) -> Relation:
@@ -91,6 +91,8 @@ class Relation:
             Combines the attributes of another Relation object with this Relation object.
         to_graph_query() -> str:
             Generates a Cypher query string for creating the relation in a graph database.
+        to_merge_clause(source_variable: str, target_variable: str, variable: str) -> str:
+            Generates the Cypher MERGE clause for the relation between two bound nodes.
         __str__() -> str:
             Returns a string representation of the Relation object.
     """
@@ -128,26 +130,27 @@ class Relation:
         self.attributes = attributes
 
     @staticmethod
-    def from_graph(relation: GraphEdge, entities: list[GraphNode]) -> "Relation":
+    def from_graph(
+        relation: GraphEdge, entities: Union[list[GraphNode], dict[int, str]]
+    ) -> "Relation":
         """
-        Creates a Relation object from a graph edge and a list of graph nodes.
+        Creates a Relation object from a graph edge and the graph nodes it connects.
 
         Args:
             relation (GraphEdge): The graph edge representing the relation.
-            entities (list[GraphNode]): The list of graph nodes representing the entities.
+            entities (Union[list[GraphNode], dict[int, str]]): The graph nodes representing the entities,
+                either as a list or as a mapping of node id to label.
 
         Returns:
             Relation: The created Relation object.
         """
         logger.debug(f"Relation.from_graph: {relation}")
+        if not isinstance(entities, dict):
+            entities = {n.id: n.labels[0] for n in entities}
         return Relation(
             relation.relation,
-            _RelationEntity(
-                next(n.labels[0] for n in entities if n.id == relation.src_node)
-            ),
-            _RelationEntity(
-                next(n.labels[0] for n in entities if n.id == relation.dest_node)
-            ),
+            _RelationEntity(entities[relation.src_node]),
+            _RelationEntity(entities[relation.dest_node]),
             [
                 Attribute.from_string(f"{attr}:{relation.properties[attr]}")
                 for attr in relation.properties
@@ -246,7 +249,21 @@ class Relation:
         Returns:
             str: The Cypher query string.
         """
-        return f"MATCH (s:{self.source.label}) MATCH (t:{self.target.label}) MERGE (s)-[r:{self.label} {{{', '.join([str(attr) for attr in self.attributes])}}}]->(t) RETURN r"
+        return f"MATCH (s:{self.source.label}) MATCH (t:{self.target.label}) {self.to_merge_clause('s', 't')} RETURN r"
+
+    def to_merge_clause(self, source_variable: str, target_variable: str, variable: str = "r") -> str:
+        """
+        Generates the Cypher MERGE clause creating the relation between two bound nodes.
+
+        Args:
+            source_variable (str): The variable bound to the source node.
+            target_variable (str): The variable bound to the target node.
+            variable (str): The variable name bound to the relation. Defaults to "r".
+
+        Returns:
+            str: The Cypher clause.
+        """
+        return f"MERGE ({source_variable})-[{variable}:{self.label} {{{', '.join([str(attr) for attr in self.attributes])}}}]->({target_variable})"
 
     def __str__(self) -> str:
         """
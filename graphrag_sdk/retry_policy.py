@@ -0,0 +1,77 @@
+import time
+from typing import Optional
+from graphrag_sdk.models import GenerativeModel
+
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_ESCALATE_AFTER = 2
+
+
+class RetryPolicy:
+    """
+    Retry strategy of the Cypher generation.
+
+    Each failed attempt sends the validation or execution error back to the model, so the next
+    attempt can fix the statement. Attempts stop after `max_attempts` or once `deadline` seconds
+    have passed, and after `escalate_after` failures the remaining attempts are made with
+    `escalation_model`, usually a stronger, slower model.
+
+    Args:
+        max_attempts (int): The maximum number of generation attempts per question.
+        deadline (Optional[float]): Seconds after which no new attempt is made. Defaults to None, no deadline.
+        escalation_model (Optional[GenerativeModel]): The model used once `escalate_after` attempts failed.
+        escalate_after (int): The number of failed attempts before escalating.
+
+    Examples:
+        >>> from graphrag_sdk.retry_policy import RetryPolicy
+        >>> kg = KnowledgeGraph("test_kg", model_config, ontology,
+        ...     retry_policy=RetryPolicy(max_attempts=4, deadline=20, escalation_model=LiteModel("openai/gpt-4.1")))
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        deadline: Optional[float] = None,
+        escalation_model: Optional[GenerativeModel] = None,
+        escalate_after: int = DEFAULT_ESCALATE_AFTER,
+    ):
+        """
+        Initializes a new RetryPolicy object.
+
+        Args:
+            max_attempts (int): The maximum number of generation attempts per question.
+            deadline (Optional[float]): Seconds after which no new attempt is made.
+            escalation_model (Optional[GenerativeModel]): The model used once `escalate_after` attempts failed.
+            escalate_after (int): The number of failed attempts before escalating.
+        """
+        if max_attempts < 1:
+            raise Exception("max_attempts should be at least 1")
+
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.escalation_model = escalation_model
+        self.escalate_after = escalate_after
+
+    def should_escalate(self, failed_attempts: int) -> bool:
+        """
+        Checks whether the next attempt should use the escalation model.
+
+        Args:
+            failed_attempts (int): The number of failed attempts so far.
+
+        Returns:
+            bool: True to use the escalation model.
+        """
+        return self.escalation_model is not None and failed_attempts >= self.escalate_after
+
+    def expired(self, started_at: float) -> bool:
+        """
+        Checks whether the deadline passed.
+
+        Args:
+            started_at (float): The `time.monotonic()` at which the first attempt started.
+
+        Returns:
+            bool: True when no new attempt should be made.
+        """
+        return self.deadline is not None and time.monotonic() - started_at >= self.deadline
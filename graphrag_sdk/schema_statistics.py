@@ -0,0 +1,147 @@
+import logging
+from falkordb import Graph
+from threading import Lock
+from typing import Optional
+from graphrag_sdk.ontology import Ontology
+from graphrag_sdk.attribute import AttributeType
+from graphrag_sdk.fixtures.prompts import CYPHER_GEN_STATISTICS
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 5
+DEFAULT_MAX_DISTINCT = 20
+# Longer values are free text, not categories worth listing
+MAX_VALUE_LENGTH = 50
+
+
+class SchemaStatistics:
+    """
+    Cache of statistics of the graph data, appended to the Cypher generation system instruction so that the
+    model uses existing property values instead of guessing them.
+
+    The statistics are the number of nodes per label and of relationships per type, the most frequent values
+    of the low-cardinality string attributes and the range of the numeric attributes. They are computed with
+    aggregate queries, and refreshed incrementally: only the labels whose count changed are aggregated again,
+    so updates of existing nodes show once their label count changes, see `refresh`.
+
+    Args:
+        top_k (int): The number of values listed per low-cardinality string attribute.
+        max_distinct (int): The maximum number of distinct values of a low-cardinality string attribute.
+
+    Examples:
+        >>> kg = KnowledgeGraph("test_kg", model_config, ontology, schema_statistics=SchemaStatistics(top_k=10))
+        >>> chat = kg.chat_session()
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K, max_distinct: int = DEFAULT_MAX_DISTINCT):
+        """
+        Initializes a new SchemaStatistics object.
+
+        Args:
+            top_k (int): The number of values listed per low-cardinality string attribute.
+            max_distinct (int): The maximum number of distinct values of a low-cardinality string attribute.
+        """
+        if top_k < 1 or max_distinct < top_k:
+            raise Exception("top_k should be at least 1 and max_distinct at least top_k")
+
+        self.top_k = top_k
+        self.max_distinct = max_distinct
+        # Graph version the statistics were computed at, None before the first computation
+        self.version = None
+        self._lock = Lock()
+        self._node_counts = {}
+        self._relation_counts = {}
+        self._attributes = {}
+
+    def refresh(self, graph: Graph, ontology: Ontology, version: Optional[int] = None, full: bool = False) -> None:
+        """
+        Computes the statistics, aggregating again only the labels whose count changed.
+
+        The values and ranges of a label whose node count is unchanged are kept: updates of existing nodes
+        which create or delete no node of the label are not reflected until its count changes, or until a
+        full refresh.
+
+        The queries run without holding the cache, which keeps serving the previous statistics meanwhile.
+
+        Args:
+            graph (Graph): The graph.
+            ontology (Ontology): The ontology of the graph.
+            version (Optional[int]): The graph version the statistics are computed at.
+            full (bool): Aggregate every label again.
+        """
+        with self._lock:
+            known_counts = dict(self._node_counts)
+
+        node_counts = {}
+        attributes = {}
+        for entity in ontology.entities:
+            count = _count(graph, f"MATCH (n:{entity.label}) RETURN count(n)")
+            node_counts[entity.label] = count
+            if full or known_counts.get(entity.label) != count:
+                attributes[entity.label] = self._attribute_statistics(graph, entity.label, entity.attributes)
+
+        # Relations of the same type between other entities share the count
+        relation_counts = {
+            label: _count(graph, f"MATCH ()-[r:{label}]->() RETURN count(r)")
+            for label in dict.fromkeys(relation.label for relation in ontology.relations)
+        }
+
+        with self._lock:
+            self._node_counts = node_counts
+            self._relation_counts = relation_counts
+            self._attributes = {
+                label: attributes[label] if label in attributes else self._attributes.get(label, {})
+                for label in node_counts
+            }
+            self.version = version
+        logger.debug(f"Schema statistics refreshed at version {version}")
+
+    def _attribute_statistics(self, graph: Graph, label: str, attributes: list) -> dict[str, str]:
+        statistics = {}
+        for attribute in attributes:
+            if attribute.type == AttributeType.STRING:
+                result = graph.ro_query(
+                    f"MATCH (n:{label}) WHERE n.{attribute.name} IS NOT NULL "
+                    f"RETURN n.{attribute.name} AS value, count(n) AS count "
+                    f"ORDER BY count DESC LIMIT {self.max_distinct + 1}"
+                )
+                values = [row[0] for row in result.result_set]
+                if 0 < len(values) <= self.max_distinct and all(
+                    isinstance(value, str) and len(value) <= MAX_VALUE_LENGTH for value in values
+                ):
+                    rendered = ", ".join(repr(value) for value in values[: self.top_k])
+                    more = f" (+{len(values) - self.top_k} more)" if len(values) > self.top_k else ""
+                    statistics[attribute.name] = rendered + more
+            elif attribute.type == AttributeType.NUMBER:
+                result = graph.ro_query(
+                    f"MATCH (n:{label}) RETURN min(n.{attribute.name}), max(n.{attribute.name})"
+                )
+                (minimum, maximum) = result.result_set[0] if len(result.result_set) > 0 else (None, None)
+                if minimum is not None:
+                    statistics[attribute.name] = f"{minimum}..{maximum}"
+        return statistics
+
+    def to_prompt(self) -> Optional[str]:
+        """
+        Renders the statistics compactly, one line per label or relationship type.
+
+        Returns:
+            Optional[str]: The statistics section of the Cypher system instruction, None before the computation.
+        """
+        with self._lock:
+            if len(self._node_counts) == 0 and len(self._relation_counts) == 0:
+                return None
+
+            lines = []
+            for (label, count) in self._node_counts.items():
+                rendered = "".join(f"; {name}: {values}" for (name, values) in self._attributes[label].items())
+                lines.append(f"- {label}: {count} nodes{rendered}")
+            for (label, count) in self._relation_counts.items():
+                lines.append(f"- {label}: {count} relationships")
+            return CYPHER_GEN_STATISTICS.format(statistics="\n".join(lines))
+
+
+def _count(graph: Graph, query: str) -> int:
+    result = graph.ro_query(query)
+    return result.result_set[0][0] if len(result.result_set) > 0 else 0
@@ -1,12 +1,13 @@
 import os
 import time
 import json
+import hashlib
 import logging
 from tqdm import tqdm
 from uuid import uuid4
 from falkordb import Graph
 from threading import Lock
-from typing import Optional
+from typing import Callable, Optional
 from graphrag_sdk.steps.Step import Step
 from graphrag_sdk.document import Document
 from ratelimit import limits, sleep_and_retry
@@ -14,6 +15,8 @@ from graphrag_sdk.source import AbstractSource
 from concurrent.futures import Future, ThreadPoolExecutor
 from graphrag_sdk.helpers import extract_json, map_dict_to_cypher_properties
 from graphrag_sdk.ontology import Ontology
+from graphrag_sdk.entity_resolution import EntityResolver
+from graphrag_sdk.vector_retrieval import entity_text, embedding_set_statement
 from graphrag_sdk.models import (
     GenerativeModel,
     GenerativeModelChatSession,
@@ -29,6 +32,13 @@ from graphrag_sdk.fixtures.prompts import (
 
 RENDER_STEP_SIZE = 0.5
 
+# Provenance schema: (:__Document__ {source, id, hash})-[:__MENTIONS__]->(n), a document node per source and document.
+# Extracted nodes and relationships record their supporting sources in PROVENANCE_SOURCES_KEY, created empty;
+# the ones which predate the provenance tracking have none and are never deleted with a source.
+PROVENANCE_DOCUMENT_LABEL = "__Document__"
+PROVENANCE_MENTIONS_RELATION = "__MENTIONS__"
+PROVENANCE_SOURCES_KEY = "__sources__"
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
@@ -46,6 +56,9 @@ class ExtractDataStep(Step):
         graph: Graph,
         config: Optional[dict] = None,
         hide_progress: Optional[bool] = False,
+        track_provenance: Optional[bool] = False,
+        embed: Optional[Callable[[str], list[float]]] = None,
+        entity_resolver: Optional[EntityResolver] = None,
     ) -> None:
         """
         Initialize the ExtractDataStep.
@@ -57,6 +70,10 @@ class ExtractDataStep(Step):
             graph (Graph): The FalkorDB graph instance.
             config (Optional[dict]): Configuration options for the step.
             hide_progress (Optional[bool]): Flag to hide progress bar. Defaults to False.
+            track_provenance (Optional[bool]): Link extracted nodes and relations to the document they came from. Defaults to False.
+            embed (Optional[Callable[[str], list[float]]]): Function embedding the extracted entities, stored for the vector search.
+            entity_resolver (Optional[EntityResolver]): Links the extracted entities to the known entities with similar names
+                before writing them, instead of creating duplicates.
         """
         self.sources = sources
         self.ontology = ontology
@@ -72,6 +89,9 @@ class ExtractDataStep(Step):
         self.model = model
         self.graph = graph
         self.hide_progress = hide_progress
+        self.track_provenance = track_provenance
+        self.embed = embed
+        self.entity_resolver = entity_resolver
         self.process_files = 0
         self.counter_lock = Lock()
         if not os.path.exists("logs"):
@@ -92,9 +112,13 @@ class ExtractDataStep(Step):
         #   2. A string (the ID of the document being processed)
         tasks: list[tuple[Future, str]] = []
         
+        if self.entity_resolver is not None:
+            # Link the new mentions to the entities of the previous ingestions too
+            self.entity_resolver.load(self.graph, self.ontology)
+
         # Collect documents from all sources
         documents = [
-            (document, source.instruction)
+            (document, source)
             for source in self.sources
             for document in source.load()
             if document.not_empty()
@@ -104,7 +128,7 @@ class ExtractDataStep(Step):
             with ThreadPoolExecutor(max_workers=self.config["max_workers"]) as executor:
                 
                 # Concurrency document processing
-                for document, instructions in documents:
+                for document, source in documents:
                     task_id = "extract_data_step_" + str(uuid4())
                     task = executor.submit(
                         self._process_document,
@@ -113,7 +137,9 @@ class ExtractDataStep(Step):
                         document,
                         self.ontology,
                         self.graph,
+                        source.instruction,
                         instructions,
+                        source=source,
                     )
                     tasks.append((task, document.id))
                     
@@ -138,6 +164,7 @@ class ExtractDataStep(Step):
         source_instructions: Optional[str] = "",
         instructions: Optional[str] = "",
         retries: Optional[int] = 1,
+        source: Optional[AbstractSource] = None,
     ):
         try:
             """
@@ -152,6 +179,7 @@ class ExtractDataStep(Step):
                 source_instructions (Optional[str]): Instructions specific to the source.
                 instructions (Optional[str]): Additional instructions.
                 retries (Optional[int]): Number of times to retry if the model stops unexpectedly.
+                source (Optional[AbstractSource]): The source the document was loaded from, used for provenance.
             """
             _task_logger = logging.getLogger(task_id)
             _task_logger.setLevel(logging.DEBUG)
@@ -229,19 +257,33 @@ class ExtractDataStep(Step):
                 raise Exception(
                     f"Invalid data format. Missing 'entities' or 'relations' in JSON."
                 )
+            source_key = (
+                get_source_key(source) if self.track_provenance and source is not None else None
+            )
+
+            # IDs of the nodes mentioned by this document
+            mentioned_ids = set()
             for entity in data["entities"]:
                 try:
-                    self._create_entity(graph, entity, ontology)
+                    result = self._create_entity(graph, entity, ontology, source_key)
+                    if result is not None:
+                        mentioned_ids.update(row[0] for row in result.result_set)
                 except Exception as e:
                     _task_logger.error(f"Error creating entity: {e}")
                     continue
 
             for relation in data["relations"]:
                 try:
-                    self._create_relation(graph, relation, ontology)
+                    result = self._create_relation(graph, relation, ontology, source_key)
+                    if result is not None:
+                        for row in result.result_set:
+                            mentioned_ids.update(row)
                 except Exception as e:
                     _task_logger.error(f"Error creating relation: {e}")
                     continue
+
+            if source_key is not None:
+                self._link_document(graph, document, source_key, list(mentioned_ids))
             
         except Exception as e:
             logger.exception(f"Task id: {task_id} failed - {e}")
@@ -250,7 +292,9 @@ class ExtractDataStep(Step):
             with self.counter_lock:
                 self.process_files += 1
 
-    def _create_entity(self, graph: Graph, args: dict, ontology: Ontology) -> None:
+    def _create_entity(
+        self, graph: Graph, args: dict, ontology: Ontology, source_key: Optional[str] = None
+    ) -> None:
         """
         Create an entity in the graph based on the extracted data.
         
@@ -258,6 +302,7 @@ class ExtractDataStep(Step):
             graph (Graph): The graph instance to create the entity in.
             args (dict): The entity data extracted from the source.
             ontology (Ontology): The ontology to validate the entity type.
+            source_key (Optional[str]): Provenance key of the source mentioning the entity.
         """
         # Get unique attributes from entity
         entity = ontology.get_entity_with_label(args["label"])
@@ -271,6 +316,8 @@ class ExtractDataStep(Step):
             )
             for attr in unique_attributes_schema
         }
+        if self.entity_resolver is not None:
+            unique_attributes = self.entity_resolver.resolve(args["label"], unique_attributes)
         unique_attributes_text = map_dict_to_cypher_properties(unique_attributes)
         non_unique_attributes = {
             attr.name: args["attributes"][attr.name]
@@ -285,12 +332,21 @@ class ExtractDataStep(Step):
             if len(non_unique_attributes.keys()) > 0
             else ""
         )
-        query = f"MERGE (n:{args['label']} {unique_attributes_text}) {set_statement}"
+        embedding = (
+            self.embed(entity_text(args["label"], {**unique_attributes, **non_unique_attributes}))
+            if self.embed is not None
+            else None
+        )
+        # The sources are recorded when the document is linked
+        provenance_statement = _on_create_provenance_statement("n") if source_key is not None else ""
+        query = f"MERGE (n:{args['label']} {unique_attributes_text}) {provenance_statement} {set_statement} {embedding_set_statement('n', embedding)} RETURN ID(n)"
         logger.debug(f"Query: {query}")
-        result = graph.query(query)
+        result = graph.query(query, {"embedding": embedding} if embedding is not None else None)
         return result
 
-    def _create_relation(self, graph: Graph, args: dict, ontology: Ontology) -> None:
+    def _create_relation(
+        self, graph: Graph, args: dict, ontology: Ontology, source_key: Optional[str] = None
+    ) -> None:
         """
         Create a relation in the graph based on the extracted data.
         
@@ -298,6 +354,7 @@ class ExtractDataStep(Step):
             graph (Graph): The graph instance to create the relation in.
             args (dict): The relation data extracted from the source.
             ontology (Ontology): The ontology to validate the relation type.
+            source_key (Optional[str]): Provenance key of the source supporting the relation.
         """
         relations = ontology.get_relations_with_label(args["label"])
         if len(relations) == 0:
@@ -308,6 +365,8 @@ class ExtractDataStep(Step):
             if "source" in args and "attributes" in args["source"]
             else {}
         )
+        if self.entity_resolver is not None:
+            source_unique_attributes = self.entity_resolver.lookup(args["source"]["label"], source_unique_attributes)
         source_unique_attributes_text = map_dict_to_cypher_properties(
             source_unique_attributes
         )
@@ -317,6 +376,8 @@ class ExtractDataStep(Step):
             if "target" in args and "attributes" in args["target"]
             else {}
         )
+        if self.entity_resolver is not None:
+            target_unique_attributes = self.entity_resolver.lookup(args["target"]["label"], target_unique_attributes)
         target_unique_attributes_text = map_dict_to_cypher_properties(
             target_unique_attributes
         )
@@ -337,11 +398,51 @@ class ExtractDataStep(Step):
             > 0
             else ""
         )
-        query = f"MATCH (s:{args['source']['label']} {source_unique_attributes_text}) MATCH (d:{args['target']['label']} {target_unique_attributes_text}) MERGE (s)-[r:{args['label']}]->(d) {set_statement}"
+        on_create_statement = ""
+        provenance_statement = ""
+        params = None
+        if source_key is not None:
+            on_create_statement = _on_create_provenance_statement("r")
+            provenance_statement = _add_source_statement("r")
+            params = {"source_key": source_key}
+        query = f"MATCH (s:{args['source']['label']} {source_unique_attributes_text}) MATCH (d:{args['target']['label']} {target_unique_attributes_text}) MERGE (s)-[r:{args['label']}]->(d) {on_create_statement} {set_statement} {provenance_statement} RETURN ID(s), ID(d)"
         logger.debug(f"Query: {query}")
-        result = graph.query(query)
+        result = graph.query(query, params)
         return result
 
+    def _link_document(
+        self, graph: Graph, document: Document, source_key: str, node_ids: list[int]
+    ) -> None:
+        """
+        Link a document to every node it mentions using a single batched query, and add its source
+        to the sources of these nodes.
+
+        Args:
+            graph (Graph): The graph instance to create the links in.
+            document (Document): The processed document.
+            source_key (str): Provenance key of the document's source.
+            node_ids (list[int]): IDs of the nodes mentioned by the document.
+        """
+        content_hash = hashlib.sha256(document.content.encode("utf-8")).hexdigest()
+        query = (
+            f"MERGE (d:{PROVENANCE_DOCUMENT_LABEL} {{source: $source_key, id: $id}}) "
+            "SET d.hash = $hash "
+            "WITH d UNWIND $node_ids AS node_id "
+            "MATCH (n) WHERE ID(n) = node_id "
+            f"MERGE (d)-[:{PROVENANCE_MENTIONS_RELATION}]->(n) "
+            f"{_add_source_statement('n')}"
+        )
+        logger.debug(f"Query: {query}")
+        graph.query(
+            query,
+            {
+                "id": document.id if document.id is not None else content_hash,
+                "hash": content_hash,
+                "source_key": source_key,
+                "node_ids": node_ids,
+            },
+        )
+
     @sleep_and_retry
     @limits(calls=15, period=60)
     def _call_model(
@@ -376,3 +477,30 @@ class ExtractDataStep(Step):
                 if retry == 0:
                     logger.error("Quota exceeded")
                 raise e
+
+
+def _on_create_provenance_statement(variable: str) -> str:
+    return f"ON CREATE SET {variable}.{PROVENANCE_SOURCES_KEY} = []"
+
+
+def _add_source_statement(variable: str) -> str:
+    # Append the source once, the elements without sources predate the provenance tracking
+    sources = f"{variable}.{PROVENANCE_SOURCES_KEY}"
+    return (
+        f"SET {sources} = CASE "
+        f"WHEN {sources} IS NULL OR $source_key IN {sources} THEN {sources} "
+        f"ELSE {sources} + [$source_key] END"
+    )
+
+
+def get_source_key(source: AbstractSource) -> str:
+    """
+    Compute the provenance key identifying a source in the graph.
+
+    Args:
+        source (AbstractSource): The source to identify.
+
+    Returns:
+        str: A stable hash of the source's data source.
+    """
+    return hashlib.sha256(str(source.data_source).encode("utf-8")).hexdigest()
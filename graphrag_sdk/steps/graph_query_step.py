@@ -1,13 +1,26 @@
+import copy
+import time
+import asyncio
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from falkordb import Graph
-from typing import Optional
+from typing import Optional, Union
 from graphrag_sdk.steps.Step import Step
 from graphrag_sdk.ontology import Ontology
+from graphrag_sdk.query_policy import QueryPolicy
+from graphrag_sdk.fulltext import rewrite_contains_to_fulltext
+from graphrag_sdk.retry_policy import RetryPolicy
+from graphrag_sdk.cache import CypherCache, QueryResultCache
+from graphrag_sdk.context_builder import ContextBuilder
+from graphrag_sdk.fixtures.prompts import CYPHER_GEN_PROMPT_WITH_ERROR
 from graphrag_sdk.models import (
+    FinishReason,
+    GenerationResponse,
     GenerativeModelChatSession,
 )
 from graphrag_sdk.helpers import (
     extract_cypher,
+    cypher_block_closed,
     validate_cypher,
     stringify_falkordb_response,
 )
@@ -15,6 +28,8 @@ from graphrag_sdk.helpers import (
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+DEFAULT_RETRIES = 10
+
 
 class GraphQueryGenerationStep(Step):
     """
@@ -30,6 +45,17 @@ class GraphQueryGenerationStep(Step):
         last_answer: Optional[str] = None,
         cypher_prompt: Optional[str] = None,
         cypher_prompt_with_history: Optional[str] = None,
+        cypher_cache: Optional[CypherCache] = None,
+        ontology_version: Optional[str] = None,
+        result_cache: Optional[QueryResultCache] = None,
+        context_builder: Optional[ContextBuilder] = None,
+        query_policy: Optional[QueryPolicy] = None,
+        cypher_prompt_with_error: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        escalation_chat_session: Optional[GenerativeModelChatSession] = None,
+        candidate_chat_sessions: Optional[list[GenerativeModelChatSession]] = None,
+        stream_cypher: bool = False,
+        fulltext_search: bool = False,
     ) -> None:
         """
         Initializes the GraphQueryGenerationStep object.
@@ -42,6 +68,23 @@ class GraphQueryGenerationStep(Step):
             last_answer (Optional[str]): The last answer.
             cypher_prompt (Optional[str]): The Cypher prompt.
             cypher_prompt_with_history (Optional[str]): The Cypher prompt with history.
+            cypher_cache (Optional[CypherCache]): Cache of the Cypher statements generated for questions.
+            ontology_version (Optional[str]): The version of the ontology and prompts scoping the cached statements.
+            result_cache (Optional[QueryResultCache]): Cache of the contexts produced by Cypher statements.
+            context_builder (Optional[ContextBuilder]): Renders query results into a budgeted context.
+            query_policy (Optional[QueryPolicy]): Safety policy bounding the executed queries.
+            cypher_prompt_with_error (Optional[str]): The Cypher prompt sent after a failed attempt,
+                with {error}, {cypher} and {question} placeholders.
+            retry_policy (Optional[RetryPolicy]): Retry strategy of the generation. Defaults to 10 attempts.
+            escalation_chat_session (Optional[GenerativeModelChatSession]): Chat session with the escalation model
+                of the retry policy.
+            candidate_chat_sessions (Optional[list[GenerativeModelChatSession]]): New chat sessions, possibly with
+                different models, generating Cypher candidates in parallel. The first valid candidate returning rows
+                is used, falling back to the retries of `chat_session` when every candidate fails.
+            stream_cypher (bool): Stream the Cypher generation and execute the statement as soon as its fenced block
+                closes, without waiting for the end of the response.
+            fulltext_search (bool): Execute the CONTAINS filters on searchable attributes through their full-text
+                indexes, which must exist.
         """
         self.ontology = ontology
         self.config = config or {}
@@ -50,54 +93,590 @@ class GraphQueryGenerationStep(Step):
         self.last_answer = last_answer
         self.cypher_prompt = cypher_prompt
         self.cypher_prompt_with_history = cypher_prompt_with_history
+        self.cypher_cache = cypher_cache
+        self.ontology_version = ontology_version
+        self.result_cache = result_cache
+        self.context_builder = context_builder
+        self.query_policy = query_policy
+        self.cypher_prompt_with_error = cypher_prompt_with_error or CYPHER_GEN_PROMPT_WITH_ERROR
+        self.retry_policy = retry_policy
+        self.escalation_chat_session = escalation_chat_session
+        self.candidate_chat_sessions = candidate_chat_sessions
+        self.stream_cypher = stream_cypher
+        self.fulltext_search = fulltext_search
+        self.cache_hit = False
+        self.attempts = []
+        self.context_stats = None
+        self.result_rows = None
+        self.candidate_index = None
+        # Seconds spent per stage, over all the attempts
+        self.timings = {"generation": 0.0, "validation": 0.0, "execution": 0.0}
 
-    def run(self, question: str, retries: Optional[int] = 10) -> tuple[Optional[str], Optional[str], Optional[int]]:
+    def run(self, question: str, retries: Optional[int] = None) -> tuple[Optional[str], Optional[str], Optional[int]]:
         """
         Run the step to generate and validate a Cypher query.
         
         Args:
             question (str): The question being asked to generate the query.
-            retries (Optional[int]): Number of retries allowed in case of errors.
+            retries (Optional[int]): Number of attempts allowed, overrides the retry policy.
             
         Returns:
             tuple[Optional[str], Optional[str], Optional[int]]: The context, the generated Cypher query and the query execution time.
         """
-        cypher = ""
-        for i in range(retries):
+        cypher = self._cached_cypher(question)
+        if cypher is not None:
             try:
-                cypher_prompt = (
-                    (self.cypher_prompt.format(question=question) 
-                    if self.last_answer is None
-                    else self.cypher_prompt_with_history.format(question=question, last_answer=self.last_answer))
-                )   
-                logger.debug(f"Cypher Prompt: {cypher_prompt}")
-                cypher_statement_response = self.chat_session.send_message(
-                    cypher_prompt,
-                )
-                logger.debug(f"Cypher Statement Response: {cypher_statement_response}")
-                cypher = extract_cypher(cypher_statement_response.text)
-                logger.debug(f"Cypher: {cypher}")
+                (context, execution_time) = self._execute_cypher(cypher)
+                self.cache_hit = True
+                return (context, cypher, execution_time)
+            except Exception as e:
+                self._drop_cached_cypher(question, e)
+
+        if self.candidate_chat_sessions:
+            result = self._run_candidates(question)
+            if result is not None:
+                return result
 
+        (retry_policy, max_attempts) = self._retry_settings(retries)
+        started_at = time.monotonic()
+        # Exchanges of this question kept in each chat session history
+        kept_exchanges = {}
+        error = None
+        failed_cypher = None
+        for attempt in range(max_attempts):
+            if attempt > 0 and retry_policy.expired(started_at):
+                logger.debug(f"Cypher generation deadline reached after {attempt} attempts")
+                break
+
+            (escalated, chat_session) = self._chat_session_for(retry_policy, attempt)
+            stage = "generation"
+            attempt_started_at = time.monotonic()
+            cypher = None
+            try:
+                cypher_prompt = self._cypher_prompt(question, error, failed_cypher, chat_session, kept_exchanges)
+                cypher_statement_response = self._generate(chat_session, cypher_prompt)
+                cypher = self._extract_cypher(cypher_statement_response, chat_session, kept_exchanges)
                 if not cypher or len(cypher) == 0:
+                    self._record_attempt(attempt, escalated, stage, attempt_started_at)
+                    if attempt > 0 or escalated:
+                        self._forget_all_exchanges(kept_exchanges)
                     return (None, None, None)
 
-                validation_errors = validate_cypher(cypher, self.ontology)
-                if validation_errors is not None:
-                    raise Exception("\n".join(validation_errors))
+                stage = "validation"
+                stage_started_at = time.monotonic()
+                self._validate_cypher(cypher)
+                if self.query_policy is not None:
+                    _raise_errors(self.query_policy.validate(self.graph, self._executed_cypher(cypher)))
+                self._add_timing(stage, stage_started_at)
+
+                stage = "execution"
+                (context, execution_time) = self._execute_cypher(cypher)
+                self._on_success(
+                    question, cypher, cypher_statement_response, attempt, escalated, attempt_started_at, kept_exchanges
+                )
+                return (context, cypher, execution_time)
+            except Exception as e:
+                error = self._on_failure(e, attempt, escalated, stage, attempt_started_at, chat_session, kept_exchanges)
+                failed_cypher = cypher
+
+        self._forget_all_exchanges(kept_exchanges)
+        raise Exception("Failed to generate Cypher query: " + str(error))
+
+    async def arun(self, question: str, retries: Optional[int] = None) -> tuple[Optional[str], Optional[str], Optional[int]]:
+        """
+        Run the step asynchronously, the graph must be an asynchronous FalkorDB graph.
+
+        Args:
+            question (str): The question being asked to generate the query.
+            retries (Optional[int]): Number of attempts allowed, overrides the retry policy.
+
+        Returns:
+            tuple[Optional[str], Optional[str], Optional[int]]: The context, the generated Cypher query and the query execution time.
+        """
+        cypher = self._cached_cypher(question)
+        if cypher is not None:
+            try:
+                (context, execution_time) = await self._aexecute_cypher(cypher)
+                self.cache_hit = True
+                return (context, cypher, execution_time)
+            except Exception as e:
+                self._drop_cached_cypher(question, e)
+
+        if self.candidate_chat_sessions:
+            result = await self._arun_candidates(question)
+            if result is not None:
+                return result
+
+        (retry_policy, max_attempts) = self._retry_settings(retries)
+        started_at = time.monotonic()
+        kept_exchanges = {}
+        error = None
+        failed_cypher = None
+        for attempt in range(max_attempts):
+            if attempt > 0 and retry_policy.expired(started_at):
+                logger.debug(f"Cypher generation deadline reached after {attempt} attempts")
+                break
 
-                if cypher is not None:
-                    query_result = self.graph.query(cypher)
-                    result_set = query_result.result_set
-                    execution_time = query_result.run_time_ms
-                    context = stringify_falkordb_response(result_set)
-                    logger.debug(f"Context: {context}")
-                    logger.debug(f"Context size: {len(result_set)}")
-                    logger.debug(f"Context characters: {len(str(context))}")
+            (escalated, chat_session) = self._chat_session_for(retry_policy, attempt)
+            stage = "generation"
+            attempt_started_at = time.monotonic()
+            cypher = None
+            try:
+                cypher_prompt = self._cypher_prompt(question, error, failed_cypher, chat_session, kept_exchanges)
+                cypher_statement_response = await self._agenerate(chat_session, cypher_prompt)
+                cypher = self._extract_cypher(cypher_statement_response, chat_session, kept_exchanges)
+                if not cypher or len(cypher) == 0:
+                    self._record_attempt(attempt, escalated, stage, attempt_started_at)
+                    if attempt > 0 or escalated:
+                        self._forget_all_exchanges(kept_exchanges)
+                    return (None, None, None)
+
+                stage = "validation"
+                stage_started_at = time.monotonic()
+                self._validate_cypher(cypher)
+                if self.query_policy is not None:
+                    _raise_errors(await self.query_policy.avalidate(self.graph, self._executed_cypher(cypher)))
+                self._add_timing(stage, stage_started_at)
 
-                    return (context, cypher, execution_time)
+                stage = "execution"
+                (context, execution_time) = await self._aexecute_cypher(cypher)
+                self._on_success(
+                    question, cypher, cypher_statement_response, attempt, escalated, attempt_started_at, kept_exchanges
+                )
+                return (context, cypher, execution_time)
             except Exception as e:
-                logger.debug(f"Error: {e}")
-                error = e
-                self.chat_session.delete_last_message()
+                error = self._on_failure(e, attempt, escalated, stage, attempt_started_at, chat_session, kept_exchanges)
+                failed_cypher = cypher
 
+        self._forget_all_exchanges(kept_exchanges)
         raise Exception("Failed to generate Cypher query: " + str(error))
+
+    def _run_candidates(self, question: str) -> Optional[tuple[Optional[str], str, Optional[int]]]:
+        """
+        Generate, validate and execute the Cypher candidates in parallel threads.
+
+        Args:
+            question (str): The question being asked to generate the query.
+
+        Returns:
+            Optional[tuple[Optional[str], str, Optional[int]]]: The result of the first valid candidate returning rows,
+                or of the first valid candidate if none returns rows, or None if every candidate failed.
+        """
+        candidates = self._candidate_steps()
+        executor = ThreadPoolExecutor(max_workers=len(candidates))
+        try:
+            futures = {executor.submit(candidate.run, question): candidate for candidate in candidates}
+            fallback = None
+            for future in as_completed(futures):
+                candidate = futures[future]
+                result = self._candidate_result(candidate, future)
+                if result is None:
+                    continue
+                if candidate.result_rows != 0:
+                    return self._on_candidate_success(question, candidate, result)
+                fallback = fallback or (candidate, result)
+            return self._on_candidate_success(question, *fallback) if fallback is not None else None
+        finally:
+            # The slower candidates are not awaited, they only update their own step and chat session
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _arun_candidates(self, question: str) -> Optional[tuple[Optional[str], str, Optional[int]]]:
+        """
+        Generate, validate and execute the Cypher candidates concurrently, cancelling the slower ones.
+
+        Args:
+            question (str): The question being asked to generate the query.
+
+        Returns:
+            Optional[tuple[Optional[str], str, Optional[int]]]: The result of the first valid candidate returning rows,
+                or of the first valid candidate if none returns rows, or None if every candidate failed.
+        """
+        candidates = self._candidate_steps()
+        tasks = {asyncio.ensure_future(candidate.arun(question)): candidate for candidate in candidates}
+        pending = set(tasks)
+        try:
+            fallback = None
+            while len(pending) > 0:
+                (done, pending) = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    candidate = tasks[task]
+                    result = self._candidate_result(candidate, task)
+                    if result is None:
+                        continue
+                    if candidate.result_rows != 0:
+                        return self._on_candidate_success(question, candidate, result)
+                    fallback = fallback or (candidate, result)
+            return self._on_candidate_success(question, *fallback) if fallback is not None else None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _candidate_steps(self) -> list["GraphQueryGenerationStep"]:
+        """
+        Create a single-attempt step per candidate chat session, sharing the graph and the result cache.
+        """
+        candidates = []
+        for (index, chat_session) in enumerate(self.candidate_chat_sessions):
+            candidate = copy.copy(self)
+            candidate.chat_session = chat_session
+            candidate.escalation_chat_session = None
+            candidate.candidate_chat_sessions = None
+            # The Cypher of the selected candidate only is cached
+            candidate.cypher_cache = None
+            candidate.retry_policy = RetryPolicy(1)
+            # The context builders hold the statistics of their last build
+            candidate.context_builder = copy.copy(self.context_builder)
+            candidate.attempts = []
+            candidate.timings = dict.fromkeys(self.timings, 0.0)
+            candidate.candidate_index = index
+            candidates.append(candidate)
+        return candidates
+
+    def _candidate_result(
+        self, candidate: "GraphQueryGenerationStep", future: Union[Future, asyncio.Task]
+    ) -> Optional[tuple[Optional[str], str, Optional[int]]]:
+        for attempt in candidate.attempts:
+            self.attempts.append({**attempt, "candidate": candidate.candidate_index})
+
+        if future.exception() is not None:
+            logger.debug(f"Cypher candidate {candidate.candidate_index} failed: {future.exception()}")
+            return None
+
+        (context, cypher, execution_time) = future.result()
+        if not cypher:
+            return None
+        return (context, cypher, execution_time)
+
+    def _on_candidate_success(
+        self,
+        question: str,
+        candidate: "GraphQueryGenerationStep",
+        result: tuple[Optional[str], str, Optional[int]],
+    ) -> tuple[Optional[str], str, Optional[int]]:
+        logger.debug(f"Cypher candidate {candidate.candidate_index} selected")
+        self.context_stats = candidate.context_stats
+        self.result_rows = candidate.result_rows
+        for (stage, duration) in candidate.timings.items():
+            self.timings[stage] += duration
+        if self.cypher_cache is not None:
+            self.cypher_cache.set_cypher(question, self.ontology_version, result[1], self.last_answer)
+        return result
+
+    def _generate(self, chat_session: GenerativeModelChatSession, cypher_prompt: str) -> GenerationResponse:
+        """
+        Generate a Cypher statement, streaming it when `stream_cypher` is set.
+
+        Args:
+            chat_session (GenerativeModelChatSession): The chat session generating the statement.
+            cypher_prompt (str): The Cypher prompt.
+
+        Returns:
+            GenerationResponse: The generated response, cut after the fenced Cypher block when streamed.
+        """
+        started_at = time.monotonic()
+        try:
+            if not self.stream_cypher:
+                return chat_session.send_message(cypher_prompt)
+
+            text = ""
+            stream = chat_session.send_message_stream(cypher_prompt)
+            try:
+                for chunk in stream:
+                    text += chunk
+                    if cypher_block_closed(text):
+                        break
+            finally:
+                # Closing the stream stops the generation, the statement is complete
+                if hasattr(stream, "close"):
+                    stream.close()
+            return GenerationResponse(text=text, finish_reason=FinishReason.STOP)
+        finally:
+            self._add_timing("generation", started_at)
+
+    async def _agenerate(self, chat_session: GenerativeModelChatSession, cypher_prompt: str) -> GenerationResponse:
+        """
+        Generate a Cypher statement without blocking the event loop, streaming it when `stream_cypher` is set.
+
+        Args:
+            chat_session (GenerativeModelChatSession): The chat session generating the statement.
+            cypher_prompt (str): The Cypher prompt.
+
+        Returns:
+            GenerationResponse: The generated response, cut after the fenced Cypher block when streamed.
+        """
+        started_at = time.monotonic()
+        try:
+            if not self.stream_cypher:
+                return await chat_session.asend_message(cypher_prompt)
+
+            text = ""
+            stream = chat_session.asend_message_stream(cypher_prompt)
+            try:
+                async for chunk in stream:
+                    text += chunk
+                    if cypher_block_closed(text):
+                        break
+            finally:
+                if hasattr(stream, "aclose"):
+                    await stream.aclose()
+            return GenerationResponse(text=text, finish_reason=FinishReason.STOP)
+        finally:
+            self._add_timing("generation", started_at)
+
+    def _add_timing(self, stage: str, started_at: float) -> None:
+        self.timings[stage] += time.monotonic() - started_at
+
+    def _cached_cypher(self, question: str) -> Optional[str]:
+        if self.cypher_cache is None:
+            return None
+        cypher = self.cypher_cache.get_cypher(question, self.ontology_version, self.last_answer)
+        if cypher is not None:
+            logger.debug(f"Cached Cypher: {cypher}")
+        return cypher
+
+    def _drop_cached_cypher(self, question: str, error: Exception) -> None:
+        logger.debug(f"Cached Cypher failed: {error}")
+        self.cypher_cache.delete_cypher(question, self.ontology_version, self.last_answer)
+
+    def _retry_settings(self, retries: Optional[int]) -> tuple[RetryPolicy, int]:
+        retry_policy = self.retry_policy or RetryPolicy(DEFAULT_RETRIES)
+        return (retry_policy, retries or retry_policy.max_attempts)
+
+    def _chat_session_for(self, retry_policy: RetryPolicy, attempt: int) -> tuple[bool, GenerativeModelChatSession]:
+        escalated = (
+            self.escalation_chat_session is not None
+            and retry_policy.should_escalate(attempt)
+        )
+        return (escalated, self.escalation_chat_session if escalated else self.chat_session)
+
+    def _cypher_prompt(
+        self,
+        question: str,
+        error: Optional[Exception],
+        failed_cypher: Optional[str],
+        chat_session: GenerativeModelChatSession,
+        kept_exchanges: dict,
+    ) -> str:
+        if kept_exchanges.get(id(chat_session), 0) == 0:
+            cypher_prompt = self._question_prompt(question)
+        else:
+            # Only the first failed exchange is kept in the history, the error prompt names the statement it is about
+            cypher_prompt = self.cypher_prompt_with_error.format(
+                error=error, cypher=failed_cypher or "", question=question
+            )
+        logger.debug(f"Cypher Prompt: {cypher_prompt}")
+        return cypher_prompt
+
+    def _question_prompt(self, question: str) -> str:
+        return (
+            self.cypher_prompt.format(question=question)
+            if self.last_answer is None
+            else self.cypher_prompt_with_history.format(question=question, last_answer=self.last_answer)
+        )
+
+    def _extract_cypher(
+        self,
+        cypher_statement_response: GenerationResponse,
+        chat_session: GenerativeModelChatSession,
+        kept_exchanges: dict,
+    ) -> str:
+        kept_exchanges[id(chat_session)] = kept_exchanges.get(id(chat_session), 0) + 1
+        logger.debug(f"Cypher Statement Response: {cypher_statement_response}")
+        cypher = extract_cypher(cypher_statement_response.text)
+        logger.debug(f"Cypher: {cypher}")
+        return cypher
+
+    def _validate_cypher(self, cypher: str) -> None:
+        _raise_errors(validate_cypher(cypher, self.ontology))
+
+    def _on_success(
+        self,
+        question: str,
+        cypher: str,
+        response: GenerationResponse,
+        attempt: int,
+        escalated: bool,
+        started_at: float,
+        kept_exchanges: dict,
+    ) -> None:
+        self._record_attempt(attempt, escalated, "execution", started_at)
+
+        if self.cypher_cache is not None:
+            self.cypher_cache.set_cypher(question, self.ontology_version, cypher, self.last_answer)
+
+        if attempt > 0 or escalated:
+            # The main session history keeps no trace of the failed attempts, only the question and its statement
+            kept = kept_exchanges.pop(id(self.chat_session), 0)
+            history = self.chat_session.get_chat_history()
+            try:
+                self.chat_session.set_chat_history(
+                    history[:len(history) - 2 * kept]
+                    + [
+                        {"role": "user", "content": self._question_prompt(question)},
+                        {"role": "assistant", "content": response.text},
+                    ]
+                )
+            except NotImplementedError:
+                # The valid statement is still used, the session keeps the exchanges of the failed attempts
+                logger.debug("The chat session cannot replace its history, the failed attempts are kept")
+            self._forget_all_exchanges(kept_exchanges)
+
+    def _on_failure(
+        self,
+        error: Exception,
+        attempt: int,
+        escalated: bool,
+        stage: str,
+        started_at: float,
+        chat_session: GenerativeModelChatSession,
+        kept_exchanges: dict,
+    ) -> Exception:
+        logger.debug(f"Error: {error}")
+        self._record_attempt(attempt, escalated, stage, started_at, error)
+        if kept_exchanges.get(id(chat_session), 0) > 1:
+            # Only the first failed statement and the latest attempt are kept in the history
+            chat_session.delete_last_message()
+            kept_exchanges[id(chat_session)] -= 1
+        return error
+
+    def _record_attempt(
+        self,
+        attempt: int,
+        escalated: bool,
+        stage: str,
+        started_at: float,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """
+        Records the metrics of a generation attempt.
+
+        Args:
+            attempt (int): The attempt index.
+            escalated (bool): Whether the escalation model was used.
+            stage (str): The last stage reached: generation, validation or execution.
+            started_at (float): The `time.monotonic()` at which the attempt started.
+            error (Optional[Exception]): The error which failed the attempt.
+        """
+        self.attempts.append({
+            "attempt": attempt + 1,
+            "escalated": escalated,
+            "stage": stage,
+            "duration": time.monotonic() - started_at,
+            "error": str(error) if error is not None else None,
+        })
+
+    def _forget_all_exchanges(self, kept_exchanges: dict) -> None:
+        # Remove the exchanges of this question from the chat session histories
+        for chat_session in (self.chat_session, self.escalation_chat_session):
+            if chat_session is None:
+                continue
+            for _ in range(kept_exchanges.pop(id(chat_session), 0)):
+                chat_session.delete_last_message()
+
+    def _execute_cypher(self, cypher: str) -> tuple[str, int]:
+        """
+        Execute a Cypher query and stringify its result, using the result cache when available.
+
+        Args:
+            cypher (str): The Cypher query to execute.
+
+        Returns:
+            tuple[str, int]: The context and the query execution time.
+        """
+        started_at = time.monotonic()
+        try:
+            executed_cypher = self._executed_cypher(cypher)
+            (context_key, graph_version, cached_result) = self._cached_result(executed_cypher)
+            if cached_result is not None:
+                return self._restore_context(cached_result)
+
+            query_result = (
+                self.query_policy.execute(self.graph, executed_cypher)
+                if self.query_policy is not None
+                else self.graph.query(executed_cypher)
+            )
+            return self._build_context(executed_cypher, context_key, graph_version, query_result)
+        finally:
+            self._add_timing("execution", started_at)
+
+    async def _aexecute_cypher(self, cypher: str) -> tuple[str, int]:
+        """
+        Execute a Cypher query on an asynchronous graph and stringify its result.
+
+        Args:
+            cypher (str): The Cypher query to execute.
+
+        Returns:
+            tuple[str, int]: The context and the query execution time.
+        """
+        started_at = time.monotonic()
+        try:
+            executed_cypher = self._executed_cypher(cypher)
+            (context_key, graph_version, cached_result) = self._cached_result(executed_cypher)
+            if cached_result is not None:
+                return self._restore_context(cached_result)
+
+            query_result = (
+                await self.query_policy.aexecute(self.graph, executed_cypher)
+                if self.query_policy is not None
+                else await self.graph.query(executed_cypher)
+            )
+            return self._build_context(executed_cypher, context_key, graph_version, query_result)
+        finally:
+            self._add_timing("execution", started_at)
+
+    def _executed_cypher(self, cypher: str) -> str:
+        # The statement validated, executed and cached, with the full-text lookups of the CONTAINS filters
+        if not self.fulltext_search:
+            return cypher
+        return rewrite_contains_to_fulltext(cypher, self.ontology)
+
+    def _cached_result(
+        self, cypher: str
+    ) -> tuple[Optional[tuple], Optional[int], Optional[tuple]]:
+        context_key = (
+            self.context_builder.cache_key() if self.context_builder is not None else None
+        )
+        if self.result_cache is None:
+            return (context_key, None, None)
+
+        # The version the query runs at, a result computed before a write must not be stored after it
+        graph_version = self.result_cache.graph_version
+        cached_result = self.result_cache.get_result(cypher, context_key)
+        if cached_result is not None:
+            logger.debug("Context served from the result cache")
+        return (context_key, graph_version, cached_result)
+
+    def _restore_context(self, cached_result: tuple) -> tuple[str, int]:
+        (context, execution_time, self.result_rows, self.context_stats) = cached_result
+        return (context, execution_time)
+
+    def _build_context(
+        self, cypher: str, context_key: Optional[tuple], graph_version: Optional[int], query_result
+    ) -> tuple[str, int]:
+        result_set = query_result.result_set
+        execution_time = query_result.run_time_ms
+        self.result_rows = len(result_set)
+        if self.context_builder is not None:
+            context = self.context_builder.build(
+                result_set, [column[1] for column in query_result.header]
+            )
+            self.context_stats = self.context_builder.stats
+        else:
+            context = stringify_falkordb_response(result_set)
+            self.context_stats = None
+        logger.debug(f"Context: {context}")
+        logger.debug(f"Context size: {len(result_set)}")
+        logger.debug(f"Context characters: {len(str(context))}")
+
+        if self.result_cache is not None:
+            self.result_cache.set_result(
+                cypher, context, execution_time, context_key, graph_version, self.result_rows, self.context_stats
+            )
+
+        return (context, execution_time)
+
+
+def _raise_errors(errors: Optional[list[str]]) -> None:
+    if errors is not None:
+        raise Exception("\n".join(errors))
@@ -50,3 +50,24 @@ class QAStep(Step):
         qa_response = self.chat_session.send_message(qa_prompt)
 
         return qa_response.text
+
+    async def arun(self, question: str, cypher: str, context: str) -> str:
+        """
+        Run the QA step without blocking the event loop.
+
+        Args:
+            question (str): The question being asked.
+            cypher (str): The Cypher query to run.
+            context (str): Context for the QA.
+
+        Returns:
+            str: The response from the QA session.
+        """
+        qa_prompt = self.qa_prompt.format(
+            context=context, cypher=cypher, question=question
+        )
+
+        logger.debug(f"QA Prompt: {qa_prompt}")
+        qa_response = await self.chat_session.asend_message(qa_prompt)
+
+        return qa_response.text
@@ -1,5 +1,5 @@
 import logging
-from typing import Optional, Iterator
+from typing import Optional, Iterator, AsyncIterator
 from graphrag_sdk.steps.Step import Step
 from graphrag_sdk.models import GenerativeModelChatSession
 
@@ -48,4 +48,23 @@ class StreamingQAStep(Step):
         logger.debug(f"QA Prompt: {qa_prompt}")
         # Send the message and stream the response
         for chunk in self.chat_session.send_message_stream(qa_prompt):
-            yield chunk
\ No newline at end of file
+            yield chunk
+
+    async def arun(self, question: str, cypher: str, context: str) -> AsyncIterator[str]:
+        """
+        Run the QA step and stream the response chunks without blocking the event loop.
+
+        Args:
+            question (str): The question being asked.
+            cypher (str): The Cypher query to run.
+            context (str): Context for the QA.
+
+        Returns:
+            AsyncIterator[str]: An asynchronous generator that yields response chunks.
+        """
+        qa_prompt = self.qa_prompt.format(
+            context=context, cypher=cypher, question=question
+        )
+        logger.debug(f"QA Prompt: {qa_prompt}")
+        async for chunk in self.chat_session.asend_message_stream(qa_prompt):
+            yield chunk
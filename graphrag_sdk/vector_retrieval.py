@@ -0,0 +1,222 @@
+import asyncio
+import logging
+from falkordb import Graph
+from typing import Callable, Optional
+from redis.exceptions import ResponseError
+from falkordb.asyncio.graph import AsyncGraph
+from falkordb.query_result import QueryResult
+from graphrag_sdk.ontology import Ontology
+
+
+logger = logging.getLogger(__name__)
+
+# Node property holding the entity embedding, SDK internal properties are omitted from the QA contexts
+EMBEDDING_PROPERTY = "__embedding__"
+
+DEFAULT_SIMILARITY_FUNCTION = "cosine"
+DEFAULT_K = 5
+DEFAULT_HOPS = 1
+DEFAULT_LIMIT = 100
+
+# Retrieval modes of the chat sessions
+RETRIEVAL_CYPHER = "cypher"
+RETRIEVAL_VECTOR = "vector"
+RETRIEVAL_FALLBACK = "fallback"
+RETRIEVAL_HYBRID = "hybrid"
+RETRIEVAL_MODES = (RETRIEVAL_CYPHER, RETRIEVAL_VECTOR, RETRIEVAL_FALLBACK, RETRIEVAL_HYBRID)
+
+
+def entity_text(label: str, attributes: dict) -> str:
+    """
+    Renders an entity as the text embedded for the vector search.
+
+    Args:
+        label (str): The entity label.
+        attributes (dict): The entity attributes.
+
+    Returns:
+        str: The text to embed.
+    """
+    rendered = ", ".join(f"{name}: {value}" for (name, value) in attributes.items())
+    return f"{label} {rendered}".strip()
+
+
+def create_vector_indexes(
+    graph: Graph,
+    ontology: Ontology,
+    dimension: int,
+    similarity_function: str = DEFAULT_SIMILARITY_FUNCTION,
+) -> None:
+    """
+    Creates a vector index on the embeddings of every entity of the ontology, skipping the existing ones.
+
+    Args:
+        graph (Graph): The graph to index.
+        ontology (Ontology): The ontology of the graph.
+        dimension (int): The dimension of the embeddings.
+        similarity_function (str): The similarity function, "cosine" or "euclidean".
+    """
+    for entity in ontology.entities:
+        try:
+            graph.create_node_vector_index(
+                entity.label, EMBEDDING_PROPERTY, dim=dimension, similarity_function=similarity_function
+            )
+        except ResponseError as e:
+            if "already indexed" not in str(e):
+                raise
+            logger.debug(f"Vector index of {entity.label} already exists")
+
+
+class VectorRetriever:
+    """
+    Retrieves the context of a question without generating Cypher: the entities closest to the question
+    in the vector indexes are used as seeds, and expanded `hops` relationships away.
+
+    Requires entity embeddings, stored by the extraction when the knowledge graph has an `embed` function.
+
+    Args:
+        embed (Callable[[str], list[float]]): Function embedding a text, the one used during the extraction.
+        k (int): The number of seed nodes.
+        hops (int): The number of relationships followed from the seed nodes.
+        limit (int): The maximum number of rows returned.
+
+    Examples:
+        >>> from litellm import embedding
+        >>> embed = lambda text: embedding("openai/text-embedding-3-small", input=[text]).data[0]["embedding"]
+        >>> kg = KnowledgeGraph("test_kg", model_config, ontology, embed=embed)
+        >>> chat = kg.chat_session(retrieval_mode="fallback", vector_retriever=VectorRetriever(embed, k=10, hops=2))
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], list[float]],
+        k: int = DEFAULT_K,
+        hops: int = DEFAULT_HOPS,
+        limit: int = DEFAULT_LIMIT,
+    ):
+        """
+        Initializes a new VectorRetriever object.
+
+        Args:
+            embed (Callable[[str], list[float]]): Function embedding a text.
+            k (int): The number of seed nodes.
+            hops (int): The number of relationships followed from the seed nodes.
+            limit (int): The maximum number of rows returned.
+        """
+        if k < 1:
+            raise Exception("k should be at least 1")
+
+        self.embed = embed
+        self.k = k
+        self.hops = hops
+        self.limit = limit
+
+    def seed_query(self, label: str) -> str:
+        """
+        The k-nearest-neighbours query of an entity label, the closest nodes first.
+
+        Args:
+            label (str): The entity label.
+
+        Returns:
+            str: The Cypher query, with $k and $vector parameters.
+        """
+        return (
+            f"CALL db.idx.vector.queryNodes('{label}', '{EMBEDDING_PROPERTY}', $k, vecf32($vector)) "
+            f"YIELD node, score RETURN ID(node), score"
+        )
+
+    def expansion_query(self) -> str:
+        """
+        The query expanding the seed nodes, with an $ids parameter.
+
+        Returns:
+            str: The Cypher query.
+        """
+        if self.hops < 1:
+            return f"MATCH (n) WHERE ID(n) IN $ids RETURN n LIMIT {self.limit}"
+        return (
+            f"MATCH (n) WHERE ID(n) IN $ids "
+            f"OPTIONAL MATCH p = (n)-[*1..{self.hops}]-() "
+            f"RETURN n, p LIMIT {self.limit}"
+        )
+
+    def retrieve(self, graph: Graph, ontology: Ontology, question: str) -> tuple[QueryResult, str]:
+        """
+        Retrieves the nodes closest to a question and their neighbourhood.
+
+        Args:
+            graph (Graph): The graph to query.
+            ontology (Ontology): The ontology of the graph.
+            question (str): The question.
+
+        Returns:
+            tuple[QueryResult, str]: The query result and the expansion query.
+        """
+        params = {"k": self.k, "vector": self.embed(question)}
+        seeds = []
+        for entity in ontology.entities:
+            seeds.extend(_seeds(graph.ro_query(self.seed_query(entity.label), params)))
+
+        query = self.expansion_query()
+        return (graph.ro_query(query, {"ids": self._closest(seeds)}), query)
+
+    async def aretrieve(self, graph: AsyncGraph, ontology: Ontology, question: str) -> tuple[QueryResult, str]:
+        """
+        Retrieves the nodes closest to a question and their neighbourhood, querying the graph concurrently.
+
+        Args:
+            graph (AsyncGraph): The graph to query.
+            ontology (Ontology): The ontology of the graph.
+            question (str): The question.
+
+        Returns:
+            tuple[QueryResult, str]: The query result and the expansion query.
+        """
+        params = {"k": self.k, "vector": await asyncio.to_thread(self.embed, question)}
+        results = await asyncio.gather(
+            *(graph.ro_query(self.seed_query(entity.label), params) for entity in ontology.entities)
+        )
+        seeds = [seed for result in results for seed in _seeds(result)]
+
+        query = self.expansion_query()
+        return (await graph.ro_query(query, {"ids": self._closest(seeds)}), query)
+
+    def _closest(self, seeds: list[tuple[int, float]]) -> list[int]:
+        # The scores are distances, the lower the closer
+        return [node_id for (node_id, _) in sorted(seeds, key=lambda seed: seed[1])[: self.k]]
+
+
+def _seeds(result: QueryResult) -> list[tuple[int, float]]:
+    return [(row[0], row[1]) for row in result.result_set]
+
+
+def embedding_set_statement(variable: str, embedding: Optional[list[float]]) -> str:
+    """
+    The SET clause storing an entity embedding, passed as the $embedding parameter.
+
+    Args:
+        variable (str): The node variable.
+        embedding (Optional[list[float]]): The embedding, None to store nothing.
+
+    Returns:
+        str: The SET clause, empty without embedding.
+    """
+    if embedding is None:
+        return ""
+    return f"SET {variable}.{EMBEDDING_PROPERTY} = vecf32($embedding)"
+
+
+def is_vector_retrieval(retrieval_mode: str) -> bool:
+    """
+    Checks whether a retrieval mode uses the vector indexes.
+
+    Args:
+        retrieval_mode (str): The retrieval mode.
+
+    Returns:
+        bool: True if a vector retriever is required.
+    """
+    if retrieval_mode not in RETRIEVAL_MODES:
+        raise Exception(f"Unknown retrieval mode: {retrieval_mode}")
+    return retrieval_mode != RETRIEVAL_CYPHER
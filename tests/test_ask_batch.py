@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import MagicMock
+from graphrag_sdk import KnowledgeGraph, Ontology, Entity, Relation, Attribute, AttributeType
+from graphrag_sdk.schema_statistics import SchemaStatistics
+
+
+DIRECTED = "MATCH (p:Person)-[:DIRECTED]->(m:Movie) RETURN p.name"
+ACTED_IN = "MATCH (p:Person)-[:ACTED_IN]->(m:Movie) RETURN p.name"
+
+
+class TestAskBatch(unittest.TestCase):
+    """
+    Test answering a batch of questions in parallel
+    """
+
+    def setUp(self):
+        ontology = Ontology(
+            [
+                Entity("Person", [Attribute("name", AttributeType.STRING, True)]),
+                Entity("Movie", [Attribute("title", AttributeType.STRING, True)]),
+            ],
+            [Relation("DIRECTED", "Person", "Movie"), Relation("ACTED_IN", "Person", "Movie")],
+        )
+        self.model_config = MagicMock()
+        self.model_config.cypher_generation.start_chat.return_value.send_message.side_effect = self.generate_cypher
+        self.model_config.qa.start_chat.return_value.send_message.side_effect = (
+            lambda prompt: MagicMock(text=f"Answer: {prompt}")
+        )
+        db = MagicMock()
+        self.graph = db.select_graph.return_value
+        self.graph.ro_query.side_effect = self.ro_query
+        self.kg = KnowledgeGraph(
+            "test_kg", self.model_config, ontology, db=db,
+            cypher_gen_prompt="{question}", qa_prompt="{question} {cypher} {context}",
+            schema_statistics=SchemaStatistics(),
+        )
+
+    def generate_cypher(self, prompt):
+        if "directed" in prompt:
+            return MagicMock(text=DIRECTED)
+        if "acted" in prompt:
+            return MagicMock(text=ACTED_IN)
+        raise Exception("Model unavailable")
+
+    def ro_query(self, q, params=None, timeout=None):
+        if "DIRECTED" in q:
+            return MagicMock(result_set=[["Lana Wachowski"]], run_time_ms=1.0)
+        if "ACTED_IN" in q:
+            return MagicMock(result_set=[["Keanu Reeves"]], run_time_ms=1.0)
+        # Schema statistics
+        return MagicMock(result_set=[[1]], run_time_ms=1.0)
+
+    def test_batch(self):
+        questions = ["Who directed The Matrix?", "Who acted in The Matrix?", "Who directed Matrix?", "Why?"]
+
+        report = self.kg.ask_batch(questions, concurrency=4)
+
+        results = report["results"]
+        assert [result["question"] for result in results] == questions
+        assert "Lana Wachowski" in results[0]["response"]
+        assert "Keanu Reeves" in results[1]["response"]
+        assert results[2]["cypher"] == DIRECTED
+        # A failed question does not fail the others
+        assert results[3]["error"] is not None
+        assert all(result["error"] is None for result in results[:3])
+
+        stats = report["stats"]
+        assert (stats["questions"], stats["failed"]) == (4, 1)
+        assert (stats["queries_executed"], stats["queries_deduplicated"]) == (2, 1)
+
+    def test_setup_once(self):
+        self.kg._fulltext_search_enabled = MagicMock(wraps=self.kg._fulltext_search_enabled)
+        self.kg._refresh_schema_statistics = MagicMock(wraps=self.kg._refresh_schema_statistics)
+
+        self.kg.ask_batch(["Who directed The Matrix?"] * 4, concurrency=4)
+
+        self.kg._fulltext_search_enabled.assert_called_once()
+        self.kg._refresh_schema_statistics.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
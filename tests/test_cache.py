@@ -0,0 +1,137 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+from graphrag_sdk import KnowledgeGraph, Ontology
+from graphrag_sdk.cache import LRUCache, CypherCache, QueryResultCache
+from graphrag_sdk.steps.graph_query_step import GraphQueryGenerationStep
+
+
+class TestLRUCache(unittest.TestCase):
+    """
+    Test LRU eviction, expiration and metrics
+    """
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_expires_entries(self):
+        cache = LRUCache(ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+
+    def test_stats(self):
+        cache = LRUCache()
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+
+        assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 1}
+
+    def test_memory_budget(self):
+        cache = LRUCache(max_bytes=200)
+        cache.set("a", "x" * 100)
+        cache.set("b", "x" * 100)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        assert cache.stats()["bytes"] <= 200
+
+
+class TestCypherCache(unittest.TestCase):
+    """
+    Test question to Cypher lookups
+    """
+
+    cypher = "MATCH (m:Movie) RETURN m"
+
+    def test_exact_match_is_normalized(self):
+        cache = CypherCache()
+        cache.set_cypher("Which movies exist?", "v1", self.cypher)
+
+        assert cache.get_cypher("  which movies   EXIST ", "v1") == self.cypher
+
+    def test_scoped_by_ontology_version_and_history(self):
+        cache = CypherCache()
+        cache.set_cypher("Which movies exist?", "v1", self.cypher)
+
+        assert cache.get_cypher("Which movies exist?", "v2") is None
+        assert cache.get_cypher("Which movies exist?", "v1", "Matrix") is None
+
+    def test_similarity_match(self):
+        vectors = {
+            "which movies exist": [1.0, 0.0],
+            "what movies are there": [0.99, 0.05],
+            "who directed matrix": [0.0, 1.0],
+        }
+        cache = CypherCache(embed=lambda q: vectors[q], similarity_threshold=0.9)
+        cache.set_cypher("Which movies exist?", "v1", self.cypher)
+
+        assert cache.get_cypher("What movies are there?", "v1") == self.cypher
+        assert cache.get_cypher("Who directed Matrix?", "v1") is None
+
+
+class TestQueryResultCache(unittest.TestCase):
+    """
+    Test Cypher result lookups
+    """
+
+    def test_normalized_lookup(self):
+        cache = QueryResultCache()
+        cache.set_result("MATCH (m:Movie)\n RETURN m;", "[[m]]", 1.0)
+
+        assert cache.get_result("MATCH (m:Movie) RETURN m") == ("[[m]]", 1.0, None, None)
+
+    def test_invalidate(self):
+        cache = QueryResultCache()
+        cache.set_result("MATCH (m:Movie) RETURN m", "[[m]]", 1.0)
+        cache.invalidate(1)
+
+        assert cache.get_result("MATCH (m:Movie) RETURN m") is None
+
+    def test_write_during_execution(self):
+        cache = QueryResultCache()
+        graph = MagicMock()
+        graph.query.side_effect = lambda cypher: (
+            # A write lands while the query runs
+            cache.invalidate(1),
+            MagicMock(result_set=[["The Matrix"]], run_time_ms=1.0),
+        )[1]
+        step = GraphQueryGenerationStep(graph=graph, ontology=Ontology([], []), chat_session=MagicMock(), result_cache=cache)
+
+        (context, _) = step._execute_cypher("MATCH (m:Movie) RETURN m.title")
+
+        assert "The Matrix" in context
+        # The result read before the write is not served as fresh
+        assert cache.get_result("MATCH (m:Movie) RETURN m.title") is None
+
+    def test_hit_restores_row_count(self):
+        cache = QueryResultCache()
+        graph = MagicMock()
+        graph.query.return_value = MagicMock(result_set=[], run_time_ms=1.0)
+        step = GraphQueryGenerationStep(graph=graph, ontology=Ontology([], []), chat_session=MagicMock(), result_cache=cache)
+        step._execute_cypher("MATCH (m:Movie) RETURN m.title")
+        step.result_rows = None
+
+        step._execute_cypher("MATCH (m:Movie) RETURN m.title")
+
+        # A cached empty result is still known to be empty
+        graph.query.assert_called_once()
+        assert step.result_rows == 0
+
+    def test_serves_one_graph(self):
+        cache = QueryResultCache()
+        KnowledgeGraph("movies", MagicMock(), Ontology(), db=MagicMock(), result_cache=cache)
+        KnowledgeGraph("movies", MagicMock(), Ontology(), db=MagicMock(), result_cache=cache)
+
+        with self.assertRaises(Exception):
+            KnowledgeGraph("people", MagicMock(), Ontology(), db=MagicMock(), result_cache=cache)
@@ -0,0 +1,122 @@
+import unittest
+from unittest.mock import MagicMock
+from falkordb.asyncio.graph import AsyncGraph
+from graphrag_sdk.ontology import Ontology
+from graphrag_sdk.cache import CypherCache
+from graphrag_sdk.chat_session import ChatSession
+
+
+class TestStatelessCypherGeneration(unittest.TestCase):
+    """
+    Test generating each Cypher statement in a new conversation
+    """
+
+    def chat_session(self, stateless_cypher: bool) -> ChatSession:
+        return ChatSession(
+            MagicMock(), Ontology([], []), MagicMock(),
+            "Ontology: {ontology}", "QA system", "{question}", "{question}", "{last_answer} {question}",
+            stateless_cypher=stateless_cypher,
+        )
+
+    def test_stateful(self):
+        chat_session = self.chat_session(stateless_cypher=False)
+
+        first = chat_session._cypher_step(chat_session.graph)
+        second = chat_session._cypher_step(chat_session.graph)
+
+        assert first.chat_session is chat_session.cypher_chat_session
+        assert second.chat_session is chat_session.cypher_chat_session
+
+    def test_stateless(self):
+        chat_session = self.chat_session(stateless_cypher=True)
+        start_chat = chat_session.model_config.cypher_generation.start_chat
+        start_chat.side_effect = lambda system_instruction: MagicMock()
+
+        first = chat_session._cypher_step(chat_session.graph)
+        second = chat_session._cypher_step(chat_session.graph)
+
+        assert first.chat_session is not second.chat_session
+        start_chat.assert_called_with('Ontology: {"entities": [], "relations": []}')
+
+
+class TestPipelinedStreaming(unittest.TestCase):
+    """
+    Test streaming the Cypher generation and the timings of a streamed answer
+    """
+
+    def test_timings(self):
+        chat_session = ChatSession(
+            MagicMock(), Ontology([], []), MagicMock(),
+            "Ontology: {ontology}", "QA system", "{question}", "{question}", "{last_answer} {question}",
+            pipelined_streaming=True,
+        )
+        chat_session.graph.query.return_value = MagicMock(result_set=[[1]], run_time_ms=1.0)
+        chat_session.cypher_chat_session.send_message_stream.side_effect = lambda prompt: iter(["```MATCH (n) RETURN count(n)```"])
+        chat_session.qa_chat_session.send_message_stream.side_effect = lambda prompt: iter(["There ", "is one node"])
+        chat_session.qa_chat_session.get_chat_history.return_value = [{"role": "assistant", "content": "There is one node"}]
+
+        chunks = list(chat_session.send_message_stream("How many nodes?"))
+
+        assert chunks == ["There ", "is one node"]
+        chat_session.cypher_chat_session.send_message.assert_not_called()
+        timings = chat_session.metadata["last_timings"]
+        assert set(timings) == {
+            "cypher_generation", "cypher_validation", "query_execution", "vector_retrieval", "time_to_first_token", "total"
+        }
+        assert 0 < timings["time_to_first_token"] <= timings["total"]
+
+
+
+class TestAsyncGraph(unittest.TestCase):
+    """
+    Test creating the graph of the asynchronous API on first use
+    """
+
+    def chat_session(self, async_graph) -> ChatSession:
+        return ChatSession(
+            MagicMock(), Ontology([], []), MagicMock(),
+            "Ontology: {ontology}", "QA system", "{question}", "{question}", "{last_answer} {question}",
+            async_graph=async_graph,
+        )
+
+    def test_factory(self):
+        graph = AsyncGraph(MagicMock(), "test_kg")
+        factory = MagicMock(return_value=graph)
+        chat_session = self.chat_session(factory)
+
+        assert chat_session.async_graph is graph
+        assert chat_session.async_graph is graph
+        factory.assert_called_once()
+
+    def test_graph(self):
+        graph = AsyncGraph(MagicMock(), "test_kg")
+
+        assert self.chat_session(graph).async_graph is graph
+
+
+
+class TestCypherCacheScope(unittest.TestCase):
+    """
+    Test scoping the cached statements by what the Cypher generation sees
+    """
+
+    def version(self, cypher_system_instruction: str = "Ontology: {ontology}", cypher_gen_prompt: str = "{question}",
+                statistics: str = None) -> str:
+        schema_statistics = MagicMock() if statistics is not None else None
+        if schema_statistics is not None:
+            schema_statistics.to_prompt.return_value = statistics
+        return ChatSession(
+            MagicMock(), Ontology([], []), MagicMock(),
+            cypher_system_instruction, "QA system", cypher_gen_prompt, "{question}", "{last_answer} {question}",
+            cypher_cache=CypherCache(), schema_statistics=schema_statistics,
+        ).ontology_version
+
+    def test_scope(self):
+        assert self.version() == self.version()
+        assert self.version() != self.version(cypher_system_instruction="Schema: {ontology}")
+        assert self.version() != self.version(cypher_gen_prompt="Question: {question}")
+        assert self.version(statistics="Movie.genre: Drama") != self.version(statistics="Movie.genre: Comedy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import time
+import asyncio
+import unittest
+from unittest.mock import MagicMock, AsyncMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from redis.exceptions import ConnectionError
+from graphrag_sdk import KnowledgeGraph, Ontology
+from graphrag_sdk.connection import ReplicatedGraph, AsyncReplicatedGraph, DeduplicatedGraph
+
+
+class TestReplicatedGraph(unittest.TestCase):
+    """
+    Test routing queries between the primary and the read replicas
+    """
+
+    def setUp(self):
+        self.primary = MagicMock()
+        self.replicas = [MagicMock(), MagicMock()]
+
+    def test_round_robin(self):
+        graph = ReplicatedGraph(self.primary, self.replicas)
+        for _ in range(4):
+            graph.ro_query("MATCH (n) RETURN n")
+
+        assert self.replicas[0].ro_query.call_count == 2
+        assert self.replicas[1].ro_query.call_count == 2
+        self.primary.ro_query.assert_not_called()
+
+    def test_writes_go_to_primary(self):
+        graph = ReplicatedGraph(self.primary, self.replicas)
+        graph.query("CREATE (n)")
+
+        self.primary.query.assert_called_once()
+        self.replicas[0].query.assert_not_called()
+
+    def test_least_latency(self):
+        graph = ReplicatedGraph(self.primary, self.replicas, "least_latency")
+        graph.latencies = [0.5, 0.1]
+        graph.ro_query("MATCH (n) RETURN n")
+
+        self.replicas[1].ro_query.assert_called_once()
+        self.replicas[0].ro_query.assert_not_called()
+
+    def test_falls_back_to_primary(self):
+        self.replicas[0].ro_query.side_effect = ConnectionError("down")
+        graph = ReplicatedGraph(self.primary, self.replicas, "least_latency")
+        graph.ro_query("MATCH (n) RETURN n")
+        graph.ro_query("MATCH (n) RETURN n")
+
+        self.primary.ro_query.assert_called_once()
+        self.replicas[1].ro_query.assert_called_once()
+
+
+class TestAsyncReplicatedGraph(unittest.TestCase):
+    """
+    Test routing asynchronous queries between the primary and the read replicas
+    """
+
+    def setUp(self):
+        self.primary = MagicMock(ro_query=AsyncMock(), query=AsyncMock())
+        self.replicas = [MagicMock(ro_query=AsyncMock()), MagicMock(ro_query=AsyncMock())]
+
+    def test_round_robin(self):
+        graph = AsyncReplicatedGraph(self.primary, self.replicas)
+
+        async def run():
+            for _ in range(4):
+                await graph.ro_query("MATCH (n) RETURN n")
+            await graph.query("CREATE (n)")
+
+        asyncio.run(run())
+
+        assert self.replicas[0].ro_query.await_count == 2
+        assert self.replicas[1].ro_query.await_count == 2
+        self.primary.ro_query.assert_not_awaited()
+        self.primary.query.assert_awaited_once()
+
+    def test_falls_back_to_primary(self):
+        self.replicas[0].ro_query.side_effect = ConnectionError("down")
+        graph = AsyncReplicatedGraph(self.primary, self.replicas)
+
+        asyncio.run(graph.ro_query("MATCH (n) RETURN n"))
+
+        self.primary.ro_query.assert_awaited_once()
+        assert graph.latencies[0] == float("inf")
+
+
+    @patch("graphrag_sdk.kg.get_falkordb_client")
+    @patch("graphrag_sdk.kg.get_async_falkordb_client")
+    def test_async_chat_reads_from_replicas(self, get_async_falkordb_client, get_falkordb_client):
+        async_db = MagicMock()
+        kg = KnowledgeGraph(
+            "test_kg", MagicMock(), Ontology(), db=MagicMock(), async_db=async_db, replicas=[("replica-1", 6379)]
+        )
+
+        chat_session = kg.chat_session()
+
+        assert isinstance(chat_session.async_graph, AsyncReplicatedGraph)
+        assert chat_session.async_graph.primary is async_db.select_graph.return_value
+        get_async_falkordb_client.assert_called_once_with("replica-1", 6379, None, None, max_connections=64)
+
+
+class TestDeduplicatedGraph(unittest.TestCase):
+    """
+    Test executing each distinct query once
+    """
+
+    def test_concurrent_identical_queries(self):
+        inner = MagicMock()
+        inner.ro_query.side_effect = lambda q, params, timeout: time.sleep(0.05) or MagicMock(result_set=[[q]])
+        graph = DeduplicatedGraph(inner)
+        queries = ["MATCH (n) RETURN count(n)"] * 8 + ["MATCH ()-[e]->() RETURN count(e)"] * 2
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(lambda q: graph.ro_query(q, timeout=1000), queries))
+
+        assert inner.ro_query.call_count == 2
+        assert (graph.executed, graph.deduplicated) == (2, 8)
+        assert results[0] is results[7]
+
+    def test_shares_errors(self):
+        inner = MagicMock()
+        inner.ro_query.side_effect = Exception("Query timed out")
+        graph = DeduplicatedGraph(inner)
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                graph.ro_query("MATCH (n) RETURN n")
+        inner.ro_query.assert_called_once()
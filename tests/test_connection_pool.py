@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from graphrag_sdk import KnowledgeGraph, Ontology
+from graphrag_sdk.connection import get_falkordb_client, close_falkordb_clients
+
+
+@patch("graphrag_sdk.connection.FalkorDB")
+@patch("graphrag_sdk.connection.BlockingConnectionPool")
+class TestSharedClient(unittest.TestCase):
+    """
+    Test sharing pooled FalkorDB clients across knowledge graphs
+    """
+
+    def setUp(self):
+        close_falkordb_clients()
+
+    def tearDown(self):
+        close_falkordb_clients()
+
+    def test_reuses_pool(self, pool, falkordb):
+        client = get_falkordb_client("db.local", 6379, "user", "secret", max_connections=8)
+
+        assert get_falkordb_client("db.local", 6379, "user", "secret") is client
+        pool.assert_called_once()
+        assert pool.call_args.kwargs["max_connections"] == 8
+        falkordb.assert_called_once_with(connection_pool=pool.return_value)
+
+    def test_keys_on_credentials(self, pool, falkordb):
+        falkordb.side_effect = lambda connection_pool: MagicMock()
+
+        client = get_falkordb_client("db.local", 6379, "user", "secret")
+
+        assert get_falkordb_client("db.local", 6379, "user", "other") is not client
+        assert get_falkordb_client("db.local", 6379, "admin", "secret") is not client
+        assert get_falkordb_client("db.local", 6380, "user", "secret") is not client
+        assert pool.call_count == 4
+
+    def test_knowledge_graphs_share_client(self, pool, falkordb):
+        ontology = Ontology([], [])
+        movies = KnowledgeGraph("movies", MagicMock(), ontology, host="db.local", username="user", password="secret")
+        people = KnowledgeGraph("people", MagicMock(), ontology, host="db.local", username="user", password="secret")
+
+        assert movies.db is people.db
+        pool.assert_called_once()
+
+    def test_knowledge_graph_pool_size(self, pool, falkordb):
+        kg = KnowledgeGraph("movies", MagicMock(), Ontology([], []), host="db.local", max_connections=8)
+
+        kg.db
+
+        assert pool.call_args.kwargs["max_connections"] == 8
+
+    def test_close(self, pool, falkordb):
+        get_falkordb_client("db.local", 6379)
+
+        close_falkordb_clients()
+
+        falkordb.return_value.connection.connection_pool.disconnect.assert_called_once()
+        get_falkordb_client("db.local", 6379)
+        assert pool.call_count == 2
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+from falkordb import Node, Edge, Path
+from graphrag_sdk.context_builder import ContextBuilder, DeduplicatedContextBuilder
+
+
+class TestContextBuilder(unittest.TestCase):
+    """
+    Test rendering query results into a budgeted context
+    """
+
+    movie = Node(0, labels=["Movie"], properties={"title": "The Matrix", "__description__": "internal"})
+    actor = Node(1, labels=["Actor"], properties={"name": "Keanu Reeves", "embedding": [0.1] * 32})
+    acted_in = Edge(1, "ACTED_IN", 0, edge_id=0, properties={"role": "Neo"})
+
+    def test_renders_relevant_properties(self):
+        builder = ContextBuilder()
+        context = builder.build([[self.actor, self.acted_in, self.movie]], ["a", "r", "m"])
+
+        assert context == (
+            'a | r | m\n'
+            '(:Actor {"name":"Keanu Reeves"}) | [:ACTED_IN {"role":"Neo"}] | (:Movie {"title":"The Matrix"})'
+        )
+
+    def test_renders_path_directions(self):
+        carrie = Node(2, labels=["Actor"], properties={"name": "Carrie-Anne Moss"})
+        trinity = Edge(2, "ACTED_IN", 0, edge_id=1, properties={"role": "Trinity"})
+        builder = ContextBuilder()
+        context = builder.build([[Path([self.actor, self.movie, carrie], [self.acted_in, trinity])]])
+
+        assert context == (
+            '(:Actor {"name":"Keanu Reeves"})-[:ACTED_IN {"role":"Neo"}]->(:Movie {"title":"The Matrix"})'
+            '<-[:ACTED_IN {"role":"Trinity"}]-(:Actor {"name":"Carrie-Anne Moss"})'
+        )
+
+    def test_skips_duplicate_rows(self):
+        builder = ContextBuilder()
+        builder.build([[self.movie], [self.movie]])
+
+        assert builder.stats["rows_included"] == 1
+        assert builder.stats["duplicate_rows"] == 1
+
+    def test_truncates_over_budget(self):
+        builder = ContextBuilder(max_tokens=20)
+        context = builder.build([[i, "x" * 20] for i in range(10)])
+
+        assert builder.stats["rows"] == 10
+        assert builder.stats["rows_included"] + builder.stats["rows_dropped"] == 10
+        assert builder.stats["rows_dropped"] > 0
+        assert context.endswith(
+            f"{builder.stats['rows_dropped']} more rows omitted, {builder.stats['rows_included']} of 10 rows shown"
+        )
+
+
+class TestDeduplicatedContextBuilder(unittest.TestCase):
+    """
+    Test rendering each distinct node and edge once
+    """
+
+    movie = Node(0, labels=["Movie"], properties={"title": "The Matrix"})
+    keanu = Node(1, labels=["Actor"], properties={"name": "Keanu Reeves"})
+    carrie = Node(2, labels=["Actor"], properties={"name": "Carrie-Anne Moss"})
+    neo = Edge(1, "ACTED_IN", 0, edge_id=0, properties={"role": "Neo"})
+    trinity = Edge(2, "ACTED_IN", 0, edge_id=1, properties={"role": "Trinity"})
+
+    def test_defines_shared_nodes_once(self):
+        builder = DeduplicatedContextBuilder()
+        context = builder.build(
+            [[self.keanu, self.neo, self.movie], [self.carrie, self.trinity, self.movie]],
+            ["a", "r", "m"],
+        )
+
+        assert context == (
+            'Nodes:\n'
+            'n1 (:Actor {"name":"Keanu Reeves"})\n'
+            'n0 (:Movie {"title":"The Matrix"})\n'
+            'n2 (:Actor {"name":"Carrie-Anne Moss"})\n'
+            'Edges:\n'
+            'e0 n1-[:ACTED_IN {"role":"Neo"}]->n0\n'
+            'e1 n2-[:ACTED_IN {"role":"Trinity"}]->n0\n'
+            'Rows:\n'
+            'a | r | m\n'
+            'n1 | e0 | n0\n'
+            'n2 | e1 | n0'
+        )
+        assert builder.stats["nodes"] == 3
+        assert builder.stats["edges"] == 2
+
+    def test_renders_path_directions(self):
+        builder = DeduplicatedContextBuilder()
+        context = builder.build([[Path([self.keanu, self.movie, self.carrie], [self.neo, self.trinity])]])
+
+        assert context.endswith("Rows:\nn1-e0->n0<-e1-n2")
+        assert "e1 n2-[:ACTED_IN {\"role\":\"Trinity\"}]->n0" in context
+
+    def test_defines_edge_endpoints(self):
+        builder = DeduplicatedContextBuilder()
+        # MATCH ()-[r]->() RETURN r, the endpoints are not returned
+        context = builder.build([[self.neo], [self.trinity]], ["r"])
+
+        assert context == (
+            'Edges:\n'
+            'e0 (#1)-[:ACTED_IN {"role":"Neo"}]->(#0)\n'
+            'e1 (#2)-[:ACTED_IN {"role":"Trinity"}]->(#0)\n'
+            'Rows:\n'
+            'r\n'
+            'e0\n'
+            'e1'
+        )
+
+        # Endpoints given as nodes are defined with the edge, endpoints returned later in the row are referenced
+        context = builder.build([[Edge(self.keanu, "ACTED_IN", self.movie, edge_id=0), self.carrie, self.trinity]])
+
+        assert 'n1 (:Actor {"name":"Keanu Reeves"})' in context
+        assert "e0 n1-[:ACTED_IN {}]->n0" in context
+        assert 'e1 n2-[:ACTED_IN {"role":"Trinity"}]->n0' in context
+
+    def test_truncation_drops_unreferenced_definitions(self):
+        builder = DeduplicatedContextBuilder(max_tokens=25)
+        context = builder.build([[self.keanu, self.movie], [self.carrie, self.movie]])
+
+        assert builder.stats["rows_included"] == 1
+        assert "Carrie-Anne Moss" not in context
@@ -0,0 +1,120 @@
+import unittest
+from unittest.mock import MagicMock
+from graphrag_sdk import Ontology, Entity, Relation, Attribute, AttributeType
+from graphrag_sdk.steps.extract_data_step import ExtractDataStep
+from graphrag_sdk.entity_resolution import EntityResolver, blocking_keys, normalize_name
+
+
+# Toy embeddings: the names of the same person are close, John and Jane Smith are not
+EMBEDDINGS = {
+    "John Smith": [1.0, 0.0, 0.1],
+    "J. Smith": [0.95, 0.05, 0.1],
+    "Jane Smith": [0.1, 1.0, 0.1],
+    "Acme": [0.0, 0.0, 1.0],
+}
+
+
+class TestEntityResolver(unittest.TestCase):
+    """
+    Test linking entity name variants to one entity
+    """
+
+    def setUp(self):
+        self.embed = MagicMock(side_effect=lambda text: EMBEDDINGS[text])
+        self.resolver = EntityResolver(self.embed, threshold=0.9)
+
+    def test_blocking(self):
+        assert normalize_name("  José  SMITH, Jr.") == "jose smith jr"
+        assert blocking_keys("J. Smith") == {"smith"}
+        assert blocking_keys("J.") == {"j"}
+
+    def test_links_name_variants(self):
+        assert self.resolver.resolve("Person", {"name": "John Smith"}) == {"name": "John Smith"}
+        assert self.resolver.resolve("Person", {"name": "J. Smith"}) == {"name": "John Smith"}
+        # Similar names of different entities are kept apart
+        assert self.resolver.resolve("Person", {"name": "Jane Smith"}) == {"name": "Jane Smith"}
+        # Normalized names are linked without embedding
+        assert self.resolver.resolve("Person", {"name": "john  smith"}) == {"name": "John Smith"}
+        # Names sharing no blocking key are never compared
+        assert self.resolver.resolve("Company", {"name": "Acme"}) == {"name": "Acme"}
+
+        # "J. Smith" is the only name linked to another entity
+        assert self.resolver.linked == 1
+        assert self.resolver.lookup("Person", {"name": "J. Smith"}) == {"name": "John Smith"}
+        assert self.embed.call_count == 3
+
+    def test_loads_existing_entities(self):
+        ontology = Ontology([Entity("Person", [Attribute("name", AttributeType.STRING, True)])], [])
+        graph = MagicMock()
+        graph.query.return_value = MagicMock(result_set=[["John Smith"]])
+
+        self.resolver.load(graph, ontology)
+
+        graph.query.assert_called_once_with("MATCH (n:Person) RETURN n.name")
+        assert self.resolver.resolve("Person", {"name": "J. Smith"}) == {"name": "John Smith"}
+
+    def test_loads_once(self):
+        ontology = Ontology([Entity("Person", [Attribute("name", AttributeType.STRING, True)])], [])
+        graph = MagicMock()
+        graph.query.return_value = MagicMock(result_set=[["John Smith"]])
+        self.resolver.load(graph, ontology)
+        # Created by a previous ingestion
+        self.resolver.resolve("Person", {"name": "Jane Smith"})
+        embedded = self.embed.call_count
+
+        self.resolver.load(graph, ontology)
+
+        graph.query.assert_called_once()
+        assert self.embed.call_count == embedded
+        assert self.resolver.resolve("Person", {"name": "Jane Smith"}) == {"name": "Jane Smith"}
+        assert self.resolver.resolve("Person", {"name": "J. Smith"}) == {"name": "John Smith"}
+
+    def test_rejects_another_graph(self):
+        ontology = Ontology([Entity("Person", [Attribute("name", AttributeType.STRING, True)])], [])
+        graph = MagicMock()
+        graph.name = "movies"
+        graph.query.return_value = MagicMock(result_set=[["John Smith"]])
+        self.resolver.load(graph, ontology)
+        other = MagicMock()
+        other.name = "people"
+
+        # The entities of the first graph are never linked to from another graph
+        with self.assertRaises(Exception):
+            self.resolver.load(other, ontology)
+        other.query.assert_not_called()
+
+    def test_bounded_embeddings(self):
+        resolver = EntityResolver(self.embed, threshold=0.9, embedding_cache_size=1)
+
+        resolver.resolve("Person", {"name": "John Smith"})
+        resolver.resolve("Person", {"name": "J. Smith"})
+        resolver.resolve("Person", {"name": "Jane Smith"})
+
+        assert resolver._embeddings.stats()["size"] == 1
+
+    def test_extraction_writes_linked_entities(self):
+        person = Entity("Person", [Attribute("name", AttributeType.STRING, True)])
+        ontology = Ontology([person], [Relation("KNOWS", "Person", "Person")])
+        graph = MagicMock()
+        step = ExtractDataStep([], ontology, MagicMock(), graph, entity_resolver=self.resolver)
+
+        step._create_entity(graph, {"label": "Person", "attributes": {"name": "John Smith"}}, ontology)
+        step._create_entity(graph, {"label": "Person", "attributes": {"name": "J. Smith"}}, ontology)
+        step._create_relation(
+            graph,
+            {
+                "label": "KNOWS",
+                "source": {"label": "Person", "attributes": {"name": "J. Smith"}},
+                "target": {"label": "Person", "attributes": {"name": "Jane Smith"}},
+            },
+            ontology,
+        )
+
+        queries = [call[0][0] for call in graph.query.call_args_list]
+        assert 'MERGE (n:Person {name: "John Smith"})' in queries[1]
+        assert 'MATCH (s:Person {name: "John Smith"})' in queries[2]
+        assert 'MATCH (d:Person {name: "Jane Smith"})' in queries[2]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+from unittest.mock import MagicMock
+from redis.exceptions import ResponseError
+from graphrag_sdk import Ontology, Entity, Attribute, AttributeType
+from graphrag_sdk.steps.graph_query_step import GraphQueryGenerationStep
+from graphrag_sdk.query_policy import QueryPolicy
+from graphrag_sdk import KnowledgeGraph
+from graphrag_sdk.fulltext import (
+    create_fulltext_indexes,
+    fulltext_indexes_exist,
+    rewrite_contains_to_fulltext,
+    searchable_attributes,
+)
+
+
+class TestFulltextSearch(unittest.TestCase):
+    """
+    Test resolving CONTAINS filters through full-text indexes
+    """
+
+    def setUp(self):
+        self.ontology = Ontology(
+            [
+                Entity(
+                    "Person",
+                    [
+                        Attribute("name", AttributeType.STRING, True, searchable=True),
+                        Attribute("bio", AttributeType.STRING),
+                    ],
+                ),
+                Entity("Movie", [Attribute("title", AttributeType.STRING, True)]),
+            ],
+            [],
+        )
+
+    def test_searchable_attribute_round_trip(self):
+        attribute = Attribute.from_string("name:string!*~")
+        assert attribute.searchable and attribute.unique and attribute.required
+        assert Attribute.from_json(attribute.to_json()).searchable
+        # Attributes which are not searchable serialize as before
+        assert "searchable" not in Attribute("title", AttributeType.STRING).to_json()
+        assert searchable_attributes(self.ontology) == {"Person": ["name"]}
+
+    def test_rewrite(self):
+        cypher = "MATCH (p:Person)-[:ACTED_IN]->(m:Movie) WHERE p.name CONTAINS 'Keanu Ree' RETURN m.title"
+
+        assert rewrite_contains_to_fulltext(cypher, self.ontology) == (
+            "CALL db.idx.fulltext.queryNodes('Person', 'Keanu Ree*') YIELD node AS p " + cypher
+        )
+
+    def test_rewrite_skips_unsafe_queries(self):
+        for cypher in [
+            # Not a searchable attribute
+            "MATCH (p:Person) WHERE p.bio CONTAINS 'actor' RETURN p",
+            "MATCH (m:Movie) WHERE m.title CONTAINS 'Matrix' RETURN m",
+            # The filter does not restrict the matched nodes
+            "MATCH (p:Person) WHERE p.name CONTAINS 'Keanu' OR p.bio CONTAINS 'actor' RETURN p",
+            # Not the first MATCH
+            "MATCH (m:Movie) WITH m MATCH (p:Person) WHERE p.name CONTAINS 'Keanu' RETURN p",
+            "OPTIONAL MATCH (p:Person) WHERE p.name CONTAINS 'Keanu' RETURN p",
+            # Terms the index does not tokenize into the same words
+            "MATCH (p:Person) WHERE p.name CONTAINS '-' RETURN p",
+            "MATCH (p:Person) WHERE p.name CONTAINS 'Keanu-Ree' RETURN p",
+            "MATCH (p:Person) WHERE p.name CONTAINS 'Keanu  Reeves' RETURN p",
+            "MATCH (p:Person) WHERE p.name CONTAINS ' Keanu' RETURN p",
+            "MATCH (p:Person) WHERE p.name CONTAINS 'K' RETURN p",
+            # Clauses inside literals are not clauses
+            "MATCH (p:Person) WHERE p.bio = 'OR RETURN' AND p.name CONTAINS 'Keanu' OR true RETURN p",
+        ]:
+            assert rewrite_contains_to_fulltext(cypher, self.ontology) == cypher, cypher
+
+    def test_create_indexes(self):
+        graph = MagicMock()
+        graph.create_node_fulltext_index.side_effect = ResponseError("Attribute 'name' is already indexed")
+
+        create_fulltext_indexes(graph, self.ontology)
+
+        graph.create_node_fulltext_index.assert_called_once_with("Person", "name")
+
+    def test_indexes_exist(self):
+        graph = MagicMock()
+        graph.ro_query.return_value = MagicMock(result_set=[["Person", {"name": ["RANGE", "FULLTEXT"]}]])
+        assert fulltext_indexes_exist(graph, self.ontology)
+
+        graph.ro_query.return_value = MagicMock(result_set=[["Person", {"name": ["RANGE"]}]])
+        assert not fulltext_indexes_exist(graph, self.ontology)
+
+    def test_chat_sessions_do_not_create_indexes(self):
+        db = MagicMock()
+        graph = db.select_graph.return_value
+        graph.ro_query.return_value = MagicMock(result_set=[["Person", {"name": ["FULLTEXT"]}]])
+        kg = KnowledgeGraph("test_kg", MagicMock(), self.ontology, db=db)
+
+        assert kg.chat_session().fulltext_search
+        assert kg.chat_session().fulltext_search
+
+        graph.create_node_fulltext_index.assert_not_called()
+        # The indexes are listed once
+        assert graph.ro_query.call_count == 1
+
+    def test_step_validates_rewritten_query(self):
+        cypher = "MATCH (p:Person) WHERE p.name CONTAINS 'Keanu' RETURN p.name"
+        graph = MagicMock()
+        graph.ro_query.return_value = MagicMock(result_set=[["Keanu Reeves"]], run_time_ms=1.0)
+        chat_session = MagicMock()
+        chat_session.send_message.return_value = MagicMock(text=cypher)
+        step = GraphQueryGenerationStep(
+            graph=graph,
+            ontology=self.ontology,
+            chat_session=chat_session,
+            cypher_prompt="{question}",
+            query_policy=QueryPolicy(explain=True),
+            fulltext_search=True,
+        )
+
+        step.run("Who is Keanu?")
+
+        assert graph.explain.call_args[0][0].startswith("CALL db.idx.fulltext.queryNodes('Person', 'Keanu*')")
+
+    def test_step_executes_rewritten_query(self):
+        cypher = "MATCH (p:Person) WHERE p.name CONTAINS 'Keanu' RETURN p.name"
+        graph = MagicMock()
+        graph.query.return_value = MagicMock(result_set=[["Keanu Reeves"]], run_time_ms=1.0)
+        chat_session = MagicMock()
+        chat_session.send_message.return_value = MagicMock(text=cypher)
+        step = GraphQueryGenerationStep(
+            graph=graph,
+            ontology=self.ontology,
+            chat_session=chat_session,
+            cypher_prompt="{question}",
+            fulltext_search=True,
+        )
+
+        (context, generated, _) = step.run("Who is Keanu?")
+
+        # The generated statement is reported, the index lookup is executed
+        assert generated == cypher
+        assert "Keanu Reeves" in context
+        graph.query.assert_called_once_with(
+            "CALL db.idx.fulltext.queryNodes('Person', 'Keanu*') YIELD node AS p " + cypher
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,384 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, AsyncMock
+from redis.exceptions import ResponseError
+from graphrag_sdk import Ontology, Entity, Attribute, AttributeType
+from graphrag_sdk.query_policy import QueryPolicy
+from graphrag_sdk.retry_policy import RetryPolicy
+from graphrag_sdk.helpers import cypher_block_closed, extract_cypher
+from graphrag_sdk.models.model import GenerativeModelChatSession
+from graphrag_sdk.steps.graph_query_step import GraphQueryGenerationStep
+
+
+class HistoryChatSession:
+    """
+    Chat session keeping its history, answering with the given responses in turn
+    """
+
+    def __init__(self, responses: list[str]):
+        self.responses = list(responses)
+        self.history = [{"role": "system", "content": "system"}]
+
+    def send_message(self, message: str) -> MagicMock:
+        text = self.responses.pop(0)
+        self.history += [{"role": "user", "content": message}, {"role": "assistant", "content": text}]
+        return MagicMock(text=text)
+
+    def get_chat_history(self) -> list[dict]:
+        return list(self.history)
+
+    def set_chat_history(self, history: list[dict]) -> None:
+        self.history = list(history)
+
+    def delete_last_message(self) -> None:
+        del self.history[-2:]
+
+
+class MinimalChatSession(GenerativeModelChatSession):
+    """
+    Chat session which cannot replace its history
+    """
+
+    def __init__(self, responses: list[str]):
+        self.history = HistoryChatSession(responses)
+
+    def send_message(self, message: str) -> MagicMock:
+        return self.history.send_message(message)
+
+    def get_chat_history(self) -> list[dict]:
+        return self.history.get_chat_history()
+
+    def delete_last_message(self) -> None:
+        self.history.delete_last_message()
+
+
+class TestGraphQueryGenerationStep(unittest.TestCase):
+    """
+    Test validating generated Cypher with the execution planner
+    """
+
+    def setUp(self):
+        self.ontology = Ontology([Entity("Movie", [Attribute("title", AttributeType.STRING)])], [])
+        self.graph = MagicMock()
+        self.graph.ro_query.return_value.result_set = [["The Matrix"]]
+        self.graph.ro_query.return_value.run_time_ms = 1.0
+        self.chat_session = MagicMock()
+        self.chat_session.send_message.side_effect = [
+            MagicMock(text="MATCH (m:Movie RETURN m.title"),
+            MagicMock(text="MATCH (m:Movie) RETURN m.title"),
+        ]
+
+    def test_explain_error_is_fed_back(self):
+        self.graph.explain.side_effect = [ResponseError("errMsg: Invalid input 'R'"), MagicMock()]
+        step = GraphQueryGenerationStep(
+            graph=self.graph,
+            ontology=self.ontology,
+            chat_session=self.chat_session,
+            cypher_prompt="{question}",
+            query_policy=QueryPolicy(explain=True),
+        )
+
+        (context, cypher, _) = step.run("Which movies exist?")
+
+        assert cypher == "MATCH (m:Movie) RETURN m.title"
+        assert "Invalid input 'R'" in self.chat_session.send_message.call_args_list[1][0][0]
+        self.graph.ro_query.assert_called_once()
+        # The exchanges are replaced by the question and the valid statement in one history rewrite
+        self.chat_session.delete_last_message.assert_not_called()
+        self.chat_session.set_chat_history.assert_called_once()
+
+    def test_rejects_full_scans(self):
+        plan = MagicMock()
+        plan.collect_operations.side_effect = lambda op: [op] if op == "All Node Scan" else []
+        self.graph.explain.side_effect = [plan, MagicMock()]
+        step = GraphQueryGenerationStep(
+            graph=self.graph,
+            ontology=self.ontology,
+            chat_session=self.chat_session,
+            cypher_prompt="{question}",
+            query_policy=QueryPolicy(explain=True, reject_full_scans=True),
+        )
+
+        step.run("Which movies exist?")
+
+        assert "scans every node" in self.chat_session.send_message.call_args_list[1][0][0]
+
+
+class TestGraphQueryRetries(unittest.TestCase):
+    """
+    Test the retry strategy of the Cypher generation
+    """
+
+    def setUp(self):
+        self.ontology = Ontology([Entity("Movie", [Attribute("title", AttributeType.STRING)])], [])
+        self.graph = MagicMock()
+        self.graph.query.return_value.result_set = [["The Matrix"]]
+        self.graph.query.return_value.run_time_ms = 1.0
+        self.chat_session = MagicMock()
+        self.chat_session.send_message.return_value = MagicMock(text="MATCH (m:Film) RETURN m.title")
+
+    def test_escalates_after_failures(self):
+        escalation_chat_session = MagicMock()
+        escalation_chat_session.send_message.return_value = MagicMock(text="MATCH (m:Movie) RETURN m.title")
+        step = GraphQueryGenerationStep(
+            graph=self.graph,
+            ontology=self.ontology,
+            chat_session=self.chat_session,
+            cypher_prompt="{question}",
+            retry_policy=RetryPolicy(max_attempts=4, escalation_model=MagicMock(), escalate_after=2),
+            escalation_chat_session=escalation_chat_session,
+        )
+
+        (_, cypher, _) = step.run("Which movies exist?")
+
+        assert cypher == "MATCH (m:Movie) RETURN m.title"
+        assert self.chat_session.send_message.call_count == 2
+        assert "Entity Film not found" in self.chat_session.send_message.call_args_list[1][0][0]
+        assert [attempt["escalated"] for attempt in step.attempts] == [False, False, True]
+        assert [attempt["stage"] for attempt in step.attempts] == ["validation", "validation", "execution"]
+        # The failed attempts are removed from the history of both sessions
+        self.chat_session.set_chat_history.assert_called_once()
+        assert escalation_chat_session.delete_last_message.call_count == 1
+
+    def test_error_prompt_names_the_failed_statement(self):
+        chat_session = HistoryChatSession([
+            "MATCH (m:Film) RETURN m.title",
+            "MATCH (m:Show) RETURN m.title",
+            "MATCH (m:Movie) RETURN m.title",
+        ])
+        sent = []
+        send_message = chat_session.send_message
+        chat_session.send_message = lambda message: (sent.append(message), send_message(message))[1]
+        step = GraphQueryGenerationStep(
+            graph=self.graph,
+            ontology=self.ontology,
+            chat_session=chat_session,
+            cypher_prompt="{question}",
+            retry_policy=RetryPolicy(max_attempts=3),
+        )
+
+        (_, cypher, _) = step.run("Which movies exist?")
+
+        assert cypher == "MATCH (m:Movie) RETURN m.title"
+        # Each error prompt is about the statement which failed with its error
+        assert "MATCH (m:Film)" in sent[1] and "Entity Film not found" in sent[1]
+        assert "MATCH (m:Show)" in sent[2] and "Entity Show not found" in sent[2]
+
+    def test_success_after_failures_leaves_no_trace(self):
+        chat_session = HistoryChatSession(["MATCH (m:Film) RETURN m.title", "MATCH (m:Movie) RETURN m.title"])
+        step = GraphQueryGenerationStep(
+            graph=self.graph,
+            ontology=self.ontology,
+            chat_session=chat_session,
+            cypher_prompt="{question}",
+            retry_policy=RetryPolicy(max_attempts=3),
+        )
+
+        step.run("Which movies exist?")
+
+        assert chat_session.history == [
+            {"role": "system", "content": "system"},
+            {"role": "user", "content": "Which movies exist?"},
+            {"role": "assistant", "content": "MATCH (m:Movie) RETURN m.title"},
+        ]
+
+    def test_success_without_history_replacement(self):
+        chat_session = MinimalChatSession(["MATCH (m:Film) RETURN m.title", "MATCH (m:Movie) RETURN m.title"])
+        step = GraphQueryGenerationStep(
+            graph=self.graph,
+            ontology=self.ontology,
+            chat_session=chat_session,
+            cypher_prompt="{question}",
+            retry_policy=RetryPolicy(max_attempts=3),
+        )
+
+        (_, cypher, _) = step.run("Which movies exist?")
+
+        # The valid statement is not discarded, the exchanges are kept
+        assert cypher == "MATCH (m:Movie) RETURN m.title"
+        assert len(chat_session.get_chat_history()) == 5
+
+    def test_empty_cypher_after_failure_leaves_no_trace(self):
+        chat_session = HistoryChatSession(["MATCH (m:Film) RETURN m.title", ""])
+        step = GraphQueryGenerationStep(
+            graph=self.graph,
+            ontology=self.ontology,
+            chat_session=chat_session,
+            cypher_prompt="{question}",
+            retry_policy=RetryPolicy(max_attempts=3),
+        )
+
+        assert step.run("Which movies exist?") == (None, None, None)
+        assert chat_session.history == [{"role": "system", "content": "system"}]
+
+    def test_stops_at_deadline(self):
+        step = GraphQueryGenerationStep(
+            graph=self.graph,
+            ontology=self.ontology,
+            chat_session=self.chat_session,
+            cypher_prompt="{question}",
+            retry_policy=RetryPolicy(max_attempts=10, deadline=0),
+        )
+
+        with self.assertRaises(Exception):
+            step.run("Which movies exist?")
+
+        assert len(step.attempts) == 1
+        assert step.attempts[0]["error"] == "Entity Film not found in ontology"
+
+
+class TestGraphQueryCandidates(unittest.TestCase):
+    """
+    Test generating Cypher candidates in parallel
+    """
+
+    def setUp(self):
+        self.ontology = Ontology([Entity("Movie", [Attribute("title", AttributeType.STRING)])], [])
+        self.results = {
+            "MATCH (m:Movie) WHERE m.title = 'Matrix' RETURN m.title LIMIT 1000": [],
+            "MATCH (m:Movie) RETURN m.title LIMIT 1000": [["The Matrix"]],
+        }
+        self.chat_session = MagicMock()
+
+    def candidate(self, cypher: str) -> MagicMock:
+        chat_session = MagicMock()
+        chat_session.send_message.return_value = MagicMock(text=cypher)
+        chat_session.asend_message = AsyncMock(return_value=MagicMock(text=cypher))
+        return chat_session
+
+    def step(self, graph: MagicMock) -> GraphQueryGenerationStep:
+        return GraphQueryGenerationStep(
+            graph=graph,
+            ontology=self.ontology,
+            chat_session=self.chat_session,
+            cypher_prompt="{question}",
+            query_policy=QueryPolicy(),
+            candidate_chat_sessions=[
+                self.candidate("MATCH (m:Film) RETURN m.title"),
+                self.candidate("MATCH (m:Movie) WHERE m.title = 'Matrix' RETURN m.title"),
+                self.candidate("MATCH (m:Movie) RETURN m.title"),
+            ],
+        )
+
+    def test_selects_valid_candidate_with_rows(self):
+        graph = MagicMock()
+        graph.ro_query.side_effect = lambda cypher, timeout: MagicMock(result_set=self.results[cypher], run_time_ms=1.0)
+        step = self.step(graph)
+
+        (context, cypher, _) = step.run("Which movies exist?")
+
+        assert cypher == "MATCH (m:Movie) RETURN m.title"
+        assert "The Matrix" in context
+        self.chat_session.send_message.assert_not_called()
+        assert 2 in {attempt["candidate"] for attempt in step.attempts}
+
+    def test_falls_back_to_retries(self):
+        graph = MagicMock()
+        graph.ro_query.side_effect = Exception("Query timed out")
+        self.chat_session.send_message.return_value = MagicMock(text="")
+        step = self.step(graph)
+
+        assert step.run("Which movies exist?") == (None, None, None)
+        self.chat_session.send_message.assert_called_once()
+
+    def test_arun_selects_valid_candidate_with_rows(self):
+        graph = MagicMock()
+        graph.ro_query = AsyncMock(
+            side_effect=lambda cypher, timeout: MagicMock(result_set=self.results[cypher], run_time_ms=1.0)
+        )
+
+        (context, cypher, _) = asyncio.run(self.step(graph).arun("Which movies exist?"))
+
+        assert cypher == "MATCH (m:Movie) RETURN m.title"
+        self.chat_session.asend_message.assert_not_called()
+
+
+class TestGraphQueryStreaming(unittest.TestCase):
+    """
+    Test executing a streamed Cypher statement once its fenced block closes
+    """
+
+    def test_stops_generation_after_cypher_block(self):
+        consumed = []
+
+        def stream(prompt):
+            for chunk in ["```cypher\nMATCH (m:Movie) ", "RETURN m.title\n``", "`\n", "This query returns the titles."]:
+                consumed.append(chunk)
+                yield chunk
+
+        graph = MagicMock()
+        graph.ro_query.return_value = MagicMock(result_set=[["The Matrix"]], run_time_ms=1.0)
+        chat_session = MagicMock()
+        chat_session.send_message_stream.side_effect = stream
+        step = GraphQueryGenerationStep(
+            graph=graph,
+            ontology=Ontology([Entity("Movie", [Attribute("title", AttributeType.STRING)])], []),
+            chat_session=chat_session,
+            cypher_prompt="{question}",
+            query_policy=QueryPolicy(),
+            stream_cypher=True,
+        )
+
+        (context, cypher, _) = step.run("Which movies exist?")
+
+        assert cypher.strip() == "MATCH (m:Movie) RETURN m.title"
+        # The explanation following the statement is not awaited
+        assert len(consumed) == 3
+        chat_session.send_message.assert_not_called()
+        assert step.timings["generation"] > 0
+        assert step.timings["execution"] > 0
+
+    def test_arun_without_native_streaming(self):
+        graph = MagicMock()
+        graph.ro_query = AsyncMock(return_value=MagicMock(result_set=[["The Matrix"]], run_time_ms=1.0))
+        step = GraphQueryGenerationStep(
+            graph=graph,
+            ontology=Ontology([Entity("Movie", [Attribute("title", AttributeType.STRING)])], []),
+            chat_session=MinimalChatSession(["```cypher\nMATCH (m:Movie) RETURN m.title\n```"]),
+            cypher_prompt="{question}",
+            query_policy=QueryPolicy(),
+            stream_cypher=True,
+        )
+
+        # The whole response is streamed at once
+        (context, cypher, _) = asyncio.run(step.arun("Which movies exist?"))
+
+        assert cypher.strip() == "MATCH (m:Movie) RETURN m.title"
+        assert "The Matrix" in context
+
+    def test_cypher_block_after_preamble(self):
+        assert not cypher_block_closed("Here is the query:\n```cypher\nMATCH (m:Movie) RETURN m")
+        assert cypher_block_closed("Here is the query:\n```cypher\nMATCH (m:Movie) RETURN m\n```")
+        assert cypher_block_closed("```\nMATCH (m:Movie) RETURN m```")
+        assert extract_cypher("Here is the query:\n```cypher\nMATCH (m:Movie) RETURN m\n```").strip() == (
+            "MATCH (m:Movie) RETURN m"
+        )
+
+
+class TestGraphQueryAsync(unittest.TestCase):
+    """
+    Test generating and executing Cypher asynchronously
+    """
+
+    def test_arun(self):
+        ontology = Ontology([Entity("Movie", [Attribute("title", AttributeType.STRING)])], [])
+        graph = MagicMock()
+        graph.ro_query = AsyncMock(return_value=MagicMock(result_set=[["The Matrix"]], run_time_ms=1.0))
+        chat_session = MagicMock()
+        chat_session.asend_message = AsyncMock(side_effect=[
+            MagicMock(text="MATCH (m:Film) RETURN m.title"),
+            MagicMock(text="MATCH (m:Movie) RETURN m.title"),
+        ])
+        step = GraphQueryGenerationStep(
+            graph=graph,
+            ontology=ontology,
+            chat_session=chat_session,
+            cypher_prompt="{question}",
+            query_policy=QueryPolicy(),
+        )
+
+        (context, cypher, _) = asyncio.run(step.arun("Which movies exist?"))
+
+        assert cypher == "MATCH (m:Movie) RETURN m.title"
+        assert "The Matrix" in context
+        graph.ro_query.assert_awaited_once_with("MATCH (m:Movie) RETURN m.title LIMIT 1000", timeout=30000)
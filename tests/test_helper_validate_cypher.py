@@ -6,7 +6,11 @@ from graphrag_sdk.helpers import (
     validate_cypher_entities_exist,
     validate_cypher_relations_exist,
     validate_cypher_relation_directions,
+    validate_cypher_properties_exist,
+    validate_cypher_property_types,
 )
+from graphrag_sdk.attribute import Attribute, AttributeType
+from unittest.mock import patch
 import unittest
 
 
@@ -224,5 +228,121 @@ class TestValidateCypher3(unittest.TestCase):
         assert errors is None or len(errors) == 0
 
 
+class TestValidateCypher4(unittest.TestCase):
+    """
+    Test a cypher query with unknown properties and a direction bound through a variable
+    """
+
+    cypher = """
+    MATCH (f:Fighter {nickname: 'The Eagle'})
+    MATCH (fight:Fight)-[:FOUGHT_IN]->(f)
+    RETURN f // (x:Unknown) in a comment is ignored
+    """
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls._ontology = Ontology([], [])
+
+        cls._ontology.add_entity(
+            Entity(
+                label="Fighter",
+                attributes=[Attribute("name", AttributeType.STRING, True, True)],
+            )
+        )
+
+        cls._ontology.add_entity(
+            Entity(
+                label="Fight",
+                attributes=[],
+            )
+        )
+
+        cls._ontology.add_relation(
+            Relation(
+                label="FOUGHT_IN",
+                source="Fighter",
+                target="Fight",
+                attributes=[],
+            )
+        )
+
+    def test_validate_cypher_entities_exist(self):
+
+        errors = validate_cypher_entities_exist(self.cypher, self._ontology)
+
+        assert len(errors) == 0
+
+    def test_validate_cypher_properties_exist(self):
+
+        errors = validate_cypher_properties_exist(self.cypher, self._ontology)
+
+        assert errors == ["Property nickname not found in entity Fighter. Valid properties: name"]
+
+    def test_validate_cypher_relation_directions(self):
+
+        errors = validate_cypher_relation_directions(self.cypher, self._ontology)
+
+        assert len(errors) == 1
+
+
+class TestValidateCypher5(unittest.TestCase):
+    """
+    Test a cypher query reading unknown properties and comparing properties to values of the wrong type
+    """
+
+    cypher = """
+    MATCH (m:Movie)
+    WHERE m.year = 1999 AND m.title CONTAINS 'Matrix' AND m.release_year > '1990'
+    RETURN m.title, m.rating
+    """
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls._ontology = Ontology([], [])
+
+        cls._ontology.add_entity(
+            Entity(
+                label="Movie",
+                attributes=[
+                    Attribute("title", AttributeType.STRING, True, True),
+                    Attribute("release_year", AttributeType.NUMBER),
+                ],
+            )
+        )
+
+    def test_validate_cypher_properties_exist(self):
+
+        errors = validate_cypher_properties_exist(self.cypher, self._ontology)
+
+        assert errors == [
+            "Property year not found in entity Movie. Valid properties: title, release_year",
+            "Property rating not found in entity Movie. Valid properties: title, release_year",
+        ]
+
+    def test_validate_cypher_property_types(self):
+
+        errors = validate_cypher_property_types(self.cypher, self._ontology)
+
+        assert errors == [
+            "Property release_year of entity Movie is a number, it cannot be compared to the string '1990'"
+        ]
+
+
+class TestValidateCypherFailure(unittest.TestCase):
+    """
+    Test a cypher query the validation fails on
+    """
+
+    def test_validate_cypher(self):
+
+        with patch("graphrag_sdk.helpers._cypher_errors", side_effect=ValueError("Unexpected token")):
+            with self.assertLogs("graphrag_sdk.helpers", level="WARNING"):
+                errors = validate_cypher("MATCH (n) RETURN n", Ontology())
+
+        assert errors == ["Failed to validate the Cypher statement: Unexpected token"]
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import MagicMock
+from graphrag_sdk.history_policy import HistoryPolicy, SUMMARY_PREFIX
+
+
+def exchange(question: str, answer: str) -> list[dict]:
+    return [{"role": "user", "content": question}, {"role": "assistant", "content": answer}]
+
+
+class TestHistoryPolicy(unittest.TestCase):
+    """
+    Test bounding the chat history resent to the model
+    """
+
+    system = [{"role": "system", "content": "You answer questions"}]
+
+    def test_drops_old_contexts(self):
+        history = self.system + exchange("Context: a lot of rows\nQuestion: q1", "a1") + exchange("Context: rows\nQuestion: q2", "a2")
+        compact_prompts = {
+            "Context: a lot of rows\nQuestion: q1": "Context: omitted\nQuestion: q1",
+            "Context: rows\nQuestion: q2": "Context: omitted\nQuestion: q2",
+        }
+
+        (compacted, removed) = HistoryPolicy(keep_contexts=1).compact(history, compact_prompts)
+
+        assert compacted == self.system + exchange("Context: omitted\nQuestion: q1", "a1") + exchange("Context: rows\nQuestion: q2", "a2")
+        assert removed == []
+        # The history given is not modified
+        assert history[1]["content"] == "Context: a lot of rows\nQuestion: q1"
+
+    def test_sliding_window(self):
+        history = self.system + exchange("q1", "a1") + exchange("q2", "a2") + exchange("q3", "a3")
+
+        (compacted, removed) = HistoryPolicy(max_turns=2).compact(history)
+        assert compacted == self.system + exchange("q2", "a2") + exchange("q3", "a3")
+        assert removed == exchange("q1", "a1")
+
+        # The latest exchange is kept even over the token budget
+        (compacted, removed) = HistoryPolicy(max_tokens=1).compact(history)
+        assert compacted == self.system + exchange("q3", "a3")
+        assert removed == exchange("q1", "a1") + exchange("q2", "a2")
+
+    def test_summary(self):
+        history = self.system + exchange("q1", "a1")
+        assert HistoryPolicy.summary_of(history) is None
+
+        history = HistoryPolicy.with_summary(history, "The user asked about q0")
+        assert history[1] == {"role": "system", "content": SUMMARY_PREFIX + "The user asked about q0"}
+        assert HistoryPolicy.summary_of(history) == "The user asked about q0"
+
+        # The summary is replaced, not accumulated
+        history = HistoryPolicy.with_summary(history, "The user asked about q0 and q1")
+        assert len(history) == 4
+        assert HistoryPolicy.summary_of(history) == "The user asked about q0 and q1"
+
+    def test_chat_session_summarizes_removed_exchanges(self):
+        from graphrag_sdk.chat_session import ChatSession
+
+        model_config = MagicMock()
+        summary_session = model_config.qa.start_chat.return_value
+        summary_session.send_message.return_value = MagicMock(text="The user asked about q1")
+        chat_session = ChatSession.__new__(ChatSession)
+        chat_session.model_config = model_config
+        chat_session.history_policy = HistoryPolicy(max_turns=1, summarize=True)
+        chat_session._compact_qa_prompts = {}
+        chat_session.cypher_chat_session = MagicMock()
+        chat_session.cypher_chat_session.get_chat_history.return_value = self.system + exchange("q1", "c1") + exchange("q2", "c2")
+        chat_session.qa_chat_session = MagicMock()
+        chat_session.qa_chat_session.get_chat_history.return_value = self.system + exchange("q2", "a2")
+
+        chat_session._compact_history()
+
+        chat_session.cypher_chat_session.set_chat_history.assert_called_with(
+            self.system + [{"role": "system", "content": SUMMARY_PREFIX + "The user asked about q1"}] + exchange("q2", "c2")
+        )
+        chat_session.qa_chat_session.set_chat_history.assert_called_once_with(self.system + exchange("q2", "a2"))
+        summary_session.send_message.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
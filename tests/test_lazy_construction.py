@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from graphrag_sdk import KnowledgeGraph, Ontology, Entity, Attribute, AttributeType
+
+
+class TestLazyConstruction(unittest.TestCase):
+    """
+    Test connecting to the graph and saving the ontology only when needed
+    """
+
+    def setUp(self):
+        self.ontology = Ontology([Entity("Person", [Attribute("name", AttributeType.STRING, True)])], [])
+        self.db = MagicMock()
+
+    def knowledge_graph(self, ontology=None) -> KnowledgeGraph:
+        return KnowledgeGraph("test_kg", MagicMock(), ontology, db=self.db)
+
+    def test_construction(self):
+        self.knowledge_graph(self.ontology)
+
+        self.db.select_graph.assert_not_called()
+
+    @patch.object(Ontology, "save_to_graph")
+    def test_reads_do_not_save(self, save_to_graph):
+        kg = self.knowledge_graph(self.ontology)
+
+        kg.chat_session()
+        kg.graph.ro_query("MATCH (n) RETURN n")
+
+        # Only the data graph is selected, the schema graph is never read nor written
+        self.db.select_graph.assert_called_once_with("test_kg")
+        save_to_graph.assert_not_called()
+
+    @patch.object(Ontology, "get_saved_hash", return_value=None)
+    @patch.object(Ontology, "save_to_graph")
+    def test_first_write_saves(self, save_to_graph, get_saved_hash):
+        kg = self.knowledge_graph(self.ontology)
+
+        kg.add_node("Person", {"name": "Keanu"})
+        kg.add_node("Person", {"name": "Carrie"})
+
+        save_to_graph.assert_called_once()
+        get_saved_hash.assert_called_once()
+
+        # An assigned ontology is saved by the next write
+        kg.ontology = Ontology([Entity("Person", [Attribute("name", AttributeType.STRING, True)])], [])
+        kg.add_node("Person", {"name": "Laurence"})
+        assert save_to_graph.call_count == 2
+
+    @patch.object(Ontology, "save_to_graph")
+    def test_unchanged_ontology_not_saved(self, save_to_graph):
+        kg = self.knowledge_graph(self.ontology)
+
+        with patch.object(Ontology, "get_saved_hash", return_value=self.ontology.get_hash()):
+            kg.add_node("Person", {"name": "Keanu"})
+
+        save_to_graph.assert_not_called()
+
+    @patch.object(Ontology, "from_schema_graph")
+    def test_ontology_loaded_on_first_access(self, from_schema_graph):
+        from_schema_graph.return_value = self.ontology
+        kg = self.knowledge_graph()
+
+        from_schema_graph.assert_not_called()
+        assert kg.ontology is self.ontology
+        assert kg.ontology is self.ontology
+        from_schema_graph.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, AsyncMock, patch
+from graphrag_sdk.models.litellm import LiteModelChatSession
+
+
+class TestLiteModelChatSessionErrors(unittest.TestCase):
+    """
+    Test that a failed request leaves no message in the chat history
+    """
+
+    def setUp(self):
+        model = MagicMock(model="openai/gpt-4.1", system_instruction="system", additional_params={})
+        model.generation_config.to_json.return_value = {}
+        self.chat_session = LiteModelChatSession(model, "system")
+        self.history = self.chat_session.get_chat_history()
+
+    @patch("graphrag_sdk.models.litellm.completion", side_effect=Exception("Rate limit"))
+    def test_send_message(self, completion):
+        with self.assertRaises(ValueError):
+            self.chat_session.send_message("Which movies exist?")
+
+        assert self.chat_session.get_chat_history() == self.history
+
+    @patch("graphrag_sdk.models.litellm.acompletion", new_callable=AsyncMock, side_effect=Exception("Rate limit"))
+    def test_asend_message(self, acompletion):
+        with self.assertRaises(ValueError):
+            asyncio.run(self.chat_session.asend_message("Which movies exist?"))
+
+        assert self.chat_session.get_chat_history() == self.history
+
+    @patch("graphrag_sdk.models.litellm.completion", side_effect=Exception("Rate limit"))
+    def test_send_message_stream(self, completion):
+        with self.assertRaises(ValueError):
+            list(self.chat_session.send_message_stream("Which movies exist?"))
+
+        assert self.chat_session.get_chat_history() == self.history
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import re
+import unittest
+from unittest.mock import MagicMock
+from falkordb import Node, Edge
+from graphrag_sdk import Ontology, Entity, Relation, Attribute, AttributeType
+
+
+class TestOntologyFromSchemaGraph(unittest.TestCase):
+    """
+    Test loading an ontology saved to a schema graph
+    """
+
+    def setUp(self):
+        self.nodes = [
+            Node(7, labels=["Person"], properties={"name": "string!*"}),
+            Node(3, labels=["Movie"], properties={"title": "string!*", "year": "number", "__description__": "A film"}),
+        ]
+        self.edges = [
+            Edge(7, "ACTED_IN", 3, edge_id=0, properties={"role": "string"}),
+            Edge(7, "DIRECTED", 3, edge_id=1),
+            Edge(7, "KNOWS", 7, edge_id=2),
+        ]
+        # The schema of an entity without relations
+        self.nodes.append(Node(5, labels=["Studio"], properties={"name": "string!*"}))
+        nodes = {node.id: node for node in self.nodes}
+        self.graph = MagicMock()
+        self.graph.query.side_effect = lambda q: MagicMock(
+            result_set=[[nodes[edge.src_node], edge, nodes[edge.dest_node]] for edge in self.edges] if "[r]" in q
+            else [[nodes[5]]]
+        )
+
+    def test_from_schema_graph(self):
+        ontology = Ontology.from_schema_graph(self.graph)
+
+        # Endpoints resolved by scanning the node list
+        baseline = Ontology(
+            [Entity.from_graph(node) for node in self.nodes],
+            [Relation.from_graph(edge, self.nodes) for edge in self.edges],
+        )
+        assert ontology.to_json() == baseline.to_json()
+        assert ontology.to_json() == Ontology(
+            [
+                Entity("Person", [Attribute("name", AttributeType.STRING, True, True)]),
+                Entity(
+                    "Movie",
+                    [Attribute("title", AttributeType.STRING, True, True), Attribute("year", AttributeType.NUMBER)],
+                    "A film",
+                ),
+                Entity("Studio", [Attribute("name", AttributeType.STRING, True, True)]),
+            ],
+            [
+                Relation("ACTED_IN", "Person", "Movie", [Attribute("role", AttributeType.STRING)]),
+                Relation("DIRECTED", "Person", "Movie"),
+                Relation("KNOWS", "Person", "Person"),
+            ],
+        ).to_json()
+
+    def test_single_scan(self):
+        Ontology.from_schema_graph(self.graph)
+
+        (relations, isolated) = [call[0][0] for call in self.graph.query.call_args_list]
+        assert relations == "MATCH (s)-[r]->(d) RETURN s, r, d"
+        # Only the entities without relations are read by a node query, the metadata node is skipped
+        assert "WHERE NOT n:__Ontology__ AND NOT (n)--()" in isolated
+
+
+class TestOntologyFromKnowledgeGraph(unittest.TestCase):
+    """
+    Test discovering the ontology of a knowledge graph
+    """
+
+    def setUp(self):
+        self.labels = ["Person", "Movie", "__Document__"]
+        self.attributes = {
+            "(a:Person)": [[["name", "String"], 3], [["__sources__", "Array"], 3]],
+            "(a:Movie)": [[["title", "String"], 2], [["year", "Integer"], 2]],
+            "()-[a:ACTED_IN]->()": [[["role", "String"], 2]],
+            "()-[a:KNOWS]->()": [],
+        }
+        # (source label, type, target label) of the edges, in storage order
+        self.edges = [
+            ("Person", "ACTED_IN", "Movie"),
+            ("Person", "KNOWS", "Movie"),
+            ("Person", "KNOWS", "Person"),
+            ("__Document__", "__MENTIONS__", "Person"),
+        ]
+        self.graph = MagicMock()
+        self.graph.call_procedure.side_effect = lambda procedure: MagicMock(
+            result_set=[[label] for label in self.labels] if procedure == "db.labels"
+            else [[relation] for relation in dict.fromkeys(edge[1] for edge in self.edges)]
+        )
+        self.graph.query.side_effect = self.query
+
+    def query(self, q):
+        endpoints = re.match(r"MATCH \(s\)-\[:(\w+)\]->\(t\) WITH s, t (?:LIMIT (\d+))?", q)
+        if endpoints is not None:
+            edges = [edge for edge in self.edges if edge[1] == endpoints.group(1)]
+            if endpoints.group(2) is not None:
+                edges = edges[:int(endpoints.group(2))]
+            return MagicMock(result_set=[[s, t] for (s, t) in dict.fromkeys((s, t) for (s, _, t) in edges)])
+        pattern = re.match(r"MATCH (.*?) call", q).group(1)
+        return MagicMock(result_set=self.attributes[pattern])
+
+    def test_from_kg_graph(self):
+        ontology = Ontology.from_kg_graph(self.graph, max_workers=2)
+
+        # The ontology of the queries per pair of labels, relations ordered by source then target label
+        assert ontology.to_json() == Ontology(
+            [
+                Entity("Person", [Attribute("name", AttributeType.STRING)]),
+                Entity("Movie", [Attribute("title", AttributeType.STRING), Attribute("year", AttributeType.NUMBER)]),
+            ],
+            [
+                Relation("ACTED_IN", "Person", "Movie", [Attribute("role", AttributeType.STRING)]),
+                Relation("KNOWS", "Person", "Person"),
+                Relation("KNOWS", "Person", "Movie"),
+            ],
+        ).to_json()
+        # One endpoint query per relationship type, scanning every edge
+        endpoint_queries = [call[0][0] for call in self.graph.query.call_args_list if "UNWIND labels(s)" in call[0][0]]
+        assert len(endpoint_queries) == 2
+        assert not any("LIMIT" in q for q in endpoint_queries)
+
+    def test_edge_sample_size(self):
+        ontology = Ontology.from_kg_graph(self.graph, edge_sample_size=1)
+
+        # Only the first KNOWS edge is sampled
+        assert [(r.label, r.source.label, r.target.label) for r in ontology.relations] == [
+            ("ACTED_IN", "Person", "Movie"),
+            ("KNOWS", "Person", "Movie"),
+        ]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import MagicMock
+from graphrag_sdk import KnowledgeGraph, Ontology, Entity, Relation, Attribute, AttributeType
+from graphrag_sdk.document import Document
+from graphrag_sdk.steps.extract_data_step import ExtractDataStep, get_source_key
+
+
+class TestProvenance(unittest.TestCase):
+    """
+    Test recording the sources of the extracted data and deleting a source
+    """
+
+    def setUp(self):
+        self.ontology = Ontology(
+            [Entity("Person", [Attribute("name", AttributeType.STRING, True)])],
+            [Relation("KNOWS", "Person", "Person")],
+        )
+        self.graph = MagicMock()
+        self.step = ExtractDataStep([], self.ontology, MagicMock(), self.graph, track_provenance=True)
+
+    def queries(self, graph: MagicMock) -> list[str]:
+        return [call[0][0] for call in graph.query.call_args_list]
+
+    def test_documents_keyed_on_source(self):
+        # Two sources with the same content
+        for path in ["a/movies.txt", "b/movies.txt"]:
+            source_key = get_source_key(MagicMock(data_source=path))
+            self.step._link_document(self.graph, Document("Keanu Reeves acted in The Matrix"), source_key, [1])
+
+        query = self.queries(self.graph)[0]
+        assert "MERGE (d:__Document__ {source: $source_key, id: $id})" in query
+        (first, second) = [call[0][1] for call in self.graph.query.call_args_list]
+        assert first["id"] == second["id"]
+        assert first["source_key"] != second["source_key"]
+
+    def test_sources_created_empty(self):
+        source_key = get_source_key(MagicMock(data_source="movies.txt"))
+        self.step._create_entity(self.graph, {"label": "Person", "attributes": {"name": "Keanu"}}, self.ontology, source_key)
+        self.step._create_relation(
+            self.graph,
+            {
+                "label": "KNOWS",
+                "source": {"label": "Person", "attributes": {"name": "Keanu"}},
+                "target": {"label": "Person", "attributes": {"name": "Carrie"}},
+            },
+            self.ontology,
+            source_key,
+        )
+        self.step._link_document(self.graph, Document("Keanu knows Carrie"), source_key, [1, 2])
+
+        (entity, relation, link) = self.queries(self.graph)
+        assert "MERGE (n:Person {name: \"Keanu\"}) ON CREATE SET n.__sources__ = []" in entity
+        assert "ON CREATE SET r.__sources__ = []" in relation
+        # Existing elements without sources predate the provenance tracking and are left without
+        for (variable, query) in [("r", relation), ("n", link)]:
+            assert (
+                f"WHEN {variable}.__sources__ IS NULL OR $source_key IN {variable}.__sources__ "
+                f"THEN {variable}.__sources__ ELSE {variable}.__sources__ + [$source_key]"
+            ) in query
+
+    def test_delete_source(self):
+        db = MagicMock()
+        graph = db.select_graph.return_value
+        kg = KnowledgeGraph("test_kg", MagicMock(), self.ontology, db=db)
+        source = MagicMock(data_source="movies.txt")
+
+        kg.delete_source(source)
+
+        (relations, nodes, documents) = self.queries(graph)[-3:]
+        # An entity mentioned by another source keeps it and is not deleted
+        assert "WHERE $source_key IN n.__sources__" in nodes
+        assert "SET n.__sources__ = [s IN n.__sources__ WHERE s <> $source_key]" in nodes
+        assert "WITH n WHERE size(n.__sources__) = 0\n            DETACH DELETE n" in nodes
+        assert "DELETE r" in relations
+        assert documents == "MATCH (d:__Document__ {source: $source_key}) DETACH DELETE d"
+        assert graph.query.call_args[0][1] == {"source_key": get_source_key(source)}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import MagicMock
+from graphrag_sdk.query_policy import QueryPolicy, bound_variable_length_hops, inject_limit
+
+
+class TestQueryPolicy(unittest.TestCase):
+    """
+    Test bounding generated Cypher queries
+    """
+
+    def test_bounds_variable_length_hops(self):
+        assert bound_variable_length_hops("MATCH (a)-[*]->(b) RETURN b", 5) == "MATCH (a)-[*1..5]->(b) RETURN b"
+        assert bound_variable_length_hops("MATCH (a)-[r:KNOWS*2..]->(b) RETURN b", 5) == "MATCH (a)-[r:KNOWS*2..5]->(b) RETURN b"
+        assert bound_variable_length_hops("MATCH (a)-[:KNOWS*..10]-(b) RETURN b", 5) == "MATCH (a)-[:KNOWS*1..5]-(b) RETURN b"
+        assert bound_variable_length_hops("MATCH (a)-[:KNOWS*1..3]-(b) RETURN b", 5) == "MATCH (a)-[:KNOWS*1..3]-(b) RETURN b"
+        assert bound_variable_length_hops("MATCH (a)-[:KNOWS*7]-(b) RETURN b", 5) == "MATCH (a)-[:KNOWS*7]-(b) RETURN b"
+        assert bound_variable_length_hops("MATCH (a) RETURN count(*)", 5) == "MATCH (a) RETURN count(*)"
+
+    def test_injects_limit(self):
+        assert inject_limit("MATCH (a) RETURN a;", 10) == "MATCH (a) RETURN a LIMIT 10"
+        assert inject_limit("MATCH (a) RETURN a LIMIT 5", 10) == "MATCH (a) RETURN a LIMIT 5"
+        assert inject_limit("MATCH (a) WITH a LIMIT 5 RETURN a", 10) == "MATCH (a) WITH a LIMIT 5 RETURN a LIMIT 10"
+        assert inject_limit("CALL db.labels()", 10) == "CALL db.labels()"
+
+    def test_skips_string_literals(self):
+        cypher = "MATCH (a)-[r {note: '-[*]-'}]->(b) WHERE b.text = 'RETURN a LIMIT 5' RETURN b"
+        assert bound_variable_length_hops(cypher, 5) == cypher
+        assert inject_limit(cypher, 10) == cypher + " LIMIT 10"
+
+        cypher = "MATCH (a)-[*]->(b) WHERE b.name = '*' RETURN b.name + ' LIMIT 1'"
+        assert bound_variable_length_hops(cypher, 5) == "MATCH (a)-[*1..5]->(b) WHERE b.name = '*' RETURN b.name + ' LIMIT 1'"
+        assert inject_limit(cypher, 10) == cypher + " LIMIT 10"
+
+    def test_executes_read_only_with_timeout(self):
+        graph = MagicMock()
+        QueryPolicy(limit=10, timeout=1000).execute(graph, "MATCH (a) RETURN a")
+
+        graph.ro_query.assert_called_once_with("MATCH (a) RETURN a LIMIT 10", timeout=1000)
+        graph.query.assert_not_called()
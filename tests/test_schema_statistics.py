@@ -0,0 +1,115 @@
+import unittest
+from unittest.mock import MagicMock
+from graphrag_sdk import Ontology, Entity, Relation, Attribute, AttributeType
+from graphrag_sdk.chat_session import ChatSession
+from graphrag_sdk.schema_statistics import SchemaStatistics
+
+
+class TestSchemaStatistics(unittest.TestCase):
+    """
+    Test the graph statistics added to the Cypher generation instruction
+    """
+
+    def setUp(self):
+        self.ontology = Ontology(
+            [
+                Entity(
+                    "Movie",
+                    [
+                        Attribute("title", AttributeType.STRING, True),
+                        Attribute("genre", AttributeType.STRING),
+                        Attribute("year", AttributeType.NUMBER),
+                    ],
+                ),
+                Entity("Person", [Attribute("name", AttributeType.STRING, True)]),
+            ],
+            [Relation("ACTED_IN", "Person", "Movie"), Relation("DIRECTED", "Person", "Movie")],
+        )
+        self.movies = 3
+        self.graph = MagicMock()
+        self.graph.ro_query.side_effect = self.ro_query
+
+    def ro_query(self, q, params=None, timeout=None):
+        if "RETURN count(n)" in q:
+            return MagicMock(result_set=[[self.movies if "Movie" in q else 2]])
+        if "count(r)" in q:
+            return MagicMock(result_set=[[4]])
+        if "n.genre" in q:
+            return MagicMock(result_set=[["Action", 2], ["Drama", 1]])
+        if "n.year" in q:
+            return MagicMock(result_set=[[1999, 2021]])
+        # Too many distinct titles and names to list
+        return MagicMock(result_set=[[str(i), 1] for i in range(21)])
+
+    def test_statistics_prompt(self):
+        statistics = SchemaStatistics(top_k=1)
+        assert statistics.to_prompt() is None
+
+        statistics.refresh(self.graph, self.ontology, 1)
+
+        prompt = statistics.to_prompt()
+        assert "- Movie: 3 nodes; genre: 'Action' (+1 more); year: 1999..2021" in prompt
+        assert "- Person: 2 nodes\n" in prompt
+        assert "- ACTED_IN: 4 relationships" in prompt
+        assert statistics.version == 1
+
+    def test_refresh_is_incremental(self):
+        statistics = SchemaStatistics()
+        statistics.refresh(self.graph, self.ontology, 1)
+        queries = self.graph.ro_query.call_count
+
+        # Only the Movie count changed
+        self.movies = 4
+        statistics.refresh(self.graph, self.ontology, 2)
+
+        refreshed = [call[0][0] for call in self.graph.ro_query.call_args_list[queries:]]
+        assert not any("n.name" in q for q in refreshed)
+        assert any("n.genre" in q for q in refreshed)
+        assert "- Movie: 4 nodes" in statistics.to_prompt()
+
+    def test_refresh_serves_previous_statistics(self):
+        statistics = SchemaStatistics()
+        statistics.refresh(self.graph, self.ontology, 1)
+        previous = statistics.to_prompt()
+        served = []
+
+        def ro_query(q, params=None, timeout=None):
+            # The queries run without holding the cache
+            assert not statistics._lock.locked()
+            served.append(statistics.to_prompt())
+            return self.ro_query(q, params, timeout)
+
+        self.graph.ro_query.side_effect = ro_query
+        self.movies = 4
+        statistics.refresh(self.graph, self.ontology, 2)
+
+        assert set(served) == {previous}
+        assert "- Movie: 4 nodes" in statistics.to_prompt()
+
+    def test_full_refresh(self):
+        statistics = SchemaStatistics()
+        statistics.refresh(self.graph, self.ontology, 1)
+        queries = self.graph.ro_query.call_count
+
+        statistics.refresh(self.graph, self.ontology, 2, full=True)
+
+        refreshed = [call[0][0] for call in self.graph.ro_query.call_args_list[queries:]]
+        assert any("n.name" in q for q in refreshed)
+
+    def test_chat_session_instruction(self):
+        statistics = SchemaStatistics()
+        statistics.refresh(self.graph, self.ontology, 1)
+        model_config = MagicMock()
+
+        chat_session = ChatSession(
+            model_config, self.ontology, self.graph,
+            "Ontology: {ontology}", "QA system", "{question}", "{question}", "{last_answer} {question}",
+            schema_statistics=statistics,
+        )
+
+        assert chat_session.cypher_system_instruction.endswith(statistics.to_prompt())
+        model_config.cypher_generation.start_chat.assert_called_with(chat_session.cypher_system_instruction)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import MagicMock
+from graphrag_sdk import KnowledgeGraph, Ontology, Entity, Attribute, AttributeType
+from graphrag_sdk.chat_session import ChatSession
+from falkordb import Node
+from graphrag_sdk.vector_retrieval import VectorRetriever, EMBEDDING_PROPERTY, entity_text
+
+
+class TestVectorRetriever(unittest.TestCase):
+    """
+    Test retrieving the neighbourhood of the entities closest to a question
+    """
+
+    def setUp(self):
+        self.ontology = Ontology(
+            [
+                Entity("Movie", [Attribute("title", AttributeType.STRING, True)]),
+                Entity("Person", [Attribute("name", AttributeType.STRING, True)]),
+            ],
+            [],
+        )
+        self.graph = MagicMock()
+        self.graph.ro_query.side_effect = self.ro_query
+
+    def ro_query(self, q, params=None, timeout=None):
+        if "'Movie'" in q:
+            return MagicMock(result_set=[[1, 0.1], [2, 0.4]])
+        if "'Person'" in q:
+            return MagicMock(result_set=[[3, 0.2]])
+        return MagicMock(result_set=[["The Matrix"]], header=[[1, "n"]])
+
+    def test_retrieve_closest_seeds(self):
+        retriever = VectorRetriever(lambda text: [0.5, 0.5], k=2, hops=2)
+
+        (_, query) = retriever.retrieve(self.graph, self.ontology, "Which movie has Neo?")
+
+        assert "[*1..2]" in query
+        self.graph.ro_query.assert_called_with(query, {"ids": [1, 3]})
+        assert self.graph.ro_query.call_args_list[0][0][1] == {"k": 2, "vector": [0.5, 0.5]}
+
+    def test_entity_text(self):
+        assert entity_text("Movie", {"title": "The Matrix", "year": 1999}) == "Movie title: The Matrix, year: 1999"
+
+    def test_fallback_to_vector_search(self):
+        chat_session = ChatSession(
+            MagicMock(), self.ontology, self.graph,
+            "Ontology: {ontology}", "QA system", "{question}", "{question}", "{last_answer} {question}",
+            retrieval_mode="fallback",
+            vector_retriever=VectorRetriever(lambda text: [0.5, 0.5]),
+        )
+        # The model cannot generate a statement
+        chat_session.cypher_chat_session.send_message.return_value = MagicMock(text="")
+        chat_session.qa_chat_session.send_message.return_value = MagicMock(text="The Matrix")
+
+        response = chat_session.send_message("Which movie has Neo?")
+
+        assert response["response"] == "The Matrix"
+        assert "The Matrix" in response["context"]
+        assert chat_session.metadata["last_retrieval"] == "vector"
+        assert chat_session.metadata["last_timings"]["vector_retrieval"] is not None
+
+    def test_default_context_omits_embeddings(self):
+        node = Node(1, labels=["Movie"], properties={"title": "The Matrix", EMBEDDING_PROPERTY: [0.25] * 32})
+        self.graph.query.return_value = MagicMock(result_set=[[node]], header=[[1, "n"]], run_time_ms=1.0)
+        chat_session = ChatSession(
+            MagicMock(), self.ontology, self.graph,
+            "Ontology: {ontology}", "QA system", "{question}", "{question}", "{last_answer} {question}",
+        )
+        chat_session.cypher_chat_session.send_message.return_value = MagicMock(text="MATCH (n:Movie) RETURN n")
+        chat_session.qa_chat_session.send_message.return_value = MagicMock(text="The Matrix")
+
+        response = chat_session.send_message("Which movies exist?")
+
+        assert "The Matrix" in response["context"]
+        assert EMBEDDING_PROPERTY not in response["context"]
+        assert "0.25" not in response["context"]
+        # The result itself is not modified
+        assert EMBEDDING_PROPERTY in node.properties
+
+    def test_vector_mode_requires_retriever(self):
+        with self.assertRaises(Exception):
+            ChatSession(
+                MagicMock(), self.ontology, self.graph,
+                "Ontology: {ontology}", "QA system", "{question}", "{question}", "{last_answer} {question}",
+                retrieval_mode="vector",
+            )
+
+
+
+class TestEmbeddingDimension(unittest.TestCase):
+    """
+    Test the dimension of the vector indexes
+    """
+
+    def test_given_dimension(self):
+        embed = MagicMock(return_value=[0.0] * 4)
+        kg = KnowledgeGraph("test_kg", MagicMock(), Ontology(), db=MagicMock(), embed=embed, embedding_dimension=8)
+
+        assert kg.embedding_dimension == 8
+        embed.assert_not_called()
+
+    def test_measured_once(self):
+        embed = MagicMock(return_value=[0.0] * 4)
+        kg = KnowledgeGraph("test_kg", MagicMock(), Ontology(), db=MagicMock(), embed=embed)
+
+        assert kg.embedding_dimension == 4
+        assert kg.embedding_dimension == 4
+        embed.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()